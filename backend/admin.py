@@ -0,0 +1,414 @@
+"""
+CLI de administração das Akuma no Mi: todas as operações usam um único repositório
+(um cliente com o pool configurado em database.py)
+Substitui os scripts update_fruit.py, update_gomu_gomu.py, update_images.py,
+list_fruits.py e remove_duplicates.py: nenhuma mudança exige editar código Python.
+As escritas saem em lotes (bulk_update) com no máximo --concurrency lotes em
+andamento, e --dry-run mostra a diferença campo a campo sem gravar nada.
+
+COMO USAR (dentro de backend/):
+    python admin.py list [--type Logia] [--rarity Mítica] [--available | --unavailable] [--json]
+    python admin.py get gomu-gomu [mera-mera ...]
+    python admin.py set gomu-gomu type=Zoan price=10000000000 available=false [--dry-run]
+    python admin.py bulk-apply changes/fruit_images.json [--dry-run] [--batch-size 100] [--concurrency 4]
+    python admin.py dedupe [--dry-run]
+    python admin.py reseed [--overwrite] [--dry-run]
+
+Os valores de set são lidos como JSON quando possível (números, true/false, null,
+listas como '["a", "b"]') e como texto caso contrário. O arquivo de bulk-apply é uma
+lista JSON ou um JSONL de {"id": ..., "changes": {...}}, o mesmo formato do
+PATCH /api/fruits. O site mostra as mudanças quando o snapshot do catálogo expira
+(CATALOG_CACHE_TTL).
+"""
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import orjson
+from dotenv import load_dotenv
+from pydantic import ValidationError
+from pymongo.errors import BulkWriteError, OperationFailure
+
+from indexes import ID_INDEX
+from seed import SEED_FILE, sync_seed
+from server import DevilFruit, seed_fruits
+from storage import FruitRepository, MotorFruitRepository, Update, create_repository
+
+ROOT_DIR = Path(__file__).parent
+load_dotenv(ROOT_DIR / '.env')
+
+DEFAULT_BATCH_SIZE = 100
+DEFAULT_CONCURRENCY = 4
+
+# Campos controlados pelo próprio banco: set e bulk-apply nunca os alteram
+PROTECTED_FIELDS = ("id", "_id", "version")
+
+LIST_FIELDS = ["id", "name", "type", "rarity", "price", "available", "current_user",
+               "destructive_power", "defense_rating", "speed_rating"]
+
+# Um documento por id repetido: o _id mais antigo fica, os demais saem
+DUPLICATES_PIPELINE = [
+    {"$sort": {"_id": 1}},
+    {"$group": {"_id": "$id", "keep": {"$first": "$_id"}, "all": {"$push": "$_id"}, "count": {"$sum": 1}}},
+    {"$match": {"count": {"$gt": 1}}},
+]
+
+Change = Tuple[str, dict]
+
+
+class Progress:
+    """Linha de progresso em stderr, reescrita a cada lote concluído."""
+
+    def __init__(self, total: int, label: str):
+        self.total = total
+        self.label = label
+        self.done = 0
+
+    def advance(self, count: int):
+        self.done += count
+        percent = self.done * 100 // self.total if self.total else 100
+        print(f"\r   ⏳ {self.done}/{self.total} {self.label} ({percent}%)", end="", file=sys.stderr, flush=True)
+
+    def finish(self):
+        if self.done:
+            print(file=sys.stderr)
+
+
+def batches(items: list, size: int):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+async def run_batches(items: list, size: int, concurrency: int, label: str, write):
+    """Chama write(lote) para cada lote, com no máximo concurrency lotes ao mesmo tempo."""
+    semaphore = asyncio.Semaphore(concurrency)
+    progress = Progress(len(items), label)
+
+    async def run(batch):
+        async with semaphore:
+            await write(batch)
+            progress.advance(len(batch))
+
+    await asyncio.gather(*(run(batch) for batch in batches(items, size)))
+    progress.finish()
+
+
+async def write_updates(repository: FruitRepository, updates: List[Update], args) -> Dict[str, int]:
+    totals = {"matched": 0, "modified": 0, "upserted": 0, "errors": 0}
+
+    async def write(batch):
+        try:
+            result = await repository.bulk_update(batch)
+        except BulkWriteError as e:
+            details = e.details
+            result = {"matched": details.get("nMatched", 0), "modified": details.get("nModified", 0),
+                      "upserted": details.get("nUpserted", 0)}
+            for error in details.get("writeErrors", []):
+                totals["errors"] += 1
+                print(f"\n   ❌ {batch[error['index']].filter['id']}: {error.get('errmsg')}", file=sys.stderr)
+        for key, value in result.items():
+            totals[key] += value
+
+    await run_batches(updates, args.batch_size, args.concurrency, "escritas", write)
+    return totals
+
+
+def diff(current: dict, changes: dict) -> Dict[str, tuple]:
+    """Campo -> (valor atual, valor novo), só para os campos que realmente mudam."""
+    return {field: (current.get(field), value) for field, value in changes.items() if current.get(field) != value}
+
+
+def print_diff(fruit_id: str, name: str, changed: Dict[str, tuple]):
+    print(f"📋 {fruit_id} ({name})")
+    for field, (old, new) in changed.items():
+        print(f"   • {field}: {old!r} → {new!r}")
+
+
+def validation_message(error: ValidationError) -> str:
+    return "; ".join(f"{'.'.join(map(str, e['loc']))}: {e['msg']}" for e in error.errors(include_url=False))
+
+
+async def apply_changes(repository: FruitRepository, operations: List[Change], args) -> int:
+    """Compara cada mudança com a fruta atual e grava só o que difere (set e bulk-apply)."""
+    report = {"updated": 0, "unchanged": 0, "not_found": 0, "invalid": 0, "duplicate": 0}
+    writes = []
+    seen = set()
+    # As frutas atuais são lidas em lotes, não a coleção inteira
+    for batch in batches(operations, args.batch_size):
+        existing = {doc['id']: doc for doc in await repository.find_many({"id": {"$in": [i for i, _ in batch]}})}
+        for fruit_id, changes in batch:
+            if fruit_id in seen:
+                print(f"⚠️  {fruit_id}: repetida no arquivo, só a primeira mudança vale")
+                report["duplicate"] += 1
+                continue
+            seen.add(fruit_id)
+
+            fruit = existing.get(fruit_id)
+            if fruit is None:
+                print(f"❌ {fruit_id}: fruta não encontrada")
+                report["not_found"] += 1
+                continue
+            unknown = [k for k in changes if k not in DevilFruit.model_fields and k not in PROTECTED_FIELDS]
+            if unknown:
+                print(f"⚠️  {fruit_id}: campos desconhecidos ignorados: {', '.join(unknown)}")
+            requested = {k: v for k, v in changes.items() if k in DevilFruit.model_fields and k not in PROTECTED_FIELDS}
+            try:
+                validated = DevilFruit.model_validate({**fruit, **requested})
+            except ValidationError as e:
+                print(f"❌ {fruit_id}: {validation_message(e)}")
+                report["invalid"] += 1
+                continue
+            # Compara e grava os valores já convertidos pelo modelo ("123" vira 123)
+            changed = diff(fruit, {field: getattr(validated, field) for field in requested})
+            if not changed:
+                report["unchanged"] += 1
+                continue
+            new_values = {field: new for field, (_, new) in changed.items()}
+
+            print_diff(fruit_id, fruit.get('name', ''), changed)
+            writes.append(Update({"id": fruit_id}, {"$set": new_values, "$inc": {"version": 1}}))
+            report["updated"] += 1
+
+    summary = ", ".join(f"{key}: {count}" for key, count in report.items() if count)
+    if args.dry_run:
+        print(f"\n🔍 --dry-run: nada foi gravado ({summary or 'nenhuma mudança'})")
+        return 0
+    if writes:
+        totals = await write_updates(repository, writes, args)
+        report["updated"] -= totals["errors"]
+        report["errors"] = totals["errors"]
+        summary = ", ".join(f"{key}: {count}" for key, count in report.items() if count)
+    failed = report.get("errors") or report["invalid"] or report["not_found"]
+    print(f"\n{'⚠️ ' if failed else '✅'} Concluído ({summary or 'nenhuma mudança'})")
+    return 1 if failed else 0
+
+
+# --- Subcomandos ---------------------------------------------------------------
+
+async def cmd_list(repository: FruitRepository, args) -> int:
+    query = {}
+    if args.type:
+        query["type"] = args.type
+    if args.rarity:
+        query["rarity"] = args.rarity
+    if args.available is not None:
+        query["available"] = args.available
+
+    # Streaming pelo cursor, agrupado por tipo pela própria ordenação
+    docs = repository.find(query, None if args.json else LIST_FIELDS, sort=[("type", 1), ("name", 1)],
+                           batch_size=args.batch_size)
+    total = 0
+    current_type = None
+    async for fruit in docs:
+        total += 1
+        if args.json:
+            sys.stdout.buffer.write(orjson.dumps(fruit) + b"\n")
+            continue
+        if fruit.get('type') != current_type:
+            current_type = fruit.get('type')
+            print(f"\n🔥 {str(current_type).upper()}")
+        status = "🟢" if fruit.get('available') else "🔴"
+        print(f"{status} {fruit['id']:<22} {fruit.get('name', ''):<28} {fruit.get('rarity', ''):<11} "
+              f"{fruit.get('price', 0):>16,} ฿  ATK {fruit.get('destructive_power', 0):>3} | "
+              f"DEF {fruit.get('defense_rating', 0):>3} | SPD {fruit.get('speed_rating', 0):>3}  "
+              f"👤 {fruit.get('current_user') or 'Nenhum'}")
+    if not args.json:
+        print(f"\n✨ Total de frutas: {total}")
+    return 0
+
+
+async def cmd_get(repository: FruitRepository, args) -> int:
+    found = {doc['id']: doc for doc in await repository.find_many({"id": {"$in": args.ids}})}
+    for fruit_id in args.ids:
+        if fruit_id in found:
+            sys.stdout.buffer.write(orjson.dumps(found[fruit_id], option=orjson.OPT_INDENT_2) + b"\n")
+        else:
+            print(f"❌ {fruit_id}: fruta não encontrada", file=sys.stderr)
+    return 0 if len(found) == len(set(args.ids)) else 1
+
+
+def parse_assignment(text: str) -> Tuple[str, object]:
+    field, sep, raw = text.partition("=")
+    if not sep or not field:
+        raise argparse.ArgumentTypeError(f"use campo=valor: {text}")
+    try:
+        return field, orjson.loads(raw)
+    except orjson.JSONDecodeError:
+        return field, raw
+
+
+async def cmd_set(repository: FruitRepository, args) -> int:
+    return await apply_changes(repository, [(args.id, dict(args.assignments))], args)
+
+
+def read_changes(path: Path) -> List[Change]:
+    data = path.read_bytes()
+    try:
+        items = orjson.loads(data)
+    except orjson.JSONDecodeError:
+        items = [orjson.loads(line) for line in data.splitlines() if line.strip()]
+    if isinstance(items, dict):
+        items = [items]
+    return [(item['id'], item['changes']) for item in items]
+
+
+async def cmd_bulk_apply(repository: FruitRepository, args) -> int:
+    try:
+        operations = read_changes(args.file)
+    except (OSError, orjson.JSONDecodeError, KeyError, TypeError) as e:
+        print(f"❌ Não foi possível ler {args.file}: {e!r}")
+        return 1
+    print(f"📦 {len(operations)} mudança(s) em {args.file}\n")
+    return await apply_changes(repository, operations, args)
+
+
+async def cmd_dedupe(repository: FruitRepository, args) -> int:
+    if not isinstance(repository, MotorFruitRepository):
+        print("✅ O armazenamento em memória não aceita ids duplicados: nada a fazer.")
+        return 0
+    collection = repository.collection
+
+    # As duplicatas são removidas enquanto o $group ainda está chegando, em lotes de
+    # --batch-size com no máximo --concurrency lotes em andamento: a memória não
+    # depende de quantas duplicatas existem
+    semaphore = asyncio.Semaphore(args.concurrency)
+    pending = set()
+    found = removed = 0
+    batch = []
+
+    async def delete(ids):
+        nonlocal removed
+        try:
+            result = await collection.delete_many({'_id': {'$in': ids}})
+            removed += result.deleted_count
+        finally:
+            semaphore.release()
+
+    async def flush(ids):
+        await semaphore.acquire()
+        task = asyncio.ensure_future(delete(ids))
+        pending.add(task)
+        task.add_done_callback(pending.discard)
+
+    async for group in collection.aggregate(DUPLICATES_PIPELINE, allowDiskUse=True):
+        removing = [_id for _id in group['all'] if _id != group['keep']]
+        print(f"   • {group['_id']}: {group['count']} cópias, {len(removing)} a remover")
+        found += len(removing)
+        if args.dry_run:
+            continue
+        batch.extend(removing)
+        while len(batch) >= args.batch_size:
+            await flush(batch[:args.batch_size])
+            batch = batch[args.batch_size:]
+    if batch:
+        await flush(batch)
+    await asyncio.gather(*pending)
+
+    if args.dry_run:
+        # Nem o índice é criado: o --dry-run não grava nada
+        print(f"\n🔍 --dry-run: {found} documento(s) seriam removidos")
+        return 0
+    if found:
+        print(f"🗑️  Removidos: {removed} documento(s)")
+    else:
+        print("✅ Nenhuma duplicata encontrada! Banco já está limpo.")
+
+    # Com o índice único, inserts e upserts não conseguem mais duplicar frutas
+    try:
+        await collection.create_indexes([ID_INDEX])
+        print("🔒 Índice único em 'id' garantido.")
+    except OperationFailure as e:
+        print(f"⚠️  Não foi possível criar o índice único em 'id': {e}")
+        print("   Alguma duplicata foi inserida durante a limpeza; rode o comando novamente.")
+        return 1
+    return 0
+
+
+async def cmd_reseed(repository: FruitRepository, args) -> int:
+    # Mesma validação do /api/init-database: o banco recebe frutas no formato de DevilFruit
+    try:
+        seeds = seed_fruits(args.file)
+    except ValidationError as e:
+        print(f"❌ Seed inválido em {args.file}: {validation_message(e)}")
+        return 1
+    except (OSError, ValueError) as e:
+        print(f"❌ Não foi possível ler {args.file}: {e}")
+        return 1
+    if args.dry_run:
+        existing = {doc['id']: doc for doc in await repository.find_many({"id": {"$in": [s['id'] for s in seeds]}})}
+        for seed in seeds:
+            current = existing.get(seed['id'])
+            if current is None:
+                print(f"➕ {seed['id']} ({seed.get('name', '')})")
+            elif args.overwrite and diff(current, seed):
+                print_diff(seed['id'], seed.get('name', ''), diff(current, seed))
+
+    report = await sync_seed(repository, seeds, overwrite=args.overwrite, dry_run=args.dry_run)
+    prefix = "🔍 --dry-run, nada foi gravado" if args.dry_run else "✅ Seed aplicado"
+    print(f"\n{prefix}: " + ", ".join(f"{key}: {count}" for key, count in report.items()))
+    if report["diverged"]:
+        print("   Frutas que divergem do seed foram mantidas; use --overwrite para restaurá-las.")
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Administração das Akuma no Mi")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    def writes(sub, dry_run_help):
+        sub.add_argument("--dry-run", action="store_true", help=dry_run_help)
+        sub.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="documentos por lote")
+        sub.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY, help="lotes gravados ao mesmo tempo")
+
+    sub = subparsers.add_parser("list", help="lista as frutas, agrupadas por tipo")
+    sub.add_argument("--type")
+    sub.add_argument("--rarity")
+    availability = sub.add_mutually_exclusive_group()
+    availability.add_argument("--available", dest="available", action="store_const", const=True)
+    availability.add_argument("--unavailable", dest="available", action="store_const", const=False)
+    sub.add_argument("--json", action="store_true", help="uma fruta completa por linha (NDJSON)")
+    sub.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="documentos por lote do cursor")
+    sub.set_defaults(handler=cmd_list)
+
+    sub = subparsers.add_parser("get", help="mostra as frutas em JSON")
+    sub.add_argument("ids", nargs="+")
+    sub.set_defaults(handler=cmd_get)
+
+    sub = subparsers.add_parser("set", help="altera campos de uma fruta")
+    sub.add_argument("id")
+    sub.add_argument("assignments", nargs="+", type=parse_assignment, metavar="campo=valor")
+    writes(sub, "só mostra a diferença")
+    sub.set_defaults(handler=cmd_set)
+
+    sub = subparsers.add_parser("bulk-apply", help="aplica as mudanças de um arquivo JSON/JSONL")
+    sub.add_argument("file", type=Path)
+    writes(sub, "só mostra a diferença")
+    sub.set_defaults(handler=cmd_bulk_apply)
+
+    sub = subparsers.add_parser("dedupe", help="remove frutas duplicadas (por id) e garante o índice único")
+    writes(sub, "só mostra o que seria removido")
+    sub.set_defaults(handler=cmd_dedupe, batch_size=500)
+
+    sub = subparsers.add_parser("reseed", help="sincroniza o banco com o seed (insere as frutas que faltam)")
+    sub.add_argument("--file", type=Path, default=SEED_FILE)
+    sub.add_argument("--overwrite", action="store_true", help="também restaura as frutas que divergem do seed")
+    sub.add_argument("--dry-run", action="store_true", help="só mostra o que mudaria")
+    sub.set_defaults(handler=cmd_reseed)
+
+    return parser
+
+
+async def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    repository = create_repository()
+    await repository.connect()
+    try:
+        return await args.handler(repository, args)
+    finally:
+        await repository.close()
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
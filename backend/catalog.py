@@ -0,0 +1,121 @@
+"""
+Snapshot em memória da coleção devil_fruits
+Os endpoints de leitura consultam o snapshot em vez de ir ao MongoDB a cada request.
+O snapshot é atualizado pelos endpoints de escrita e recarregado quando o TTL expira;
+requests simultâneos esperam a mesma recarga (single-flight) em vez de repetir a consulta.
+Escritas que chegam durante uma recarga são reaplicadas sobre o que ela leu, e uma
+invalidação durante a recarga faz a leitura ser refeita.
+Índices derivados (rankings, busca, ...) se registram com register() e são mantidos
+junto com o snapshot: rebuild(fruits) na carga completa e update(old, new) a cada escrita.
+Sem cache (ttl=0) cada leitura recarrega a coleção, então só os índices que ela pede
+em get(*indexes) são reconstruídos; os demais esperam até alguém precisar deles.
+"""
+import time
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from singleflight import SingleFlight
+
+
+class CatalogSnapshot:
+    def __init__(self, loader: Callable[[], Awaitable[List[dict]]], ttl: float = 300.0):
+        self._loader = loader
+        self.ttl = ttl
+        self.version = 0
+        self._fruits: Dict[str, dict] = {}
+        self._items: List[dict] = []
+        self._loaded_at: Optional[float] = None
+        self._flight = SingleFlight("catalog")
+        # Frutas gravadas desde o início da recarga em andamento (None fora de uma recarga)
+        self._written: Optional[Dict[str, dict]] = None
+        self._invalidations = 0
+        self._indexes = []
+        # Índices ainda não reconstruídos desde a última recarga
+        self._stale = set()
+
+    def register(self, index):
+        self._indexes.append(index)
+        if self._loaded_at is not None:
+            self._stale.add(index)
+        return index
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0
+
+    def _is_fresh(self) -> bool:
+        if self._loaded_at is None:
+            return False
+        return time.monotonic() - self._loaded_at < self.ttl
+
+    async def get(self, *indexes) -> List[dict]:
+        """Retorna a lista de frutas; a lista é compartilhada e não deve ser modificada.
+        indexes são os índices registrados que o chamador vai consultar: com o cache
+        ligado todos ficam em dia, sem cache só esses são reconstruídos."""
+        # Sem cache (ttl=0) recarrega a cada leitura, mas leituras simultâneas
+        # compartilham a recarga em andamento; nunca há duas recargas ao mesmo tempo
+        if not self.enabled or not self._is_fresh():
+            await self._flight.do("refresh", self._refresh)
+        for index in list(self._stale) if self.enabled else indexes:
+            if index in self._stale:
+                self._stale.discard(index)
+                index.rebuild(self._items)
+        return self._items
+
+    async def get_fruit(self, fruit_id: str) -> Optional[dict]:
+        await self.get()
+        return self._fruits.get(fruit_id)
+
+    def lookup(self, fruit_ids: List[str]) -> Dict[str, dict]:
+        """Frutas do snapshot atual por id; chamar depois de get()."""
+        return {fruit_id: self._fruits[fruit_id] for fruit_id in fruit_ids if fruit_id in self._fruits}
+
+    async def _refresh(self):
+        self._written = {}
+        try:
+            while True:
+                invalidations = self._invalidations
+                fruits = await self._loader()
+                if self._invalidations == invalidations:
+                    break
+            written = self._written
+        finally:
+            self._written = None
+
+        loaded = {fruit['id']: fruit for fruit in fruits}
+        # A leitura pode ter visto um documento de antes de uma escrita feita durante ela;
+        # a versão diz qual dos dois é o mais novo
+        for fruit in written.values():
+            current = loaded.get(fruit['id'])
+            if current is None or current.get('version', 0) <= fruit.get('version', 0):
+                loaded[fruit['id']] = fruit
+        self._fruits = loaded
+        self._items = list(self._fruits.values())
+        self._loaded_at = time.monotonic()
+        self.version += 1
+        # Reconstruídos em get(), só quando alguém vai usá-los
+        self._stale = set(self._indexes)
+
+    def upsert(self, fruit: dict):
+        """Aplica no snapshot uma fruta que acabou de ser gravada no banco."""
+        self.upsert_many([fruit])
+
+    def upsert_many(self, fruits: List[dict]):
+        """Aplica várias frutas gravadas de uma vez, com um único incremento de versão."""
+        if self._written is not None:
+            self._written.update((fruit['id'], fruit) for fruit in fruits)
+        if self._loaded_at is None or not fruits:
+            return
+        for fruit in fruits:
+            old = self._fruits.get(fruit['id'])
+            self._fruits[fruit['id']] = fruit
+            for index in self._indexes:
+                if index not in self._stale:
+                    index.update(old, fruit)
+        self._items = list(self._fruits.values())
+        self.version += 1
+
+    def invalidate(self):
+        """Descarta o snapshot; o próximo request recarrega do banco."""
+        self._loaded_at = None
+        self._invalidations += 1
+        self.version += 1
@@ -0,0 +1,159 @@
+"""
+Cliente do MongoDB (Motor) com o pool de conexões configurado pelo .env
+O servidor cria o cliente no lifespan do FastAPI; scripts podem usar create_client()
+para ter o mesmo pool. O PoolMonitor mede quanto tempo cada operação espera por
+uma conexão livre do pool, para dimensionar MONGO_MAX_POOL_SIZE.
+
+Variáveis (todas opcionais, o padrão é o do pymongo):
+    MONGO_MAX_POOL_SIZE, MONGO_MIN_POOL_SIZE, MONGO_MAX_IDLE_TIME_MS,
+    MONGO_WAIT_QUEUE_TIMEOUT_MS, MONGO_SERVER_SELECTION_TIMEOUT_MS, MONGO_CONNECT_TIMEOUT_MS
+"""
+import os
+import threading
+import time
+from typing import Dict, List
+
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import monitoring
+
+POOL_SETTINGS = {
+    "maxPoolSize": "MONGO_MAX_POOL_SIZE",
+    "minPoolSize": "MONGO_MIN_POOL_SIZE",
+    "maxIdleTimeMS": "MONGO_MAX_IDLE_TIME_MS",
+    "waitQueueTimeoutMS": "MONGO_WAIT_QUEUE_TIMEOUT_MS",
+    "serverSelectionTimeoutMS": "MONGO_SERVER_SELECTION_TIMEOUT_MS",
+    "connectTimeoutMS": "MONGO_CONNECT_TIMEOUT_MS",
+}
+
+# Limites (ms) dos baldes do histograma de espera por conexão
+WAIT_BUCKETS_MS = (0.1, 0.5, 1, 5, 10, 50, 100, 500, 1000, 5000)
+
+
+def pool_options() -> Dict[str, int]:
+    return {option: int(os.environ[var]) for option, var in POOL_SETTINGS.items() if os.environ.get(var)}
+
+
+class PoolMonitor(monitoring.ConnectionPoolListener):
+    """Tempo de espera no checkout de conexões e uso do pool.
+
+    O pymongo não informa a duração do checkout, então o início é guardado por
+    thread: o Motor executa cada operação inteira numa thread do executor.
+    """
+
+    def __init__(self):
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.failures = 0
+        self.wait_total_ms = 0.0
+        self.wait_max_ms = 0.0
+        self.buckets = [0] * (len(WAIT_BUCKETS_MS) + 1)
+        self.open_connections = 0
+        self.in_use = 0
+
+    def _record_wait(self) -> float:
+        started = getattr(self._local, "started", None)
+        self._local.started = None
+        return (time.perf_counter() - started) * 1000 if started is not None else 0.0
+
+    def connection_check_out_started(self, event):
+        self._local.started = time.perf_counter()
+
+    def connection_checked_out(self, event):
+        wait_ms = self._record_wait()
+        with self._lock:
+            self.checkouts += 1
+            self.in_use += 1
+            self.wait_total_ms += wait_ms
+            self.wait_max_ms = max(self.wait_max_ms, wait_ms)
+            for i, limit in enumerate(WAIT_BUCKETS_MS):
+                if wait_ms <= limit:
+                    self.buckets[i] += 1
+                    break
+            else:
+                self.buckets[-1] += 1
+
+    def connection_check_out_failed(self, event):
+        self._record_wait()
+        with self._lock:
+            self.failures += 1
+
+    def connection_checked_in(self, event):
+        with self._lock:
+            self.in_use -= 1
+
+    def connection_created(self, event):
+        with self._lock:
+            self.open_connections += 1
+
+    def connection_closed(self, event):
+        with self._lock:
+            self.open_connections -= 1
+
+    def connection_ready(self, event):
+        pass
+
+    def pool_created(self, event):
+        pass
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        pass
+
+    def pool_closed(self, event):
+        pass
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "checkouts": self.checkouts,
+                "checkout_failures": self.failures,
+                "wait_mean_ms": self.wait_total_ms / self.checkouts if self.checkouts else 0.0,
+                "wait_max_ms": self.wait_max_ms,
+                "wait_buckets_ms": {
+                    **{f"<={limit}": count for limit, count in zip(WAIT_BUCKETS_MS, self.buckets)},
+                    f">{WAIT_BUCKETS_MS[-1]}": self.buckets[-1],
+                },
+                "open_connections": self.open_connections,
+                "in_use": self.in_use,
+            }
+
+    def metric_lines(self) -> List[str]:
+        """Mesmos números no formato do Prometheus (espera em segundos)."""
+        name = "mongo_pool_checkout_wait_seconds"
+        with self._lock:
+            lines = [f"# HELP {name} Espera por uma conexão livre do pool", f"# TYPE {name} histogram"]
+            cumulative = 0
+            for limit, count in zip(WAIT_BUCKETS_MS, self.buckets):
+                cumulative += count
+                lines.append(f'{name}_bucket{{le="{limit / 1000:g}"}} {cumulative}')
+            lines.append(f'{name}_bucket{{le="+Inf"}} {self.checkouts}')
+            lines.append(f"{name}_sum {self.wait_total_ms / 1000:g}")
+            lines.append(f"{name}_count {self.checkouts}")
+            lines += [
+                "# TYPE mongo_pool_checkout_failures_total counter",
+                f"mongo_pool_checkout_failures_total {self.failures}",
+                "# TYPE mongo_pool_open_connections gauge",
+                f"mongo_pool_open_connections {self.open_connections}",
+                "# TYPE mongo_pool_in_use_connections gauge",
+                f"mongo_pool_in_use_connections {self.in_use}",
+            ]
+        return lines
+
+
+pool_monitor = PoolMonitor()
+
+
+def create_client(listeners: List = ()) -> AsyncIOMotorClient:
+    return AsyncIOMotorClient(
+        os.environ['MONGO_URL'],
+        event_listeners=[pool_monitor, *listeners],
+        **pool_options(),
+    )
+
+
+async def warm_up(client: AsyncIOMotorClient):
+    # Força a seleção do servidor e abre a primeira conexão antes de aceitar requests
+    await client.admin.command("ping")
@@ -0,0 +1,60 @@
+"""
+Exportação do catálogo em NDJSON ou CSV para GET /api/fruits/export
+Os documentos vêm do cursor do repositório e saem em blocos de batch_size linhas,
+então a memória usada não depende do tamanho do catálogo. Com gzip, cada bloco
+passa por um compressor incremental antes de ser enviado.
+"""
+import csv
+import io
+import zlib
+from typing import AsyncIterator, List
+
+import orjson
+
+# Separador dos campos que são listas (keywords, locations...) no CSV
+CSV_LIST_SEPARATOR = "|"
+
+
+async def ndjson_chunks(docs: AsyncIterator[dict], batch_size: int) -> AsyncIterator[bytes]:
+    lines = []
+    async for doc in docs:
+        lines.append(orjson.dumps(doc))
+        if len(lines) >= batch_size:
+            yield b"\n".join(lines) + b"\n"
+            lines = []
+    if lines:
+        yield b"\n".join(lines) + b"\n"
+
+
+def _csv_value(value):
+    if isinstance(value, list):
+        return CSV_LIST_SEPARATOR.join(str(v) for v in value)
+    if isinstance(value, bool):
+        return str(value).lower()
+    return "" if value is None else value
+
+
+async def csv_chunks(docs: AsyncIterator[dict], columns: List[str], batch_size: int) -> AsyncIterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    rows = 0
+    async for doc in docs:
+        writer.writerow([_csv_value(doc.get(column)) for column in columns])
+        rows += 1
+        if rows >= batch_size:
+            yield buffer.getvalue().encode()
+            buffer.seek(0)
+            buffer.truncate()
+            rows = 0
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+
+async def gzipped(chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    compressor = zlib.compressobj(wbits=16 + zlib.MAX_WBITS)
+    async for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
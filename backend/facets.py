@@ -0,0 +1,70 @@
+"""
+Contagens por faceta de GET /api/fruits/facets (tipo, raridade, disponibilidade e
+estilos de luta), mantidas junto com o snapshot do catálogo
+Cada valor de cada faceta é um bitmap (int do Python, um bit por fruta), então uma
+contagem é um AND entre bitmaps seguido de bit_count(). A contagem de uma faceta
+ignora o filtro dela mesma ("Logia (12)" continua visível com Paramecia selecionada).
+Cada escrita só mexe nos bits da fruta alterada.
+"""
+from collections import defaultdict
+from typing import Dict, List, Optional
+
+# Faceta -> campo da fruta (fighting_styles é uma lista: a fruta entra em cada valor)
+FACET_FIELDS = {"type": "type", "rarity": "rarity", "available": "available", "fighting_style": "fighting_styles"}
+
+
+def _values(fruit: dict, field: str) -> List[str]:
+    value = fruit.get(field)
+    if isinstance(value, list):
+        return value
+    if isinstance(value, bool):
+        return [str(value).lower()]
+    return [] if value is None else [value]
+
+
+class FacetIndex:
+    def __init__(self):
+        self._rows: Dict[str, int] = {}
+        self._all = 0
+        self._bitmaps: Dict[str, Dict[str, int]] = {facet: defaultdict(int) for facet in FACET_FIELDS}
+
+    def _set(self, fruit: dict, row: int, on: bool):
+        bit = 1 << row
+        for facet, field in FACET_FIELDS.items():
+            bitmaps = self._bitmaps[facet]
+            for value in _values(fruit, field):
+                bitmaps[value] = bitmaps[value] | bit if on else bitmaps[value] & ~bit
+                if not bitmaps[value]:
+                    del bitmaps[value]
+
+    def rebuild(self, fruits: List[dict]):
+        self._rows = {}
+        self._all = 0
+        self._bitmaps = {facet: defaultdict(int) for facet in FACET_FIELDS}
+        for fruit in fruits:
+            self.update(None, fruit)
+
+    def update(self, old: Optional[dict], new: dict):
+        row = self._rows.get(new['id'])
+        if row is None:
+            row = self._rows[new['id']] = len(self._rows)
+            self._all |= 1 << row
+        elif old is not None:
+            self._set(old, row, on=False)
+        self._set(new, row, on=True)
+
+    def _selection(self, filters: Dict[str, str], skip: Optional[str] = None) -> int:
+        selected = self._all
+        for facet, value in filters.items():
+            if facet != skip:
+                selected &= self._bitmaps[facet].get(value, 0)
+        return selected
+
+    def counts(self, filters: Dict[str, str]) -> dict:
+        """filters: faceta -> valor (available como "true"/"false")."""
+        result = {"total": self._selection(filters).bit_count()}
+        for facet, bitmaps in self._bitmaps.items():
+            selected = self._selection(filters, skip=facet)
+            counts = {value: (bitmap & selected).bit_count() for value, bitmap in bitmaps.items()}
+            result[facet] = dict(sorted(counts.items()))
+        return result
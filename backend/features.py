@@ -0,0 +1,172 @@
+"""
+Matriz de atributos das frutas (NumPy) mantida junto com o snapshot do catálogo
+Cada fruta é uma linha: os atributos numéricos de STAT_COLUMNS, os códigos das
+categorias usadas nos filtros e um vetor binário com as palavras-chave e os estilos
+de luta. As consultas são operações vetorizadas sobre as matrizes inteiras e os k
+melhores saem de um argpartition, sem laço Python sobre o catálogo. Cada escrita só
+reescreve (ou acrescenta) a linha da fruta.
+"""
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from rankings import RARITY_ORDER
+
+STAT_COLUMNS = ("destructive_power", "defense_rating", "speed_rating", "rarity", "price")
+CATEGORY_FIELDS = ("type", "rarity", "available")
+
+# Atributos comparados pelas frutas similares e o peso de cada parte da nota
+SIMILARITY_COLUMNS = ("destructive_power", "defense_rating", "speed_rating", "price")
+STATS_WEIGHT = 0.6
+TAGS_WEIGHT = 0.4
+
+
+def stat_row(fruit: dict) -> List[float]:
+    return [
+        fruit.get('destructive_power', 0),
+        fruit.get('defense_rating', 0),
+        fruit.get('speed_rating', 0),
+        RARITY_ORDER.get(fruit.get('rarity'), 0),
+        fruit.get('price', 0),
+    ]
+
+
+def fruit_tags(fruit: dict) -> set:
+    return {("keyword", k.lower()) for k in fruit.get('keywords', [])} | \
+           {("style", s) for s in fruit.get('fighting_styles', [])}
+
+
+def top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """Posições das k maiores notas, da maior para a menor (ignora -inf)."""
+    k = min(k, int(np.isfinite(scores).sum()))
+    if k <= 0:
+        return np.empty(0, dtype=np.intp)
+    best = np.argpartition(-scores, k - 1)[:k]
+    return best[np.argsort(-scores[best], kind="stable")]
+
+
+def _grown(array: np.ndarray, rows: int, cols: int) -> np.ndarray:
+    # Capacidade dobra para que acréscimos sucessivos custem O(1) amortizado
+    if rows <= array.shape[0] and cols <= array.shape[1]:
+        return array
+    shape = tuple(size if needed <= size else max(needed, 2 * size) for size, needed in zip(array.shape, (rows, cols)))
+    bigger = np.zeros(shape, dtype=array.dtype)
+    bigger[:array.shape[0], :array.shape[1]] = array
+    return bigger
+
+
+class FeatureMatrix:
+    def __init__(self):
+        self.fruits: List[dict] = []
+        self._rows: Dict[str, int] = {}
+        self._vocab: Dict[tuple, int] = {}
+        self._stats = np.zeros((0, len(STAT_COLUMNS)))
+        self._tags = np.zeros((0, 0), dtype=np.float32)
+        self._codes: Dict[str, Dict] = {field: {} for field in CATEGORY_FIELDS}
+        self._categories = np.zeros((0, len(CATEGORY_FIELDS)), dtype=np.int32)
+        self._scaled: Optional[np.ndarray] = None
+
+    def __contains__(self, fruit_id: str) -> bool:
+        return fruit_id in self._rows
+
+    @property
+    def stats(self) -> np.ndarray:
+        return self._stats[:len(self.fruits)]
+
+    @property
+    def tags(self) -> np.ndarray:
+        return self._tags[:len(self.fruits), :len(self._vocab)]
+
+    def _category_row(self, fruit: dict) -> List[int]:
+        return [self._codes[field].setdefault(fruit.get(field), len(self._codes[field])) for field in CATEGORY_FIELDS]
+
+    def _set_row(self, row: int, fruit: dict):
+        tags = fruit_tags(fruit)
+        for tag in tags:
+            self._vocab.setdefault(tag, len(self._vocab))
+        self._stats = _grown(self._stats, row + 1, len(STAT_COLUMNS))
+        self._tags = _grown(self._tags, row + 1, len(self._vocab))
+        self._categories = _grown(self._categories, row + 1, len(CATEGORY_FIELDS))
+        self._stats[row] = stat_row(fruit)
+        self._categories[row] = self._category_row(fruit)
+        self._tags[row] = 0
+        self._tags[row, [self._vocab[tag] for tag in tags]] = 1
+        self._scaled = None
+
+    def rebuild(self, fruits: List[dict]):
+        self.fruits = list(fruits)
+        self._rows = {fruit['id']: row for row, fruit in enumerate(self.fruits)}
+        self._vocab = {}
+        for fruit in self.fruits:
+            for tag in fruit_tags(fruit):
+                self._vocab.setdefault(tag, len(self._vocab))
+        self._stats = np.array([stat_row(fruit) for fruit in self.fruits], dtype=np.float64).reshape(-1, len(STAT_COLUMNS))
+        self._tags = np.zeros((len(self.fruits), len(self._vocab)), dtype=np.float32)
+        for row, fruit in enumerate(self.fruits):
+            self._tags[row, [self._vocab[tag] for tag in fruit_tags(fruit)]] = 1
+        self._codes = {field: {} for field in CATEGORY_FIELDS}
+        self._categories = np.array([self._category_row(fruit) for fruit in self.fruits], dtype=np.int32).reshape(-1, len(CATEGORY_FIELDS))
+        self._scaled = None
+
+    def update(self, old: Optional[dict], new: dict):
+        row = self._rows.get(new['id'])
+        if row is None:
+            row = self._rows[new['id']] = len(self.fruits)
+            self.fruits.append(new)
+        else:
+            self.fruits[row] = new
+        self._set_row(row, new)
+
+    def scaled(self) -> np.ndarray:
+        """Atributos em [0, 1] (min-max por coluna; preço em escala log), recalculado só após escritas."""
+        if self._scaled is None:
+            values = self.stats.copy()
+            price = STAT_COLUMNS.index("price")
+            values[:, price] = np.log10(np.maximum(values[:, price], 1))
+            low = values.min(axis=0) if len(values) else 0
+            span = (values.max(axis=0) - low) if len(values) else 1
+            self._scaled = (values - low) / np.where(span > 0, span, 1)
+        return self._scaled
+
+    def similar(self, fruit_id: str, k: int) -> List[Tuple[dict, float]]:
+        """As k frutas mais parecidas: distância entre os atributos + sobreposição (Jaccard) das tags."""
+        row = self._rows[fruit_id]
+        columns = [STAT_COLUMNS.index(c) for c in SIMILARITY_COLUMNS]
+        stats = self.scaled()[:, columns]
+        distance = np.sqrt(((stats - stats[row]) ** 2).sum(axis=1) / len(columns))
+
+        tags = self.tags
+        shared = tags @ tags[row]
+        union = tags.sum(axis=1) + tags[row].sum() - shared
+        jaccard = np.divide(shared, union, out=np.zeros_like(shared), where=union > 0)
+
+        scores = STATS_WEIGHT * (1 - distance) + TAGS_WEIGHT * jaccard
+        scores[row] = -np.inf
+        return [(self.fruits[i], float(scores[i])) for i in top_k(scores, k)]
+
+    def mask(self, filters: Dict[str, object], max_price: Optional[int] = None,
+             fighting_style: Optional[str] = None) -> np.ndarray:
+        """Linhas que passam nos filtros de igualdade (CATEGORY_FIELDS), preço máximo e estilo de luta."""
+        n = len(self.fruits)
+        selected = np.ones(n, dtype=bool)
+        for field, value in filters.items():
+            code = self._codes[field].get(value)
+            if code is None:
+                return np.zeros(n, dtype=bool)
+            selected &= self._categories[:n, CATEGORY_FIELDS.index(field)] == code
+        if max_price is not None:
+            selected &= self.stats[:, STAT_COLUMNS.index("price")] <= max_price
+        if fighting_style is not None:
+            column = self._vocab.get(("style", fighting_style))
+            if column is None:
+                return np.zeros(n, dtype=bool)
+            selected &= self.tags[:, column] > 0
+        return selected
+
+    def ranked(self, weights: Dict[str, float], selected: np.ndarray, limit: int,
+               offset: int = 0) -> List[Tuple[dict, float]]:
+        """Ranking pela soma ponderada dos atributos normalizados (pesos negativos penalizam)."""
+        vector = np.array([weights.get(column, 0.0) for column in STAT_COLUMNS])
+        scores = np.where(selected, self.scaled() @ vector, -np.inf)
+        best = top_k(scores, offset + limit)[offset:]
+        return [(self.fruits[i], float(scores[i])) for i in best]
@@ -0,0 +1,87 @@
+"""
+Índices da coleção devil_fruits, criados na inicialização do servidor
+Também gera o relatório de qual índice o MongoDB escolhe para a consulta de cada endpoint.
+"""
+import logging
+from typing import List
+
+from pymongo import ASCENDING, DESCENDING, IndexModel
+from pymongo.errors import OperationFailure
+
+logger = logging.getLogger(__name__)
+
+# Garante que init-database/inserts nunca criem frutas duplicadas
+ID_INDEX = IndexModel([("id", ASCENDING)], name="id_unique", unique=True)
+
+FRUIT_INDEXES = [
+    ID_INDEX,
+    # Ordenações de /api/fruits (sort_by + id para o keyset); price_desc usa price_id de trás para frente
+    IndexModel([("price", ASCENDING), ("id", ASCENDING)], name="price_id"),
+    IndexModel([("name", ASCENDING), ("id", ASCENDING)], name="name_id"),
+    # Filtros de igualdade seguidos da ordenação por preço (e do orçamento da busca)
+    IndexModel([("type", ASCENDING), ("price", ASCENDING), ("id", ASCENDING)], name="type_price_id"),
+    IndexModel([("rarity", ASCENDING), ("price", ASCENDING), ("id", ASCENDING)], name="rarity_price_id"),
+    IndexModel([("available", ASCENDING), ("price", ASCENDING), ("id", ASCENDING)], name="available_price_id"),
+    IndexModel([("fighting_styles", ASCENDING), ("price", ASCENDING)], name="fighting_styles_price"),
+]
+
+# Consulta representativa de cada endpoint: (endpoint, filtro, ordenação)
+ENDPOINT_QUERIES = [
+    ("GET /api/fruits/{fruit_id}", {"id": "gomu-gomu"}, None),
+    ("GET /api/fruits?sort_by=price_asc", {}, [("price", ASCENDING), ("id", ASCENDING)]),
+    ("GET /api/fruits?sort_by=price_desc", {}, [("price", DESCENDING), ("id", DESCENDING)]),
+    ("GET /api/fruits?sort_by=name", {}, [("name", ASCENDING), ("id", ASCENDING)]),
+    ("GET /api/fruits?type=&sort_by=price_asc", {"type": "Logia"}, [("price", ASCENDING), ("id", ASCENDING)]),
+    ("GET /api/fruits?rarity=&sort_by=price_desc", {"rarity": "Mítica"}, [("price", DESCENDING), ("id", DESCENDING)]),
+    ("GET /api/fruits?available=&sort_by=price_asc", {"available": True}, [("price", ASCENDING), ("id", ASCENDING)]),
+    ("POST /api/search (fruit_type, budget)", {"type": "Logia", "price": {"$lte": 500000000}}, None),
+    ("POST /api/search (rarity)", {"rarity": "Rara"}, None),
+    ("POST /api/search (fighting_style)", {"fighting_styles": "Luta de longe"}, None),
+]
+
+
+async def ensure_indexes(collection):
+    try:
+        await collection.create_indexes(FRUIT_INDEXES)
+    except OperationFailure as e:
+        # O índice único em id falha enquanto houver duplicatas no banco
+        logger.warning("Não foi possível criar os índices de devil_fruits (%s). "
+                       "Rode python backend/admin.py dedupe e reinicie o servidor.", e)
+        for index in FRUIT_INDEXES:
+            if index.document.get("unique"):
+                continue
+            await collection.create_indexes([index])
+
+
+def _plan_indexes(stage: dict) -> List[str]:
+    """Índices (ou COLLSCAN) usados por um estágio do plano e seus filhos."""
+    found = []
+    if stage.get("indexName"):
+        found.append(stage["indexName"])
+    elif stage.get("stage") == "COLLSCAN":
+        found.append("COLLSCAN")
+    for child in [stage.get("inputStage")] + stage.get("inputStages", []):
+        if child:
+            found.extend(_plan_indexes(child))
+    return found
+
+
+async def index_report(collection) -> List[dict]:
+    report = []
+    for endpoint, query, sort in ENDPOINT_QUERIES:
+        cursor = collection.find(query, {"_id": 0})
+        if sort:
+            cursor = cursor.sort(sort)
+        plan = await cursor.explain()
+        winning = plan.get("queryPlanner", {}).get("winningPlan", {})
+        # Em versões recentes o plano vem dentro de queryPlan
+        winning = winning.get("queryPlan", winning)
+        indexes = _plan_indexes(winning)
+        report.append({
+            "endpoint": endpoint,
+            "filter": query,
+            "sort": sort,
+            "indexes": indexes,
+            "collection_scan": "COLLSCAN" in indexes,
+        })
+    return report
@@ -0,0 +1,253 @@
+"""
+Teste de carga local da API (substitui o antigo backend_test.py)
+Sem --url, a aplicação roda no próprio processo (httpx + ASGI) com o armazenamento
+em memória (STORAGE_BACKEND=memory), então não precisa de servidor nenhum. Usuários virtuais
+executam cenários sorteados conforme o mix e, no final, o relatório mostra
+p50/p95/p99 e requests por segundo de cada endpoint.
+
+Com um baseline salvo, o resultado é comparado com ele e o script sai com erro se
+algum endpoint piorar além do limite (--max-regression), ou se houver erros.
+
+COMO USAR:
+    python loadtest.py                                   # mix padrão, 20 usuários, 10 s
+    python loadtest.py --mix browse=5,search=3,detail=4  # só esses cenários, com esses pesos
+    python loadtest.py --users 50 --duration 30
+    python loadtest.py --storage mongo                   # app no processo, MongoDB do .env
+    python loadtest.py --save-baseline                   # grava loadtest_baseline.json
+    python loadtest.py --max-regression 0.15             # compara com o baseline salvo
+    python loadtest.py --url http://localhost:8001       # contra uma instância rodando
+                                                         # (o cenário patch altera preços!)
+"""
+import argparse
+import asyncio
+import json
+import logging
+import math
+import os
+import random
+import sys
+import time
+from collections import defaultdict
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import Dict, List
+
+import httpx
+
+from rankings import RANKING_KEYS, RARITY_ORDER
+
+ROOT_DIR = Path(__file__).parent
+BASELINE_FILE = ROOT_DIR / 'loadtest_baseline.json'
+
+DEFAULT_MIX = {"browse": 4, "search": 3, "rankings": 3, "detail": 4, "patch": 1}
+
+TYPES = ["Logia", "Paramecia", "Zoan"]
+RARITIES = list(RARITY_ORDER)
+SORTS = [None, "price_asc", "price_desc", "name"]
+SEARCH_TERMS = ["fogo", "gelo", "luz", "borracha", "terremoto", "sombra", "poder", "cura", "magma", "tempo"]
+RANKINGS = list(RANKING_KEYS)
+
+
+# Cada cenário faz um request e devolve (nome do endpoint no relatório, resposta)
+async def browse(http: httpx.AsyncClient, rng: random.Random, ids: List[str]):
+    if rng.random() < 0.2:
+        return "GET /api/black-market", await http.get("/api/black-market")
+    params = {"sort_by": rng.choice(SORTS), "type": rng.choice([None, *TYPES]), "rarity": rng.choice([None, *RARITIES])}
+    params = {key: value for key, value in params.items() if value}
+    return "GET /api/fruits", await http.get("/api/fruits", params=params)
+
+
+async def search(http: httpx.AsyncClient, rng: random.Random, ids: List[str]):
+    body = {"description": " ".join(rng.sample(SEARCH_TERMS, rng.randint(1, 2)))}
+    if rng.random() < 0.5:
+        body["budget"] = rng.choice([100_000_000, 500_000_000, 1_000_000_000])
+    return "POST /api/search", await http.post("/api/search", json=body)
+
+
+async def rankings(http: httpx.AsyncClient, rng: random.Random, ids: List[str]):
+    name = rng.choice(RANKINGS)
+    return f"GET /api/rankings/{name}", await http.get(f"/api/rankings/{name}")
+
+
+async def detail(http: httpx.AsyncClient, rng: random.Random, ids: List[str]):
+    return "GET /api/fruits/{id}", await http.get(f"/api/fruits/{rng.choice(ids)}")
+
+
+async def patch(http: httpx.AsyncClient, rng: random.Random, ids: List[str]):
+    price = rng.randrange(1_000_000, 5_000_000_000, 1_000_000)
+    return "PATCH /api/fruits/{id}", await http.patch(f"/api/fruits/{rng.choice(ids)}", json={"price": price})
+
+
+SCENARIOS = {"browse": browse, "search": search, "rankings": rankings, "detail": detail, "patch": patch}
+
+
+def parse_mix(text: str) -> Dict[str, int]:
+    mix = {}
+    for part in text.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in SCENARIOS:
+            raise SystemExit(f"Cenário desconhecido: {name} (use {', '.join(SCENARIOS)})")
+        mix[name] = int(weight or 1)
+    return mix
+
+
+def percentile(sorted_values: List[float], p: float) -> float:
+    # Nearest-rank, suficiente para comparar execuções
+    index = max(0, min(len(sorted_values) - 1, math.ceil(p * len(sorted_values) / 100) - 1))
+    return sorted_values[index]
+
+
+class Recorder:
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+
+    def record(self, endpoint: str, seconds: float, ok: bool):
+        self.latencies[endpoint].append(seconds * 1000)
+        if not ok:
+            self.errors[endpoint] += 1
+
+    def summary(self, elapsed: float) -> Dict[str, dict]:
+        result = {}
+        for endpoint, values in sorted(self.latencies.items()):
+            values = sorted(values)
+            result[endpoint] = {
+                "requests": len(values),
+                "errors": self.errors[endpoint],
+                "rps": len(values) / elapsed,
+                "p50_ms": percentile(values, 50),
+                "p95_ms": percentile(values, 95),
+                "p99_ms": percentile(values, 99),
+            }
+        return result
+
+
+@asynccontextmanager
+async def open_client(url: str, storage: str):
+    if url:
+        async with httpx.AsyncClient(base_url=url, timeout=30) as http:
+            yield http
+        return
+
+    # Aplicação no próprio processo, com o armazenamento escolhido (ver storage.py)
+    os.environ["STORAGE_BACKEND"] = storage
+    sys.path.insert(0, str(ROOT_DIR))
+    import server
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+    async with server.app.router.lifespan_context(server.app):
+        transport = httpx.ASGITransport(app=server.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://loadtest", timeout=30) as http:
+            yield http
+
+
+async def user(http, rng, ids, mix, deadline, recorder):
+    names = list(mix)
+    weights = [mix[name] for name in names]
+    while time.perf_counter() < deadline:
+        scenario = SCENARIOS[rng.choices(names, weights)[0]]
+        start = time.perf_counter()
+        try:
+            endpoint, response = await scenario(http, rng, ids)
+            ok = response.status_code < 400
+        except httpx.HTTPError:
+            endpoint, ok = scenario.__name__, False
+        recorder.record(endpoint, time.perf_counter() - start, ok)
+
+
+async def run(url: str, storage: str, mix: Dict[str, int], users: int, duration: float,
+              warmup: float, seed: int) -> Dict[str, dict]:
+    async with open_client(url, storage) as http:
+        response = await http.post("/api/init-database")
+        response.raise_for_status()
+        ids = [fruit["id"] for fruit in (await http.get("/api/fruits", params={"fields": "summary"})).json()]
+
+        if warmup:
+            deadline = time.perf_counter() + warmup
+            await asyncio.gather(*(
+                user(http, random.Random(seed - i), ids, mix, deadline, Recorder()) for i in range(users)
+            ))
+
+        recorder = Recorder()
+        start = time.perf_counter()
+        deadline = start + duration
+        await asyncio.gather(*(
+            user(http, random.Random(seed + i), ids, mix, deadline, recorder) for i in range(users)
+        ))
+        return recorder.summary(time.perf_counter() - start)
+
+
+def print_report(summary: Dict[str, dict]):
+    print(f"\n{'endpoint':<32}{'reqs':>8}{'erros':>7}{'req/s':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}")
+    print("-" * 83)
+    for endpoint, s in summary.items():
+        print(f"{endpoint:<32}{s['requests']:>8}{s['errors']:>7}{s['rps']:>9.1f}"
+              f"{s['p50_ms']:>9.2f}{s['p95_ms']:>9.2f}{s['p99_ms']:>9.2f}")
+    total = sum(s['requests'] for s in summary.values())
+    print("-" * 83)
+    print(f"{'total':<32}{total:>8}{sum(s['errors'] for s in summary.values()):>7}"
+          f"{sum(s['rps'] for s in summary.values()):>9.1f}")
+
+
+def compare(summary: Dict[str, dict], baseline: Dict[str, dict], max_regression: float) -> List[str]:
+    """Endpoints que pioraram mais que max_regression (latência maior ou vazão menor)."""
+    regressions = []
+    for endpoint, current in summary.items():
+        base = baseline.get(endpoint)
+        if base is None:
+            continue
+        for metric in ("p50_ms", "p95_ms", "p99_ms"):
+            if current[metric] > base[metric] * (1 + max_regression):
+                regressions.append(f"{endpoint} {metric}: {base[metric]:.2f} -> {current[metric]:.2f}")
+        if current["rps"] < base["rps"] * (1 - max_regression):
+            regressions.append(f"{endpoint} rps: {base['rps']:.1f} -> {current['rps']:.1f}")
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Teste de carga local da API")
+    parser.add_argument("--url", help="instância já rodando (padrão: app no próprio processo)")
+    parser.add_argument("--storage", choices=["memory", "mongo"], default="memory",
+                        help="armazenamento da app no próprio processo")
+    parser.add_argument("--mix", type=parse_mix, default=DEFAULT_MIX, help="ex.: browse=4,search=3,detail=4")
+    parser.add_argument("--users", type=int, default=20, help="usuários virtuais simultâneos")
+    parser.add_argument("--duration", type=float, default=10, help="segundos de medição")
+    parser.add_argument("--warmup", type=float, default=2, help="segundos de aquecimento (não medidos)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--baseline", type=Path, default=BASELINE_FILE)
+    parser.add_argument("--save-baseline", action="store_true", help="grava o resultado como baseline")
+    parser.add_argument("--max-regression", type=float, default=0.2, help="piora tolerada (0.2 = 20%%)")
+    args = parser.parse_args()
+
+    summary = asyncio.run(run(args.url, args.storage, args.mix, args.users, args.duration, args.warmup, args.seed))
+    print_report(summary)
+
+    if args.save_baseline:
+        args.baseline.write_text(json.dumps(summary, indent=2, ensure_ascii=False))
+        print(f"\n💾 Baseline salvo em {args.baseline}")
+        return 0
+
+    failed = False
+    errors = sum(s["errors"] for s in summary.values())
+    if errors:
+        print(f"\n❌ {errors} requests com erro")
+        failed = True
+
+    if args.baseline.exists():
+        regressions = compare(summary, json.loads(args.baseline.read_text()), args.max_regression)
+        if regressions:
+            print(f"\n❌ Regressões acima de {args.max_regression:.0%} em relação ao baseline:")
+            for line in regressions:
+                print(f"   • {line}")
+            failed = True
+        else:
+            print(f"\n✅ Dentro de {args.max_regression:.0%} do baseline")
+    else:
+        print(f"\nℹ️  Sem baseline em {args.baseline}; rode com --save-baseline para criar")
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,94 @@
+"""
+Estatísticas de preço do Mercado Negro mantidas junto com o snapshot do catálogo
+Cada grupo (geral, disponibilidade, tipo e raridade) guarda os preços ordenados,
+então contagem, soma, média, mínimo, máximo e percentis saem sem varrer as frutas,
+e cada escrita só reposiciona o preço da fruta alterada.
+"""
+from bisect import bisect_left, insort
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+
+PERCENTILES = (25, 50, 75, 90, 99)
+
+# Campos que definem os grupos, além do grupo geral
+GROUP_FIELDS = {"by_availability": "available", "by_type": "type", "by_rarity": "rarity"}
+
+
+def _percentile(prices: List[Tuple[int, str]], p: float) -> float:
+    # Interpolação linear entre os vizinhos (mesmo método padrão do numpy)
+    rank = (len(prices) - 1) * p / 100
+    low = int(rank)
+    high = min(low + 1, len(prices) - 1)
+    return prices[low][0] + (prices[high][0] - prices[low][0]) * (rank - low)
+
+
+class MarketStats:
+    def __init__(self):
+        self._groups: Dict[Tuple, List[Tuple[int, str]]] = defaultdict(list)
+        self._sums: Dict[Tuple, int] = defaultdict(int)
+        self._names: Dict[str, str] = {}
+
+    def _keys(self, fruit: dict) -> List[Tuple]:
+        keys = [("overall",)]
+        for group, field in GROUP_FIELDS.items():
+            value = fruit.get(field)
+            keys.append((group, str(value).lower() if isinstance(value, bool) else value))
+        return keys
+
+    def _add(self, fruit: dict):
+        entry = (fruit['price'], fruit['id'])
+        for key in self._keys(fruit):
+            insort(self._groups[key], entry)
+            self._sums[key] += fruit['price']
+        self._names[fruit['id']] = fruit['name']
+
+    def _remove(self, fruit: dict):
+        entry = (fruit['price'], fruit['id'])
+        for key in self._keys(fruit):
+            prices = self._groups[key]
+            pos = bisect_left(prices, entry)
+            if pos < len(prices) and prices[pos] == entry:
+                del prices[pos]
+                self._sums[key] -= fruit['price']
+            if not prices:
+                del self._groups[key]
+                del self._sums[key]
+
+    def rebuild(self, fruits: List[dict]):
+        self._groups.clear()
+        self._sums.clear()
+        self._names.clear()
+        for fruit in fruits:
+            self._add(fruit)
+
+    def update(self, old: Optional[dict], new: dict):
+        if old is not None:
+            self._remove(old)
+        self._add(new)
+
+    def _fruit_ref(self, entry: Tuple[int, str]) -> dict:
+        price, fruit_id = entry
+        return {"id": fruit_id, "name": self._names.get(fruit_id, ""), "price": price}
+
+    def _group_stats(self, key: Tuple) -> dict:
+        prices = self._groups[key]
+        count = len(prices)
+        return {
+            "count": count,
+            "sum": self._sums[key],
+            "mean": self._sums[key] / count,
+            "min": prices[0][0],
+            "max": prices[-1][0],
+            "percentiles": {f"p{p}": _percentile(prices, p) for p in PERCENTILES},
+            "cheapest": self._fruit_ref(prices[0]),
+            "most_expensive": self._fruit_ref(prices[-1]),
+        }
+
+    def summary(self) -> dict:
+        result = {"overall": self._group_stats(("overall",)) if ("overall",) in self._groups else None}
+        for group in GROUP_FIELDS:
+            result[group] = {
+                key[1]: self._group_stats(key)
+                for key in sorted((k for k in self._groups if k[0] == group), key=lambda k: str(k[1]))
+            }
+        return result
@@ -0,0 +1,194 @@
+"""
+Métricas da API em formato texto do Prometheus, coletadas no próprio processo
+MetricsMiddleware mede cada request por template de rota (/api/fruits/{fruit_id},
+não o id concreto, para não explodir a cardinalidade) e MongoCommandMetrics mede
+cada comando do MongoDB por coleção e operação. Registrar uma observação é só um
+bisect e alguns incrementos, então a coleta pode ficar ligada em produção.
+"""
+import threading
+import time
+from bisect import bisect_left
+from collections import defaultdict
+from typing import Callable, Dict, List, Sequence, Tuple
+
+from pymongo import monitoring
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+SIZE_BUCKETS = (128, 512, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _labels(names: Sequence[str], values: Tuple, extra: str = "") -> str:
+    pairs = [f'{name}="{str(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Counter:
+    def __init__(self, name: str, help: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self._values: Dict[Tuple, float] = defaultdict(float)
+        self._lock = threading.Lock()
+
+    def inc(self, *labels, amount: float = 1):
+        with self._lock:
+            self._values[labels] += amount
+
+    def value(self, *labels) -> float:
+        return self._values.get(labels, 0)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for labels, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_labels(self.labels, labels)} {value:g}")
+        return lines
+
+
+class Histogram:
+    def __init__(self, name: str, help: str, labels: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self.buckets = tuple(buckets)
+        # Por conjunto de labels: [contagem por balde (não cumulativa) + +Inf, soma]
+        self._series: Dict[Tuple, list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labels):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][index] += 1
+            series[1] += value
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for labels, (counts, total) in sorted(self._series.items()):
+                cumulative = 0
+                for bound, count in zip(self.buckets, counts):
+                    cumulative += count
+                    le = f'le="{bound:g}"'
+                    lines.append(f"{self.name}_bucket{_labels(self.labels, labels, le)} {cumulative}")
+                cumulative += counts[-1]
+                le = 'le="+Inf"'
+                lines.append(f"{self.name}_bucket{_labels(self.labels, labels, le)} {cumulative}")
+                lines.append(f"{self.name}_sum{_labels(self.labels, labels)} {total:g}")
+                lines.append(f"{self.name}_count{_labels(self.labels, labels)} {cumulative}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._metrics = []
+        self._collectors: List[Callable[[], List[str]]] = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def collector(self, collect: Callable[[], List[str]]):
+        """Linhas calculadas na hora do scrape (gauges de outros componentes)."""
+        self._collectors.append(collect)
+        return collect
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        for collect in self._collectors:
+            lines.extend(collect())
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+http_requests = registry.register(Counter(
+    "http_requests_total", "Requests HTTP por rota, método e status", ("route", "method", "status")))
+http_errors = registry.register(Counter(
+    "http_request_errors_total", "Requests HTTP com status >= 500 ou exceção", ("route", "method")))
+http_latency = registry.register(Histogram(
+    "http_request_duration_seconds", "Latência dos requests HTTP", ("route", "method")))
+http_response_size = registry.register(Histogram(
+    "http_response_size_bytes", "Tamanho do corpo das respostas", ("route", "method"), SIZE_BUCKETS))
+mongo_latency = registry.register(Histogram(
+    "mongo_command_duration_seconds", "Latência dos comandos do MongoDB", ("collection", "operation")))
+mongo_errors = registry.register(Counter(
+    "mongo_command_errors_total", "Comandos do MongoDB que falharam", ("collection", "operation")))
+
+
+class MetricsMiddleware:
+    """Middleware ASGI: latência, status e bytes enviados por template de rota."""
+
+    def __init__(self, app, exclude: Sequence[str] = ("/metrics",)):
+        self.app = app
+        self.exclude = set(exclude)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] in self.exclude:
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status = 500
+        size = 0
+
+        async def send_wrapper(message):
+            nonlocal status, size
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            # O roteador grava a rota encontrada no próprio scope
+            route = scope.get("route")
+            template = route.path if route is not None else "<unmatched>"
+            method = scope["method"]
+            http_requests.inc(template, method, str(status))
+            if status >= 500:
+                http_errors.inc(template, method)
+            http_latency.observe(time.perf_counter() - start, template, method)
+            http_response_size.observe(size, template, method)
+
+
+class MongoCommandMetrics(monitoring.CommandListener):
+    """Latência por coleção/operação; o pymongo já informa a duração de cada comando."""
+
+    def __init__(self):
+        self._collections: Dict[int, Tuple[str, str]] = {}
+        self._lock = threading.Lock()
+
+    def started(self, event):
+        target = event.command.get(event.command_name)
+        if event.command_name == "getMore":
+            target = event.command.get("collection")
+        collection = target if isinstance(target, str) else event.database_name
+        with self._lock:
+            self._collections[event.request_id] = (collection, event.command_name)
+
+    def _finish(self, event) -> Tuple[str, str]:
+        with self._lock:
+            return self._collections.pop(event.request_id, (event.database_name, event.command_name))
+
+    def succeeded(self, event):
+        collection, operation = self._finish(event)
+        mongo_latency.observe(event.duration_micros / 1e6, collection, operation)
+
+    def failed(self, event):
+        collection, operation = self._finish(event)
+        mongo_latency.observe(event.duration_micros / 1e6, collection, operation)
+        mongo_errors.inc(collection, operation)
+
+
+mongo_metrics = MongoCommandMetrics()
@@ -0,0 +1,58 @@
+"""
+Paginação por keyset (cursor) para as listagens de frutas
+O cursor é opaco para o cliente: guarda a ordenação e a chave da última fruta
+da página, e a próxima página é buscada a partir dessa chave com sort + limit no
+MongoDB, sem skip e sem perder/repetir frutas quando há empates de preço ou nome.
+"""
+import base64
+import json
+from typing import List, Optional, Tuple
+
+from fastapi import HTTPException
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+# Campos de ordenação de cada sort_by; o id sempre desempata (no mesmo sentido,
+# para que o MongoDB percorra os índices price_id/name_id em qualquer direção)
+SORTS = {
+    None: [("id", 1)],
+    "price_asc": [("price", 1), ("id", 1)],
+    "price_desc": [("price", -1), ("id", -1)],
+    "name": [("name", 1), ("id", 1)],
+}
+
+
+def sort_spec(sort_by: Optional[str]) -> List[Tuple[str, int]]:
+    if sort_by not in SORTS:
+        raise HTTPException(status_code=400, detail=f"sort_by inválido: {sort_by}")
+    return SORTS[sort_by]
+
+
+def encode_cursor(sort_by: Optional[str], fruit: dict) -> str:
+    values = [fruit.get(field) for field, _ in sort_spec(sort_by)]
+    payload = json.dumps({"s": sort_by, "v": values}, ensure_ascii=False, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(sort_by: Optional[str], cursor: str) -> list:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        values = payload["v"]
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(status_code=400, detail="Cursor inválido")
+    if payload.get("s") != sort_by or len(values) != len(sort_spec(sort_by)):
+        raise HTTPException(status_code=400, detail="Cursor não corresponde ao sort_by")
+    return values
+
+
+def keyset_filter(sort_by: Optional[str], values: list) -> dict:
+    """Filtro MongoDB para as frutas que vêm depois da chave `values` na ordenação."""
+    spec = sort_spec(sort_by)
+    clauses = []
+    for i, (field, direction) in enumerate(spec):
+        clause = {f: v for (f, _), v in zip(spec[:i], values[:i])}
+        clause[field] = {"$gt" if direction == 1 else "$lt": values[i]}
+        clauses.append(clause)
+    return {"$or": clauses}
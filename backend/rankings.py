@@ -0,0 +1,64 @@
+"""
+Índices de ranking mantidos junto com o snapshot do catálogo
+Cada dimensão guarda as frutas já ordenadas; as escritas reposicionam só a fruta
+alterada, então uma página do ranking custa O(limit) e não precisa varrer o banco.
+"""
+from bisect import bisect_left
+from typing import Callable, Dict, List, Optional, Tuple
+
+RARITY_ORDER = {"Única": 5, "Mítica": 4, "Muito Rara": 3, "Rara": 2, "Comum": 1}
+
+# Chave de cada ranking (maior primeiro)
+RANKING_KEYS: Dict[str, Callable[[dict], Tuple]] = {
+    "expensive": lambda f: (f['price'],),
+    "destructive": lambda f: (f.get('destructive_power', 0),),
+    "rare": lambda f: (RARITY_ORDER.get(f.get('rarity', 'Comum'), 0), f['price']),
+    "defense": lambda f: (f.get('defense_rating', 0),),
+    "speed": lambda f: (f.get('speed_rating', 0),),
+}
+
+
+class RankingIndex:
+    def __init__(self, key: Callable[[dict], Tuple]):
+        self._key = key
+        self._keys: List[Tuple] = []
+        self._fruits: List[dict] = []
+
+    def _sort_key(self, fruit: dict) -> Tuple:
+        # Valores negados para manter a lista crescente; o id desempata de forma estável
+        return tuple(-value for value in self._key(fruit)) + (fruit['id'],)
+
+    def rebuild(self, fruits: List[dict]):
+        entries = sorted(((self._sort_key(f), f) for f in fruits), key=lambda e: e[0])
+        self._keys = [key for key, _ in entries]
+        self._fruits = [fruit for _, fruit in entries]
+
+    def update(self, old: Optional[dict], new: dict):
+        if old is not None:
+            pos = bisect_left(self._keys, self._sort_key(old))
+            if pos < len(self._keys) and self._fruits[pos]['id'] == old['id']:
+                del self._keys[pos]
+                del self._fruits[pos]
+        key = self._sort_key(new)
+        pos = bisect_left(self._keys, key)
+        self._keys.insert(pos, key)
+        self._fruits.insert(pos, new)
+
+    def top(self, limit: int = 10, offset: int = 0) -> List[dict]:
+        return self._fruits[offset:offset + limit]
+
+
+class Rankings:
+    def __init__(self):
+        self._indexes = {name: RankingIndex(key) for name, key in RANKING_KEYS.items()}
+
+    def rebuild(self, fruits: List[dict]):
+        for index in self._indexes.values():
+            index.rebuild(fruits)
+
+    def update(self, old: Optional[dict], new: dict):
+        for index in self._indexes.values():
+            index.update(old, new)
+
+    def top(self, name: str, limit: int = 10, offset: int = 0) -> List[dict]:
+        return self._indexes[name].top(limit, offset)
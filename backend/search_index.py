@@ -0,0 +1,146 @@
+"""
+Índice invertido para a busca textual de POST /api/search
+Indexa keywords, power e description com normalização de acentos
+("incêndio" == "incendio"), expande termos por prefixo e ordena por BM25.
+O índice é mantido junto com o snapshot do catálogo (rebuild/update).
+"""
+import math
+import re
+import unicodedata
+from bisect import bisect_left, insort
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+
+# Peso de cada campo na frequência do termo (BM25F simplificado)
+FIELD_WEIGHTS = {"keywords": 3.0, "power": 2.0, "description": 1.0}
+
+STOPWORDS = {
+    "a", "o", "as", "os", "e", "de", "da", "do", "das", "dos", "em", "no", "na",
+    "nos", "nas", "um", "uma", "uns", "umas", "que", "com", "por", "para", "ao",
+    "aos", "se", "ou", "mais", "muito", "como", "sua", "seu", "me", "eu",
+}
+
+# Tamanho mínimo para um termo comum também casar por prefixo ("cham" -> "chamas")
+MIN_PREFIX = 3
+# Peso de um termo casado só por prefixo em relação ao termo exato
+PREFIX_WEIGHT = 0.5
+
+_TOKEN_RE = re.compile(r"\w+")
+_QUERY_TOKEN_RE = re.compile(r"\w+\*?")
+
+
+def fold(text: str) -> str:
+    """Remove acentos e converte para minúsculas."""
+    decomposed = unicodedata.normalize("NFKD", text)
+    return "".join(c for c in decomposed if not unicodedata.combining(c)).lower()
+
+
+def tokenize(text: str) -> List[str]:
+    return [t for t in _TOKEN_RE.findall(fold(text)) if t not in STOPWORDS]
+
+
+class SearchIndex:
+    def __init__(self, k1: float = 1.2, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self._reset()
+
+    def _reset(self):
+        self._postings: Dict[str, Dict[str, float]] = {}
+        self._terms: List[str] = []
+        self._doc_terms: Dict[str, Dict[str, float]] = {}
+        self._doc_len: Dict[str, float] = {}
+        self._total_len = 0.0
+        self._docs: Dict[str, dict] = {}
+
+    def _analyze(self, fruit: dict) -> Dict[str, float]:
+        tf: Dict[str, float] = defaultdict(float)
+        for field, weight in FIELD_WEIGHTS.items():
+            value = fruit.get(field) or ""
+            for text in (value if isinstance(value, list) else [value]):
+                for token in tokenize(text):
+                    tf[token] += weight
+        return tf
+
+    def _add(self, fruit: dict, keep_sorted: bool):
+        fruit_id = fruit['id']
+        tf = self._analyze(fruit)
+        for term, freq in tf.items():
+            postings = self._postings.get(term)
+            if postings is None:
+                postings = self._postings[term] = {}
+                if keep_sorted:
+                    insort(self._terms, term)
+            postings[fruit_id] = freq
+        self._doc_terms[fruit_id] = tf
+        self._doc_len[fruit_id] = sum(tf.values())
+        self._total_len += self._doc_len[fruit_id]
+        self._docs[fruit_id] = fruit
+
+    def _remove(self, fruit_id: str):
+        tf = self._doc_terms.pop(fruit_id, None)
+        if tf is None:
+            return
+        for term in tf:
+            postings = self._postings[term]
+            postings.pop(fruit_id, None)
+            if not postings:
+                del self._postings[term]
+                del self._terms[bisect_left(self._terms, term)]
+        self._total_len -= self._doc_len.pop(fruit_id)
+        self._docs.pop(fruit_id, None)
+
+    def rebuild(self, fruits: List[dict]):
+        self._reset()
+        for fruit in fruits:
+            self._add(fruit, keep_sorted=False)
+        self._terms = sorted(self._postings)
+
+    def update(self, old: Optional[dict], new: dict):
+        if old is not None:
+            self._remove(old['id'])
+        self._add(new, keep_sorted=True)
+
+    def _expand(self, token: str) -> List[Tuple[str, float]]:
+        """Termos do vocabulário que casam com o token da consulta, com seus pesos.
+
+        "fogo*" casa qualquer termo que comece com "fogo" com peso cheio; tokens
+        comuns casam o termo exato e, a partir de MIN_PREFIX letras, também os
+        termos que começam com eles (com peso reduzido).
+        """
+        explicit = token.endswith("*")
+        prefix = token.rstrip("*")
+        if not prefix or (not explicit and prefix in STOPWORDS):
+            return []
+
+        matches = []
+        if prefix in self._postings:
+            matches.append((prefix, 1.0))
+        if explicit or len(prefix) >= MIN_PREFIX:
+            weight = 1.0 if explicit else PREFIX_WEIGHT
+            pos = bisect_left(self._terms, prefix)
+            while pos < len(self._terms) and self._terms[pos].startswith(prefix):
+                if self._terms[pos] != prefix:
+                    matches.append((self._terms[pos], weight))
+                pos += 1
+        return matches
+
+    def search(self, text: str) -> List[Tuple[dict, float]]:
+        """Retorna (fruta, score) das frutas que casam com pelo menos um termo."""
+        total_docs = len(self._doc_len)
+        if not total_docs:
+            return []
+        avg_len = self._total_len / total_docs or 1.0
+
+        scores: Dict[str, float] = defaultdict(float)
+        for token in _QUERY_TOKEN_RE.findall(fold(text)):
+            for term, weight in self._expand(token):
+                postings = self._postings[term]
+                idf = math.log(1 + (total_docs - len(postings) + 0.5) / (len(postings) + 0.5))
+                for fruit_id, freq in postings.items():
+                    norm = freq + self.k1 * (1 - self.b + self.b * self._doc_len[fruit_id] / avg_len)
+                    scores[fruit_id] += weight * idf * freq * (self.k1 + 1) / norm
+
+        results = [(self._docs[fruit_id], score) for fruit_id, score in scores.items()]
+        results.sort(key=lambda r: r[1], reverse=True)
+        return results
@@ -0,0 +1,51 @@
+"""
+Carga inicial (seed) das Akuma no Mi a partir de seed/devil_fruits.jsonl
+Cada linha do arquivo é uma fruta. A sincronização é idempotente: frutas ausentes
+são inseridas (upsert por id), frutas iguais ao seed são puladas comparando checksums
+e frutas que divergem do seed só são sobrescritas quando pedido explicitamente.
+"""
+import hashlib
+from pathlib import Path
+from typing import Dict, List
+
+import orjson
+
+from storage import FruitRepository, Update
+
+SEED_FILE = Path(__file__).parent / 'seed' / 'devil_fruits.jsonl'
+
+
+def read_seed(path: Path = SEED_FILE) -> List[dict]:
+    with open(path, 'rb') as f:
+        return [orjson.loads(line) for line in f if line.strip()]
+
+
+def checksum(fruit: dict, fields) -> str:
+    data = orjson.dumps({field: fruit.get(field) for field in fields}, option=orjson.OPT_SORT_KEYS)
+    return hashlib.sha256(data).hexdigest()
+
+
+async def sync_seed(repository: FruitRepository, seeds: List[dict], overwrite: bool = False,
+                    dry_run: bool = False) -> Dict[str, int]:
+    """Aplica o seed com uma única escrita em lote e devolve quantas frutas caíram em cada caso.
+    Com dry_run nada é gravado, só o relatório é calculado."""
+    existing = {doc['id']: doc for doc in await repository.find_many({"id": {"$in": [s['id'] for s in seeds]}})}
+
+    report = {"inserted": 0, "updated": 0, "unchanged": 0, "diverged": 0}
+    writes = []
+    for seed in seeds:
+        current = existing.get(seed['id'])
+        if current is None:
+            writes.append(Update({"id": seed['id']}, {"$setOnInsert": {**seed, "version": 0}}, upsert=True))
+            report["inserted"] += 1
+        elif checksum(current, seed.keys()) == checksum(seed, seed.keys()):
+            report["unchanged"] += 1
+        elif overwrite:
+            writes.append(Update({"id": seed['id']}, {"$set": seed, "$inc": {"version": 1}}))
+            report["updated"] += 1
+        else:
+            report["diverged"] += 1
+
+    if writes and not dry_run:
+        await repository.bulk_update(writes)
+    return report
@@ -0,0 +1,114 @@
+"""
+Serialização rápida das respostas do catálogo
+As frutas do snapshot já foram validadas na carga/escrita, então as listagens não
+passam de novo pelo response_model: cada fruta é codificada uma vez (orjson) e as
+listas são montadas juntando esses bytes. Listas já montadas ficam em cache até a
+próxima escrita no catálogo; com o cache cheio sai a lista usada há mais tempo (LRU),
+então chaves que só aparecem uma vez (buscas, autocomplete) não expulsam as listagens quentes.
+
+O cache também mantém um digest do conteúdo do catálogo (XOR dos hashes de cada
+fruta, atualizado a cada escrita), usado como ETag forte pelas listagens: workers
+com o mesmo conteúdo geram o mesmo ETag e um If-None-Match igual vira 304.
+"""
+import hashlib
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, List, Optional
+
+import orjson
+from fastapi import Request
+from fastapi.responses import Response
+
+CACHE_CONTROL = "no-cache"
+
+
+def json_response(content: bytes, headers: Optional[Dict[str, str]] = None) -> Response:
+    return Response(content=content, media_type="application/json", headers=headers)
+
+
+def _digest(data: bytes) -> int:
+    return int.from_bytes(hashlib.blake2b(data, digest_size=16).digest(), "big")
+
+
+def make_etag(*parts: str) -> str:
+    return '"' + hashlib.blake2b("|".join(parts).encode(), digest_size=16).hexdigest() + '"'
+
+
+def fruit_etag(fruit: dict, digest: Optional[int] = None) -> str:
+    # "<versão>.<digest>": a versão do documento é o que o If-Match compara nas escritas
+    if digest is None:
+        digest = _digest(orjson.dumps(fruit))
+    return f'"{fruit.get("version", 0)}.{digest:032x}"'
+
+
+def is_not_modified(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    # If-None-Match usa comparação fraca: W/"x" casa com "x"
+    tags = [tag.strip().removeprefix("W/") for tag in header.split(",")]
+    return etag in tags
+
+
+def conditional_response(request: Request, etag: str, build: Callable[[], bytes]) -> Response:
+    headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+    if is_not_modified(request, etag):
+        return Response(status_code=304, headers=headers)
+    return json_response(build(), headers)
+
+
+def encode_fruits(fruits: List[dict], fields: Optional[List[str]] = None) -> bytes:
+    if fields:
+        fruits = [{f: fruit[f] for f in fields if f in fruit} for fruit in fruits]
+    return orjson.dumps(fruits)
+
+
+class FruitJSONCache:
+    def __init__(self, max_lists: int = 512):
+        self.max_lists = max_lists
+        self._fruits: Dict[str, bytes] = {}
+        self._digests: Dict[str, int] = {}
+        self._catalog_digest = 0
+        self._lists: "OrderedDict[Hashable, bytes]" = OrderedDict()
+
+    def rebuild(self, fruits: List[dict]):
+        self._fruits = {fruit['id']: orjson.dumps(fruit) for fruit in fruits}
+        self._digests = {fruit_id: _digest(data) for fruit_id, data in self._fruits.items()}
+        self._catalog_digest = 0
+        for digest in self._digests.values():
+            self._catalog_digest ^= digest
+        self._lists.clear()
+
+    def update(self, old: Optional[dict], new: dict):
+        data = self._fruits[new['id']] = orjson.dumps(new)
+        digest = _digest(data)
+        self._catalog_digest ^= self._digests.get(new['id'], 0) ^ digest
+        self._digests[new['id']] = digest
+        self._lists.clear()
+
+    def catalog_tag(self) -> str:
+        return f"{self._catalog_digest:032x}"
+
+    def fruit_etag(self, fruit: dict) -> str:
+        return fruit_etag(fruit, self._digests.get(fruit['id']))
+
+    def fruit(self, fruit: dict) -> bytes:
+        data = self._fruits.get(fruit['id'])
+        return data if data is not None else orjson.dumps(fruit)
+
+    def encode_list(self, fruits: List[dict], fields: Optional[List[str]] = None) -> bytes:
+        """Codifica frutas do snapshot reaproveitando os bytes já prontos de cada uma."""
+        if fields:
+            return encode_fruits(fruits, fields)
+        return b"[" + b",".join(self.fruit(fruit) for fruit in fruits) + b"]"
+
+    def cached_list(self, key: Hashable, build: Callable[[], bytes]) -> bytes:
+        data = self._lists.get(key)
+        if data is not None:
+            self._lists.move_to_end(key)
+            return data
+        if len(self._lists) >= self.max_lists:
+            self._lists.popitem(last=False)
+        data = self._lists[key] = build()
+        return data
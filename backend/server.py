@@ -1,24 +1,90 @@
-from fastapi import FastAPI, APIRouter, Query, HTTPException
+from fastapi import FastAPI, APIRouter, Query, HTTPException, Request, Response
+from fastapi.responses import PlainTextResponse, StreamingResponse
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
-from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo.errors import BulkWriteError
 import os
 import logging
 from pathlib import Path
-from pydantic import BaseModel, Field, ConfigDict
+from pydantic import BaseModel, Field, ConfigDict, ValidationError
 from typing import List, Optional
 import uuid
 from datetime import datetime, timezone
+from functools import lru_cache
+from contextlib import asynccontextmanager
 import json
+import orjson
+
+from catalog import CatalogSnapshot
+from export import csv_chunks, gzipped, ndjson_chunks
+from facets import FacetIndex
+from features import FeatureMatrix
+from database import pool_monitor, pool_options
+from market_stats import MarketStats
+from metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE, MetricsMiddleware, mongo_metrics, registry
+from pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, SORTS, decode_cursor, encode_cursor, keyset_filter, sort_spec
+from rankings import Rankings
+from search_index import SearchIndex
+from seed import SEED_FILE, read_seed, sync_seed
+from storage import Update, create_repository
+from suggest import TOP_PER_NODE as MAX_SUGGESTIONS, SuggestIndex
+from singleflight import SingleFlight, query_key
+from serialization import FruitJSONCache, conditional_response, encode_fruits, fruit_etag, json_response, make_etag
 
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
 
-mongo_url = os.environ['MONGO_URL']
-client = AsyncIOMotorClient(mongo_url)
-db = client[os.environ['DB_NAME']]
+# Criado no lifespan da aplicação (STORAGE_BACKEND, ver storage.py)
+repository = None
+
+async def load_catalog():
+    fruits = []
+    async for doc in repository.find({}):
+        if not doc.get('id'):
+            # Sem id o DevilFruit inventaria um uuid novo a cada recarga, que nunca
+            # acharia a fruta no banco: melhor deixá-la fora do snapshot
+            logger.warning("Documento %s sem id ignorado no snapshot", doc.get('_id'))
+            continue
+        try:
+            fruits.append(validated_fruit(doc))
+        except ValidationError as e:
+            logger.warning("Fruta %s ignorada no snapshot: %s", doc.get('id'), e)
+    return fruits
+
+# Snapshot do catálogo usado pelos endpoints de leitura (TTL em segundos). Com 0 não há
+# cache: /api/fruits e a busca sem texto vão ao MongoDB, e os demais endpoints recarregam
+# a coleção e reconstroem só os índices que usam a cada request
+catalog = CatalogSnapshot(load_catalog, ttl=float(os.environ.get('CATALOG_CACHE_TTL', '300')))
+rankings = catalog.register(Rankings())
+search_index = catalog.register(SearchIndex())
+fruit_json = catalog.register(FruitJSONCache())
+market_stats = catalog.register(MarketStats())
+features = catalog.register(FeatureMatrix())
+suggestions = catalog.register(SuggestIndex())
+facets = catalog.register(FacetIndex())
 
-app = FastAPI()
+# Leituras idênticas e simultâneas que vão direto ao banco (paginação, catálogo desativado)
+fruit_reads = SingleFlight("fruit_reads")
+
+async def shared_find(query: dict, fields: Optional[List[str]], sort, limit: int = 0) -> List[dict]:
+    key = query_key(query, fields, sort, limit)
+    return await fruit_reads.do(key, lambda: repository.find_many(query, fields, sort, limit))
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    global repository
+    repository = create_repository(listeners=[mongo_metrics])
+    # Só começa a aceitar requests com o banco alcançável, os índices criados
+    # e o snapshot carregado, para o primeiro request não pagar esse custo
+    await repository.connect()
+    await repository.ensure_indexes()
+    await catalog.get()
+    try:
+        yield
+    finally:
+        await repository.close()
+
+app = FastAPI(lifespan=lifespan)
 api_router = APIRouter(prefix="/api")
 
 class DevilFruit(BaseModel):
@@ -45,6 +111,63 @@ class DevilFruit(BaseModel):
     speed_rating: int = 0
     image_url: str = ""
     fighting_styles: List[str] = Field(default_factory=list)
+    version: int = 0
+
+class FruitSummary(BaseModel):
+    """Formato compacto usado nas listagens (fields=summary)."""
+    model_config = ConfigDict(extra="ignore")
+    
+    id: str
+    name: str
+    japanese_name: str
+    type: str
+    rarity: str
+    power: str
+    current_user: Optional[str] = None
+    price: int
+    available: bool
+    destructive_power: int = 0
+    defense_rating: int = 0
+    speed_rating: int = 0
+    image_url: str = ""
+
+SUMMARY_FIELDS = list(FruitSummary.model_fields)
+
+def validated_fruit(doc: dict) -> dict:
+    # Frutas entram no snapshot já no formato de DevilFruit, então as listagens
+    # podem ser serializadas sem passar de novo pelo response_model
+    return DevilFruit.model_validate(doc).model_dump()
+
+def validated_changes(updates: dict) -> dict:
+    # Valida só os campos enviados, sem precisar ler a fruta atual do banco. Campos
+    # que não são de DevilFruit são descartados, como o modelo faz (extra="ignore"):
+    # não chegam ao $set, onde chaves com "." ou "$" viram erro do MongoDB
+    fields = {field: value for field, value in updates.items() if field in DevilFruit.model_fields}
+    fruit = DevilFruit.model_construct()
+    errors = []
+    for field, value in fields.items():
+        try:
+            DevilFruit.__pydantic_validator__.validate_assignment(fruit, field, value)
+        except ValidationError as e:
+            errors.extend(e.errors(include_url=False, include_context=False))
+    if errors:
+        raise HTTPException(status_code=422, detail=errors)
+    return {field: getattr(fruit, field) for field in fields}
+
+MAX_BATCH_SIZE = 100
+
+class BatchRequest(BaseModel):
+    ids: List[str]
+
+class BatchResponse(BaseModel):
+    fruits: List[DevilFruit]
+    missing: List[str]
+
+MAX_BULK_SIZE = 500
+
+class FruitChange(BaseModel):
+    id: str
+    changes: dict
 
 class SearchRequest(BaseModel):
     budget: Optional[int] = None
@@ -53,735 +176,544 @@ class SearchRequest(BaseModel):
     rarity: Optional[str] = None
     fighting_style: Optional[str] = None
 
+def parse_fields(fields: Optional[str]) -> Optional[List[str]]:
+    # fields=summary ou uma lista separada por vírgulas; o id sempre é incluído
+    if not fields:
+        return None
+    if fields == "summary":
+        return SUMMARY_FIELDS
+    requested = [f.strip() for f in fields.split(',') if f.strip()]
+    unknown = [f for f in requested if f not in DevilFruit.model_fields]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Campos desconhecidos: {', '.join(unknown)}")
+    return ['id'] + [f for f in requested if f != 'id']
+
+def catalog_response(request: Request, key: tuple, build):
+    # ETag forte derivado do conteúdo do catálogo e dos parâmetros da consulta
+    etag = make_etag(fruit_json.catalog_tag(), repr(key))
+    return conditional_response(request, etag, lambda: fruit_json.cached_list(key, build))
+
+async def stream_fruits(cursor):
+    # Array JSON enviado aos poucos, conforme o repositório entrega os documentos
+    yield b"["
+    first = True
+    async for fruit in cursor:
+        yield (b"" if first else b",") + orjson.dumps(fruit)
+        first = False
+    yield b"]"
+
+def fruit_filter(type: Optional[str], rarity: Optional[str], available: Optional[bool]) -> dict:
+    query = {}
+    if type:
+        query['type'] = type
+    if rarity:
+        query['rarity'] = rarity
+    if available is not None:
+        query['available'] = available
+    return query
+
+async def fruit_page(query: dict, sort_by: Optional[str], limit: Optional[int],
+                     cursor: Optional[str], stream: bool, fields: Optional[List[str]]):
+    spec = sort_spec(sort_by)
+    if cursor:
+        after = keyset_filter(sort_by, decode_cursor(sort_by, cursor))
+        query = {"$and": [query, after]} if query else after
+    
+    if stream:
+        docs = repository.find(query, fields, spec, limit or 0)
+        return StreamingResponse(stream_fruits(docs), media_type="application/json")
+    
+    # Busca um item a mais para saber se existe próxima página. O cursor precisa dos
+    # campos da ordenação mesmo quando fields não os pede: saem só da resposta
+    page_size = limit or DEFAULT_PAGE_SIZE
+    projection = fields + [f for f, _ in spec if f not in fields] if fields else None
+    fruits = await shared_find(query, projection, spec, page_size + 1)
+    headers = {}
+    if len(fruits) > page_size:
+        fruits = fruits[:page_size]
+        headers["X-Next-Cursor"] = encode_cursor(sort_by, fruits[-1])
+    return json_response(encode_fruits(fruits, fields), headers)
+
 @api_router.get("/")
 async def root():
     return {"message": "Akuma Finder API"}
 
 @api_router.get("/fruits", response_model=List[DevilFruit])
 async def get_all_fruits(
+    request: Request,
     type: Optional[str] = Query(None),
     rarity: Optional[str] = Query(None),
     available: Optional[bool] = Query(None),
-    sort_by: Optional[str] = Query(None)
+    sort_by: Optional[str] = Query(None),
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None),
+    stream: bool = Query(False),
+    fields: Optional[str] = Query(None)
 ):
-    query = {}
-    if type:
-        query['type'] = type
-    if rarity:
-        query['rarity'] = rarity
-    if available is not None:
-        query['available'] = available
+    fields = parse_fields(fields)
     
-    fruits = await db.devil_fruits.find(query, {"_id": 0}).to_list(1000)
+    # Paginação (limit/cursor) e streaming consultam o MongoDB direto
+    if limit or cursor or stream:
+        return await fruit_page(fruit_filter(type, rarity, available), sort_by, limit, cursor, stream, fields)
     
-    if sort_by == "price_asc":
-        fruits.sort(key=lambda x: x['price'])
-    elif sort_by == "price_desc":
-        fruits.sort(key=lambda x: x['price'], reverse=True)
-    elif sort_by == "name":
-        fruits.sort(key=lambda x: x['name'])
+    if not catalog.enabled:
+        # Sem snapshot, filtro e ordenação ficam com o MongoDB (ver indexes.py)
+        spec = SORTS.get(sort_by, SORTS[None])
+        query = fruit_filter(type, rarity, available)
+        fruits = await shared_find(query, fields, spec)
+        return json_response(encode_fruits(fruits))
     
-    return fruits
+    fruits = await catalog.get()
+    
+    def build():
+        selected = fruits
+        if type:
+            selected = [f for f in selected if f.get('type') == type]
+        if rarity:
+            selected = [f for f in selected if f.get('rarity') == rarity]
+        if available is not None:
+            selected = [f for f in selected if f.get('available') == available]
+        
+        if sort_by == "price_asc":
+            selected = sorted(selected, key=lambda x: x['price'])
+        elif sort_by == "price_desc":
+            selected = sorted(selected, key=lambda x: x['price'], reverse=True)
+        elif sort_by == "name":
+            selected = sorted(selected, key=lambda x: x['name'])
+        return fruit_json.encode_list(selected, fields)
+    
+    key = ("fruits", type, rarity, available, sort_by, tuple(fields or ()))
+    return catalog_response(request, key, build)
+
+async def batch_fruits(ids: List[str]):
+    # Remove repetidos mantendo a ordem pedida
+    ids = list(dict.fromkeys(ids))
+    if len(ids) > MAX_BATCH_SIZE:
+        raise HTTPException(status_code=400, detail=f"Máximo de {MAX_BATCH_SIZE} frutas por lote")
+    
+    if catalog.enabled:
+        await catalog.get()
+        found = catalog.lookup(ids)
+    else:
+        docs = await shared_find({"id": {"$in": sorted(ids)}}, None, None)
+        found = {doc['id']: doc for doc in docs}
+    
+    return json_response(orjson.dumps({
+        "fruits": [found[fruit_id] for fruit_id in ids if fruit_id in found],
+        "missing": [fruit_id for fruit_id in ids if fruit_id not in found],
+    }))
+
+@api_router.get("/fruits/batch", response_model=BatchResponse)
+async def get_fruits_batch(ids: str = Query(..., description="IDs separados por vírgula")):
+    return await batch_fruits([i.strip() for i in ids.split(',') if i.strip()])
+
+@api_router.post("/fruits/batch", response_model=BatchResponse)
+async def post_fruits_batch(batch: BatchRequest):
+    return await batch_fruits(batch.ids)
+
+@api_router.get("/fruits/facets")
+async def get_fruit_facets(
+    request: Request,
+    type: Optional[str] = Query(None),
+    rarity: Optional[str] = Query(None),
+    available: Optional[bool] = Query(None),
+    fighting_style: Optional[str] = Query(None)
+):
+    filters = {"type": type, "rarity": rarity, "fighting_style": fighting_style,
+               "available": None if available is None else str(available).lower()}
+    filters = {facet: value for facet, value in filters.items() if value is not None}
+    await catalog.get(facets, fruit_json)
+    key = ("facets", tuple(sorted(filters.items())))
+    return catalog_response(request, key, lambda: orjson.dumps(facets.counts(filters)))
+
+@api_router.get("/fruits/export")
+async def export_fruits(
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    type: Optional[str] = Query(None),
+    rarity: Optional[str] = Query(None),
+    available: Optional[bool] = Query(None),
+    fields: Optional[str] = Query(None),
+    batch_size: int = Query(500, ge=1, le=10000),
+    gzip: bool = Query(False)
+):
+    # Direto do cursor do banco, em blocos: memória constante qualquer que seja o catálogo
+    fields = parse_fields(fields)
+    docs = repository.find(fruit_filter(type, rarity, available), fields, SORTS[None], batch_size=batch_size)
+    if format == "csv":
+        chunks = csv_chunks(docs, fields or list(DevilFruit.model_fields), batch_size)
+        media_type = "text/csv"
+    else:
+        chunks = ndjson_chunks(docs, batch_size)
+        media_type = "application/x-ndjson"
+    
+    filename = f"devil_fruits.{format}"
+    if gzip:
+        chunks = gzipped(chunks)
+        media_type = "application/gzip"
+        filename += ".gz"
+    return StreamingResponse(chunks, media_type=media_type,
+                             headers={"Content-Disposition": f'attachment; filename="{filename}"'})
 
 @api_router.get("/fruits/{fruit_id}", response_model=DevilFruit)
-async def get_fruit_by_id(fruit_id: str):
-    fruit = await db.devil_fruits.find_one({"id": fruit_id}, {"_id": 0})
+async def get_fruit_by_id(fruit_id: str, request: Request):
+    if catalog.enabled:
+        fruit = await catalog.get_fruit(fruit_id)
+        if not fruit:
+            raise HTTPException(status_code=404, detail="Fruta não encontrada")
+        return conditional_response(request, fruit_json.fruit_etag(fruit), lambda: fruit_json.fruit(fruit))
+    
+    fruit = await repository.find_one({"id": fruit_id})
     if not fruit:
         raise HTTPException(status_code=404, detail="Fruta não encontrada")
     return fruit
 
-@api_router.put("/fruits/{fruit_id}", response_model=DevilFruit)
-async def update_fruit(fruit_id: str, fruit_data: DevilFruit):
-    # Verifica se a fruta existe
-    existing_fruit = await db.devil_fruits.find_one({"id": fruit_id}, {"_id": 0})
-    if not existing_fruit:
+@api_router.get("/fruits/{fruit_id}/similar", response_model=List[DevilFruit])
+async def get_similar_fruits(
+    fruit_id: str,
+    request: Request,
+    k: int = Query(5, ge=1, le=50),
+    fields: Optional[str] = Query(None)
+):
+    fields = parse_fields(fields)
+    await catalog.get(features, fruit_json)
+    if fruit_id not in features:
         raise HTTPException(status_code=404, detail="Fruta não encontrada")
     
-    # Atualiza a fruta com os novos dados
-    fruit_dict = fruit_data.model_dump()
-    fruit_dict["id"] = fruit_id  # Garante que o ID não mude
-    
-    await db.devil_fruits.update_one(
-        {"id": fruit_id},
-        {"$set": fruit_dict}
-    )
+    def build():
+        similar = features.similar(fruit_id, k)
+        return orjson.dumps([
+            {**({f: fruit[f] for f in fields if f in fruit} if fields else fruit), "similarity": round(score, 4)}
+            for fruit, score in similar
+        ])
     
-    # Retorna a fruta atualizada
-    updated_fruit = await db.devil_fruits.find_one({"id": fruit_id}, {"_id": 0})
-    return updated_fruit
+    return catalog_response(request, ("similar", fruit_id, k, tuple(fields or ())), build)
 
-@api_router.patch("/fruits/{fruit_id}")
-async def partial_update_fruit(fruit_id: str, updates: dict):
-    # Verifica se a fruta existe
-    existing_fruit = await db.devil_fruits.find_one({"id": fruit_id}, {"_id": 0})
-    if not existing_fruit:
+def if_match_versions(request: Request) -> Optional[List[int]]:
+    # Versões aceitas pelo If-Match (ETags "<versão>.<digest>"); None = sem condição
+    header = request.headers.get("if-match")
+    if not header or header.strip() == "*":
+        return None
+    versions = []
+    for tag in header.split(","):
+        tag = tag.strip()
+        if tag.startswith("W/"):
+            # If-Match usa comparação forte: uma ETag fraca nunca confere
+            continue
+        try:
+            versions.append(int(tag.strip('"').split(".")[0]))
+        except ValueError:
+            raise HTTPException(status_code=412, detail="If-Match inválido")
+    if not versions:
+        raise HTTPException(status_code=412, detail="If-Match exige ETag forte")
+    return versions
+
+async def apply_fruit_update(fruit_id: str, update: dict, request: Request, response: Response) -> dict:
+    # Uma única ida ao banco: confere a versão, aplica a mudança e devolve a fruta atualizada
+    query = {"id": fruit_id}
+    versions = if_match_versions(request)
+    if versions is not None:
+        query["version"] = {"$in": versions}
+        if 0 in versions:
+            # Documentos antigos ainda não têm o campo version
+            del query["version"]
+            query["$or"] = [{"version": {"$in": versions}}, {"version": {"$exists": False}}]
+    
+    if update:
+        update["$inc"] = {"version": 1}
+        updated_fruit = await repository.find_one_and_update(query, update)
+    else:
+        # PATCH sem mudanças não grava nada: a versão, o ETag e as listas em cache ficam como estão
+        updated_fruit = await repository.find_one(query)
+    if updated_fruit is None:
+        if versions is not None and await repository.count({"id": fruit_id}, limit=1):
+            raise HTTPException(status_code=412, detail="A fruta foi alterada por outra requisição")
         raise HTTPException(status_code=404, detail="Fruta não encontrada")
     
+    fruit = validated_fruit(updated_fruit)
+    if update:
+        catalog.upsert(fruit)
+    response.headers["ETag"] = fruit_etag(fruit)
+    return fruit
+
+@api_router.put("/fruits/{fruit_id}", response_model=DevilFruit)
+async def update_fruit(fruit_id: str, fruit_data: DevilFruit, request: Request, response: Response):
+    # Atualiza a fruta com os novos dados
+    fruit_dict = fruit_data.model_dump(exclude={"version"})
+    fruit_dict["id"] = fruit_id  # Garante que o ID não mude
+    return await apply_fruit_update(fruit_id, {"$set": fruit_dict}, request, response)
+
+@api_router.patch("/fruits/{fruit_id}")
+async def partial_update_fruit(fruit_id: str, updates: dict, request: Request, response: Response):
     # Remove campos que não devem ser atualizados diretamente
     updates.pop("id", None)
     updates.pop("_id", None)
+    updates.pop("version", None)
     
     # Atualiza apenas os campos fornecidos
-    await db.devil_fruits.update_one(
-        {"id": fruit_id},
-        {"$set": updates}
-    )
+    changes = validated_changes(updates)
+    return await apply_fruit_update(fruit_id, {"$set": changes} if changes else {}, request, response)
+
+@api_router.patch("/fruits")
+async def bulk_update_fruits(operations: List[FruitChange]):
+    if len(operations) > MAX_BULK_SIZE:
+        raise HTTPException(status_code=400, detail=f"Máximo de {MAX_BULK_SIZE} operações por lote")
+    
+    ids = [op.id for op in operations]
+    existing = {doc['id']: doc for doc in await repository.find_many({"id": {"$in": ids}})}
     
-    # Retorna a fruta atualizada
-    updated_fruit = await db.devil_fruits.find_one({"id": fruit_id}, {"_id": 0})
-    return updated_fruit
+    # Valida cada operação; só as válidas e que mudam algo vão para o bulk_write
+    results = []
+    writes = []
+    write_results = []
+    seen = set()
+    for op in operations:
+        fruit = existing.get(op.id)
+        if op.id in seen:
+            results.append({"id": op.id, "status": "duplicate"})
+            continue
+        seen.add(op.id)
+        
+        if fruit is None:
+            results.append({"id": op.id, "status": "not_found"})
+            continue
+        # Só campos de DevilFruit, já convertidos ("123" vira 123), vão para o banco:
+        # é o mesmo valor que o snapshot guarda e o que o MongoDB ordena
+        try:
+            changes = validated_changes({k: v for k, v in op.changes.items() if k not in ("id", "version")})
+        except HTTPException as e:
+            results.append({"id": op.id, "status": "invalid", "detail": e.detail})
+            continue
+        if all(fruit.get(k) == v for k, v in changes.items()):
+            results.append({"id": op.id, "status": "unchanged"})
+        else:
+            write_results.append(len(results))
+            results.append({"id": op.id, "status": "updated"})
+            writes.append(Update({"id": op.id}, {"$set": changes, "$inc": {"version": 1}}))
+    
+    if writes:
+        try:
+            await repository.bulk_update(writes)
+        except BulkWriteError as e:
+            for error in e.details.get("writeErrors", []):
+                result = results[write_results[error["index"]]]
+                result["status"] = "error"
+                result["detail"] = error.get("errmsg")
+        
+        # Uma única atualização do snapshot (e da versão do catálogo) para o lote todo
+        updated_ids = [results[i]['id'] for i in write_results if results[i]['status'] == "updated"]
+        updated = await repository.find_many({"id": {"$in": updated_ids}})
+        catalog.upsert_many([validated_fruit(doc) for doc in updated])
+    
+    return {
+        "updated": sum(1 for r in results if r['status'] == "updated"),
+        "results": results,
+    }
 
 @api_router.post("/search", response_model=List[DevilFruit])
 async def search_fruits(search: SearchRequest):
-    query = {}
+    if not catalog.enabled and not search.description:
+        # Sem snapshot e sem texto, a busca inteira é resolvida pelo MongoDB
+        query = fruit_filter(search.fruit_type, search.rarity, None)
+        if search.fighting_style:
+            query['fighting_styles'] = search.fighting_style
+        if search.budget:
+            query['price'] = {"$lte": search.budget}
+        fruits = await repository.find_many(query, sort=[("available", -1)])
+        return json_response(encode_fruits(fruits))
+    
+    fruits = await catalog.get(search_index, fruit_json)
+    return json_response(fruit_json.cached_list(("search", search.model_dump_json()), lambda: rank_search(search, fruits)))
+
+@api_router.get("/suggest")
+async def suggest(
+    request: Request,
+    q: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(8, ge=1, le=MAX_SUGGESTIONS)
+):
+    await catalog.get(suggestions, fruit_json)
+    return catalog_response(request, ("suggest", q, limit), lambda: orjson.dumps(suggestions.suggest(q, limit)))
+
+def rank_search(search: SearchRequest, fruits: List[dict]) -> bytes:
+    scores = {}
+    
+    if search.description:
+        matches = search_index.search(search.description)
+        scores = {fruit['id']: score for fruit, score in matches}
+        fruits = [fruit for fruit, _ in matches]
     
     if search.fruit_type:
-        query['type'] = search.fruit_type
+        fruits = [f for f in fruits if f.get('type') == search.fruit_type]
     
     if search.rarity:
-        query['rarity'] = search.rarity
+        fruits = [f for f in fruits if f.get('rarity') == search.rarity]
     
     if search.fighting_style:
-        query['fighting_styles'] = {"$in": [search.fighting_style]}
-    
-    fruits = await db.devil_fruits.find(query, {"_id": 0}).to_list(1000)
-    
-    if search.description:
-        desc_lower = search.description.lower()
-        filtered = []
-        for fruit in fruits:
-            keywords_match = any(kw.lower() in desc_lower for kw in fruit.get('keywords', []))
-            power_match = desc_lower in fruit.get('power', '').lower()
-            desc_match = desc_lower in fruit.get('description', '').lower()
-            
-            if keywords_match or power_match or desc_match:
-                filtered.append(fruit)
-        fruits = filtered
+        fruits = [f for f in fruits if search.fighting_style in f.get('fighting_styles', [])]
     
     if search.budget:
         fruits = [f for f in fruits if f['price'] <= search.budget]
     
-    fruits.sort(key=lambda x: (
+    # Disponíveis primeiro, depois pela relevância (BM25) da descrição
+    fruits = sorted(fruits, key=lambda x: (
         1 if x.get('available', False) else 0,
-        -sum(k.lower() in search.description.lower() for k in x.get('keywords', [])) if search.description else 0
+        scores.get(x['id'], 0)
     ), reverse=True)
-    
-    return fruits
+    return fruit_json.encode_list(fruits)
+
+async def ranking_response(request: Request, name: str, limit: int, offset: int, fields: Optional[str]):
+    fields = parse_fields(fields)
+    await catalog.get(rankings, fruit_json)
+    key = ("rankings", name, limit, offset, tuple(fields or ()))
+    return catalog_response(request, key, lambda: fruit_json.encode_list(rankings.top(name, limit, offset), fields))
 
 @api_router.get("/rankings/expensive", response_model=List[DevilFruit])
-async def get_most_expensive():
-    fruits = await db.devil_fruits.find({}, {"_id": 0}).to_list(1000)
-    fruits.sort(key=lambda x: x['price'], reverse=True)
-    return fruits[:10]
+async def get_most_expensive(
+    request: Request,
+    limit: int = Query(10, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    fields: Optional[str] = Query(None)
+):
+    return await ranking_response(request, "expensive", limit, offset, fields)
 
 @api_router.get("/rankings/destructive", response_model=List[DevilFruit])
-async def get_most_destructive():
-    fruits = await db.devil_fruits.find({}, {"_id": 0}).to_list(1000)
-    fruits.sort(key=lambda x: x.get('destructive_power', 0), reverse=True)
-    return fruits[:10]
+async def get_most_destructive(
+    request: Request,
+    limit: int = Query(10, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    fields: Optional[str] = Query(None)
+):
+    return await ranking_response(request, "destructive", limit, offset, fields)
 
 @api_router.get("/rankings/rare", response_model=List[DevilFruit])
-async def get_most_rare():
-    rarity_order = {"Única": 5, "Mítica": 4, "Muito Rara": 3, "Rara": 2, "Comum": 1}
-    fruits = await db.devil_fruits.find({}, {"_id": 0}).to_list(1000)
-    fruits.sort(key=lambda x: (rarity_order.get(x.get('rarity', 'Comum'), 0), x['price']), reverse=True)
-    return fruits[:10]
+async def get_most_rare(
+    request: Request,
+    limit: int = Query(10, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    fields: Optional[str] = Query(None)
+):
+    return await ranking_response(request, "rare", limit, offset, fields)
 
 @api_router.get("/rankings/defense", response_model=List[DevilFruit])
-async def get_best_defense():
-    fruits = await db.devil_fruits.find({}, {"_id": 0}).to_list(1000)
-    fruits.sort(key=lambda x: x.get('defense_rating', 0), reverse=True)
-    return fruits[:10]
+async def get_best_defense(
+    request: Request,
+    limit: int = Query(10, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    fields: Optional[str] = Query(None)
+):
+    return await ranking_response(request, "defense", limit, offset, fields)
 
 @api_router.get("/rankings/speed", response_model=List[DevilFruit])
-async def get_best_speed():
-    fruits = await db.devil_fruits.find({}, {"_id": 0}).to_list(1000)
-    fruits.sort(key=lambda x: x.get('speed_rating', 0), reverse=True)
-    return fruits[:10]
+async def get_best_speed(
+    request: Request,
+    limit: int = Query(10, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    fields: Optional[str] = Query(None)
+):
+    return await ranking_response(request, "speed", limit, offset, fields)
 
-@api_router.get("/black-market", response_model=List[DevilFruit])
-async def get_black_market():
-    fruits = await db.devil_fruits.find({}, {"_id": 0}).to_list(1000)
-    return fruits
+# Pesos de /rankings/custom: parâmetro -> coluna da matriz de atributos (features.py)
+CUSTOM_WEIGHTS = {
+    "w_destructive": "destructive_power",
+    "w_defense": "defense_rating",
+    "w_speed": "speed_rating",
+    "w_rarity": "rarity",
+    "w_price": "price",
+}
 
-@api_router.post("/init-database")
-async def init_database():
-    count = await db.devil_fruits.count_documents({})
-    if count > 0:
-        return {"message": "Database already initialized", "count": count}
+@api_router.get("/rankings/custom", response_model=List[DevilFruit])
+async def get_custom_ranking(
+    request: Request,
+    w_destructive: float = Query(0, ge=-10, le=10),
+    w_defense: float = Query(0, ge=-10, le=10),
+    w_speed: float = Query(0, ge=-10, le=10),
+    w_rarity: float = Query(0, ge=-10, le=10),
+    w_price: float = Query(0, ge=-10, le=10),
+    type: Optional[str] = Query(None),
+    rarity: Optional[str] = Query(None),
+    available: Optional[bool] = Query(None),
+    max_price: Optional[int] = Query(None, ge=0),
+    fighting_style: Optional[str] = Query(None),
+    limit: int = Query(10, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    fields: Optional[str] = Query(None)
+):
+    # Ex.: rápida e defensiva abaixo de 500M -> w_speed=1&w_defense=1&max_price=500000000
+    # Atributos normalizados para [0, 1] (preço em escala log); peso negativo penaliza
+    values = {"w_destructive": w_destructive, "w_defense": w_defense, "w_speed": w_speed,
+              "w_rarity": w_rarity, "w_price": w_price}
+    weights = {CUSTOM_WEIGHTS[name]: value for name, value in values.items() if value}
+    if not weights:
+        raise HTTPException(status_code=400, detail=f"Informe ao menos um peso: {', '.join(CUSTOM_WEIGHTS)}")
+    fields = parse_fields(fields)
+    await catalog.get(features, fruit_json)
     
-    fruits_data = [
-        {
-            "id": "mera-mera",
-            "name": "Mera Mera no Mi",
-            "japanese_name": "メラメラの実",
-            "type": "Logia",
-            "rarity": "Muito Rara",
-            "power": "Fogo",
-            "description": "Permite ao usuário criar, controlar e se transformar em fogo. Uma das Logias mais poderosas.",
-            "current_user": "Sabo",
-            "previous_users": ["Portgas D. Ace"],
-            "price": 350000000,
-            "available": False,
-            "keywords": ["fogo", "chamas", "calor", "queimar", "incêndio"],
-            "locations": ["Dressrosa (Coliseu)"],
-            "lore": "Fruta que pertenceu a Ace, irmão de Luffy. Após sua morte, reapareceu em Dressrosa.",
-            "curiosities": [
-                "Ace recusou se tornar um Shichibukai graças a essa fruta",
-                "Sabo comeu a fruta para honrar a memória de Ace",
-                "É inferior à Magu Magu no Mi na hierarquia de temperatura"
-            ],
-            "first_appearance": "Capítulo 159, Episódio 95",
-            "destructive_power": 95,
-            "defense_rating": 98,
-            "speed_rating": 85,
-            "image_url": "https://images.unsplash.com/photo-1705246535209-8c53b6b4f818?crop=entropy&cs=srgb&fm=jpg&q=85",
-            "fighting_styles": ["Luta de longe", "Alta defesa", "Controle elemental"]
-        },
-        {
-            "id": "gomu-gomu",
-            "name": "Gomu Gomu no Mi",
-            "japanese_name": "ゴムゴムの実",
-            "type": "Paramecia",
-            "rarity": "Única",
-            "power": "Borracha",
-            "description": "Transforma o corpo em borracha. Verdadeiro nome: Hito Hito no Mi, Modelo: Nika.",
-            "current_user": "Monkey D. Luffy",
-            "previous_users": ["Joy Boy"],
-            "price": 5000000000,
-            "available": False,
-            "keywords": ["borracha", "elástico", "esticar", "flexível", "nika"],
-            "locations": ["East Blue (roubada por Shanks)"],
-            "lore": "Fruta lendária guardada pelo Governo Mundial por 800 anos. Seu verdadeiro poder é de um deus da libertação.",
-            "curiosities": [
-                "O Governo Mundial tentou capturá-la por séculos",
-                "Despertada, permite transformar o ambiente em borracha e acessar o Gear 5",
-                "É considerada a fruta mais ridícula do mundo"
-            ],
-            "first_appearance": "Capítulo 1, Episódio 4",
-            "destructive_power": 100,
-            "defense_rating": 75,
-            "speed_rating": 92,
-            "image_url": "https://images.unsplash.com/photo-1583487488041-5ebf7dec1db5?crop=entropy&cs=srgb&fm=jpg&q=85",
-            "fighting_styles": ["Combate bruto", "Velocidade", "Melhor mobilidade"]
-        },
-        {
-            "id": "yami-yami",
-            "name": "Yami Yami no Mi",
-            "japanese_name": "ヤミヤミの実",
-            "type": "Logia",
-            "rarity": "Única",
-            "power": "Escuridão",
-            "description": "Permite criar e controlar a escuridão. Pode anular os poderes de outras Akuma no Mi.",
-            "current_user": "Marshall D. Teach (Barba Negra)",
-            "previous_users": ["Thatch"],
-            "price": 4000000000,
-            "available": False,
-            "keywords": ["escuridão", "trevas", "gravidade", "absorção", "nulificar"],
-            "locations": ["Navio do Barba Branca"],
-            "lore": "Considerada a mais maligna das Akuma no Mi. Blackbeard procurou por ela durante décadas.",
-            "curiosities": [
-                "É a única Logia que não torna o usuário intangível",
-                "Pode sugar tudo como um buraco negro",
-                "Blackbeard matou Thatch para obtê-la"
-            ],
-            "first_appearance": "Capítulo 440, Episódio 325",
-            "destructive_power": 98,
-            "defense_rating": 45,
-            "speed_rating": 70,
-            "image_url": "https://images.unsplash.com/photo-1600788894044-fb8c7d5d9442?crop=entropy&cs=srgb&fm=jpg&q=85",
-            "fighting_styles": ["Luta de longe", "Controle elemental"]
-        },
-        {
-            "id": "gura-gura",
-            "name": "Gura Gura no Mi",
-            "japanese_name": "グラグラの実",
-            "type": "Paramecia",
-            "rarity": "Única",
-            "power": "Terremoto",
-            "description": "Permite criar terremotos e tremores devastadores. Considerada a Paramecia mais destrutiva.",
-            "current_user": "Marshall D. Teach (Barba Negra)",
-            "previous_users": ["Edward Newgate (Barba Branca)"],
-            "price": 5000000000,
-            "available": False,
-            "keywords": ["terremoto", "tremor", "destruição", "tsunami", "rachadura"],
-            "locations": ["Marineford"],
-            "lore": "Fruta que deu a Barba Branca o título de homem mais forte do mundo.",
-            "curiosities": [
-                "Pode destruir o mundo inteiro segundo Sengoku",
-                "Blackbeard roubou o poder após a morte de Barba Branca",
-                "Causa rachaduras no ar"
-            ],
-            "first_appearance": "Capítulo 552, Episódio 434",
-            "destructive_power": 100,
-            "defense_rating": 60,
-            "speed_rating": 50,
-            "image_url": "https://images.unsplash.com/photo-1588613000171-55fe9ac1e10b?crop=entropy&cs=srgb&fm=jpg&q=85",
-            "fighting_styles": ["Luta de longe", "Combate bruto"]
-        },
-        {
-            "id": "pika-pika",
-            "name": "Pika Pika no Mi",
-            "japanese_name": "ピカピカの実",
-            "type": "Logia",
-            "rarity": "Mítica",
-            "power": "Luz",
-            "description": "Permite criar, controlar e se transformar em luz. Concede velocidade na velocidade da luz.",
-            "current_user": "Borsalino (Kizaru)",
-            "previous_users": [],
-            "price": 3500000000,
-            "available": False,
-            "keywords": ["luz", "laser", "velocidade", "brilho", "fóton"],
-            "locations": ["Marinha (Almirante Kizaru)"],
-            "lore": "Uma das três Logias dos Almirantes da Marinha.",
-            "curiosities": [
-                "Permite viajar na velocidade da luz",
-                "Os ataques de laser são extremamente precisos",
-                "Kizaru nunca demonstrou pressa apesar de sua velocidade"
-            ],
-            "first_appearance": "Capítulo 507, Episódio 398",
-            "destructive_power": 92,
-            "defense_rating": 98,
-            "speed_rating": 100,
-            "image_url": "https://images.unsplash.com/photo-1680954545884-40c0c8960b85?crop=entropy&cs=srgb&fm=jpg&q=85",
-            "fighting_styles": ["Luta de longe", "Velocidade", "Alta defesa"]
-        },
-        {
-            "id": "magu-magu",
-            "name": "Magu Magu no Mi",
-            "japanese_name": "マグマグの実",
-            "type": "Logia",
-            "rarity": "Mítica",
-            "power": "Magma",
-            "description": "Permite criar, controlar e se transformar em magma. Superior à Mera Mera no Mi.",
-            "current_user": "Sakazuki (Akainu)",
-            "previous_users": [],
-            "price": 4000000000,
-            "available": False,
-            "keywords": ["magma", "lava", "calor extremo", "queimar", "derretimento"],
-            "locations": ["Marinha (Almirante da Frota)"],
-            "lore": "Fruta que tornou Akainu o Almirante da Frota após derrotar Aokiji.",
-            "curiosities": [
-                "Matou Ace ao perfurar seu corpo",
-                "É mais quente que o fogo",
-                "Akainu queimou metade do rosto de Barba Branca com ela"
-            ],
-            "first_appearance": "Capítulo 554, Episódio 463",
-            "destructive_power": 98,
-            "defense_rating": 98,
-            "speed_rating": 75,
-            "image_url": "https://images.unsplash.com/photo-1621295538579-7fd8bb7a662a?crop=entropy&cs=srgb&fm=jpg&q=85",
-            "fighting_styles": ["Luta de longe", "Alta defesa", "Controle elemental", "Combate bruto"]
-        },
-        {
-            "id": "hie-hie",
-            "name": "Hie Hie no Mi",
-            "japanese_name": "ヒエヒエの実",
-            "type": "Logia",
-            "rarity": "Mítica",
-            "power": "Gelo",
-            "description": "Permite criar, controlar e se transformar em gelo.",
-            "current_user": None,
-            "previous_users": ["Kuzan (Aokiji)"],
-            "price": 3000000000,
-            "available": True,
-            "keywords": ["gelo", "congelar", "frio", "congelamento", "neve"],
-            "locations": ["Paradeiro desconhecido após Punk Hazard"],
-            "lore": "Aokiji deixou a Marinha após perder para Akainu em Punk Hazard.",
-            "curiosities": [
-                "Aokiji congelou o oceano por uma semana após a batalha",
-                "Perdeu uma perna na luta contra Akainu",
-                "Pode congelar o tempo"
-            ],
-            "first_appearance": "Capítulo 319, Episódio 227",
-            "destructive_power": 88,
-            "defense_rating": 98,
-            "speed_rating": 70,
-            "image_url": "https://images.pexels.com/photos/6489573/pexels-photo-6489573.jpeg",
-            "fighting_styles": ["Luta de longe", "Alta defesa", "Controle elemental"]
-        },
-        {
-            "id": "ope-ope",
-            "name": "Ope Ope no Mi",
-            "japanese_name": "オペオペの実",
-            "type": "Paramecia",
-            "rarity": "Mítica",
-            "power": "Operação",
-            "description": "Permite criar uma sala onde o usuário pode manipular tudo como um cirurgião. Pode garantir imortalidade.",
-            "current_user": "Trafalgar D. Water Law",
-            "previous_users": [],
-            "price": 5000000000,
-            "available": False,
-            "keywords": ["cirurgia", "cortar", "teleporte", "imortalidade", "sala"],
-            "locations": ["Heart Pirates"],
-            "lore": "Considerada a Akuma no Mi suprema. O Governo Mundial pagou 5 bilhões de berries por ela.",
-            "curiosities": [
-                "Pode conceder imortalidade ao custo da vida do usuário",
-                "Law pode trocar personalidades entre corpos",
-                "A cirurgia da imortalidade foi o motivo de Doflamingo querer Law na tripulação"
-            ],
-            "first_appearance": "Capítulo 504, Episódio 398",
-            "destructive_power": 85,
-            "defense_rating": 70,
-            "speed_rating": 88,
-            "image_url": "https://images.pexels.com/photos/6430112/pexels-photo-6430112.jpeg",
-            "fighting_styles": ["Luta de longe", "Velocidade", "Melhor mobilidade"]
-        },
-        {
-            "id": "suna-suna",
-            "name": "Suna Suna no Mi",
-            "japanese_name": "スナスナの実",
-            "type": "Logia",
-            "rarity": "Muito Rara",
-            "power": "Areia",
-            "description": "Permite criar, controlar e se transformar em areia.",
-            "current_user": "Crocodile",
-            "previous_users": [],
-            "price": 1500000000,
-            "available": False,
-            "keywords": ["areia", "deserto", "secar", "desidratação", "tempestade de areia"],
-            "locations": ["Alabasta, Impel Down, Cross Guild"],
-            "lore": "Crocodile usou essa fruta para quase conquistar Alabasta.",
-            "curiosities": [
-                "Pode secar qualquer coisa ao tocar",
-                "Fraca contra água e líquidos",
-                "Crocodile criou tempestades de areia massivas"
-            ],
-            "first_appearance": "Capítulo 170, Episódio 103",
-            "destructive_power": 82,
-            "defense_rating": 95,
-            "speed_rating": 78,
-            "image_url": "https://images.unsplash.com/photo-1705927450843-3c1abe9b17d6?crop=entropy&cs=srgb&fm=jpg&q=85",
-            "fighting_styles": ["Luta de longe", "Alta defesa", "Controle elemental"]
-        },
-        {
-            "id": "goro-goro",
-            "name": "Goro Goro no Mi",
-            "japanese_name": "ゴロゴロの実",
-            "type": "Logia",
-            "rarity": "Mítica",
-            "power": "Raio",
-            "description": "Permite criar, controlar e se transformar em eletricidade.",
-            "current_user": "Enel",
-            "previous_users": [],
-            "price": 3000000000,
-            "available": False,
-            "keywords": ["raio", "eletricidade", "trovão", "relâmpago", "voltagem"],
-            "locations": ["Lua (Fairy Vearth)"],
-            "lore": "Uma das Logias mais poderosas. Enel se considera um deus.",
-            "curiosities": [
-                "Permite viajar na velocidade da eletricidade",
-                "Enel pode reiniciar seu próprio coração",
-                "Inútil contra borracha"
-            ],
-            "first_appearance": "Capítulo 254, Episódio 167",
-            "destructive_power": 96,
-            "defense_rating": 98,
-            "speed_rating": 98,
-            "image_url": "https://images.unsplash.com/photo-1657625945947-2b10c313a2d1?crop=entropy&cs=srgb&fm=jpg&q=85",
-            "fighting_styles": ["Luta de longe", "Velocidade", "Alta defesa", "Controle elemental"]
-        },
-        {
-            "id": "mochi-mochi",
-            "name": "Mochi Mochi no Mi",
-            "japanese_name": "モチモチの実",
-            "type": "Paramecia",
-            "rarity": "Muito Rara",
-            "power": "Mochi",
-            "description": "Permite criar, controlar e se transformar em mochi. Paramecia especial que age como Logia.",
-            "current_user": "Charlotte Katakuri",
-            "previous_users": [],
-            "price": 2000000000,
-            "available": False,
-            "keywords": ["mochi", "pegajoso", "elástico", "expandir", "grudar"],
-            "locations": ["Whole Cake Island"],
-            "lore": "Katakuri despertou sua fruta, tornando-a extremamente versátil.",
-            "curiosities": [
-                "Paramecia especial com propriedades de Logia",
-                "Katakuri tem Haki de Observação do futuro",
-                "O mochi pode grudar e aprisionar inimigos"
-            ],
-            "first_appearance": "Capítulo 863, Episódio 833",
-            "destructive_power": 88,
-            "defense_rating": 92,
-            "speed_rating": 85,
-            "image_url": "https://images.unsplash.com/photo-1705246535209-8c53b6b4f818?crop=entropy&cs=srgb&fm=jpg&q=85",
-            "fighting_styles": ["Combate bruto", "Alta defesa", "Melhor mobilidade"]
-        },
-        {
-            "id": "hana-hana",
-            "name": "Hana Hana no Mi",
-            "japanese_name": "ハナハナの実",
-            "type": "Paramecia",
-            "rarity": "Rara",
-            "power": "Florescer",
-            "description": "Permite fazer partes do corpo florescerem em qualquer superfície.",
-            "current_user": "Nico Robin",
-            "previous_users": [],
-            "price": 500000000,
-            "available": False,
-            "keywords": ["florescer", "brotar", "múltiplas mãos", "membros", "espionagem"],
-            "locations": ["Bando do Chapéu de Palha"],
-            "lore": "Robin comeu a fruta aos 8 anos e foi caçada pelo Governo Mundial desde então.",
-            "curiosities": [
-                "Pode criar milhares de membros simultaneamente",
-                "Robin pode criar clones completos de si mesma",
-                "Extremamente versátil para espionagem"
-            ],
-            "first_appearance": "Capítulo 114, Episódio 67",
-            "destructive_power": 70,
-            "defense_rating": 55,
-            "speed_rating": 75,
-            "image_url": "https://images.unsplash.com/photo-1705246535209-8c53b6b4f818?crop=entropy&cs=srgb&fm=jpg&q=85",
-            "fighting_styles": ["Luta de longe", "Melhor mobilidade"]
-        },
-        {
-            "id": "bari-bari",
-            "name": "Bari Bari no Mi",
-            "japanese_name": "バリバリの実",
-            "type": "Paramecia",
-            "rarity": "Muito Rara",
-            "power": "Barreira",
-            "description": "Permite criar barreiras indestrutíveis.",
-            "current_user": "Bartolomeo",
-            "previous_users": [],
-            "price": 800000000,
-            "available": False,
-            "keywords": ["barreira", "proteção", "defesa", "escudo", "indestrutível"],
-            "locations": ["Barto Club"],
-            "lore": "Bartolomeo usa suas barreiras de forma criativa em combate.",
-            "curiosities": [
-                "As barreiras são completamente indestrutíveis",
-                "Pode criar escadas de barreiras",
-                "Bartolomeo é fã número 1 de Luffy"
-            ],
-            "first_appearance": "Capítulo 706, Episódio 635",
-            "destructive_power": 60,
-            "defense_rating": 100,
-            "speed_rating": 65,
-            "image_url": "https://images.unsplash.com/photo-1600788894044-fb8c7d5d9442?crop=entropy&cs=srgb&fm=jpg&q=85",
-            "fighting_styles": ["Alta defesa"]
-        },
-        {
-            "id": "hobi-hobi",
-            "name": "Hobi Hobi no Mi",
-            "japanese_name": "ホビホビの実",
-            "type": "Paramecia",
-            "rarity": "Mítica",
-            "power": "Brinquedo",
-            "description": "Permite transformar pessoas em brinquedos e apagar suas memórias. Concede juventude eterna.",
-            "current_user": "Sugar",
-            "previous_users": [],
-            "price": 2500000000,
-            "available": False,
-            "keywords": ["brinquedo", "transformação", "memória", "contrato", "juventude"],
-            "locations": ["Família Donquixote"],
-            "lore": "Uma das frutas mais perigosas devido ao seu efeito de apagar memórias.",
-            "curiosities": [
-                "Sugar parou de envelhecer aos 10 anos",
-                "As pessoas esquecem completamente da existência transformada",
-                "Se Sugar desmaiar, todos voltam ao normal"
-            ],
-            "first_appearance": "Capítulo 703, Episódio 632",
-            "destructive_power": 95,
-            "defense_rating": 30,
-            "speed_rating": 50,
-            "image_url": "https://images.unsplash.com/photo-1583487488041-5ebf7dec1db5?crop=entropy&cs=srgb&fm=jpg&q=85",
-            "fighting_styles": ["Luta de longe"]
-        },
-        {
-            "id": "zou-zou",
-            "name": "Zou Zou no Mi",
-            "japanese_name": "ゾウゾウの実",
-            "type": "Zoan",
-            "rarity": "Comum",
-            "power": "Elefante",
-            "description": "Permite se transformar em um elefante.",
-            "current_user": "Funkfreed (Espada)",
-            "previous_users": [],
-            "price": 100000000,
-            "available": False,
-            "keywords": ["elefante", "força", "grande", "mamífero", "transformação"],
-            "locations": ["Spandam (CP0)"],
-            "lore": "Fruta que foi dada a uma espada, criando Funkfreed.",
-            "curiosities": [
-                "Objetos inanimados podem comer Zoans",
-                "Funkfreed pode se transformar em espada-elefante híbrida",
-                "Uma das poucas Zoans comuns mostradas"
-            ],
-            "first_appearance": "Capítulo 400, Episódio 285",
-            "destructive_power": 70,
-            "defense_rating": 75,
-            "speed_rating": 45,
-            "image_url": "https://images.unsplash.com/photo-1588613000171-55fe9ac1e10b?crop=entropy&cs=srgb&fm=jpg&q=85",
-            "fighting_styles": ["Combate bruto", "Alta defesa"]
-        },
-        {
-            "id": "tori-tori-phoenix",
-            "name": "Tori Tori no Mi, Modelo: Phoenix",
-            "japanese_name": "トリトリの実 モデル：不死鳥",
-            "type": "Zoan",
-            "rarity": "Mítica",
-            "power": "Fênix",
-            "description": "Permite se transformar em uma fênix. Zoan Mítica com chamas azuis de regeneração.",
-            "current_user": "Marco",
-            "previous_users": [],
-            "price": 3500000000,
-            "available": False,
-            "keywords": ["fênix", "regeneração", "voar", "chamas azuis", "cura"],
-            "locations": ["Antigos Piratas do Barba Branca"],
-            "lore": "Marco foi o primeiro comandante dos Piratas do Barba Branca.",
-            "curiosities": [
-                "As chamas azuis permitem regeneração de ferimentos",
-                "Pode voar indefinidamente",
-                "Uma das Zoans Míticas mais raras"
-            ],
-            "first_appearance": "Capítulo 554, Episódio 463",
-            "destructive_power": 85,
-            "defense_rating": 95,
-            "speed_rating": 90,
-            "image_url": "https://images.unsplash.com/photo-1680954545884-40c0c8960b85?crop=entropy&cs=srgb&fm=jpg&q=85",
-            "fighting_styles": ["Velocidade", "Alta defesa", "Melhor mobilidade"]
-        },
-        {
-            "id": "ito-ito",
-            "name": "Ito Ito no Mi",
-            "japanese_name": "イトイトの実",
-            "type": "Paramecia",
-            "rarity": "Muito Rara",
-            "power": "Fio",
-            "description": "Permite criar e manipular fios extremamente afiados e versáteis.",
-            "current_user": None,
-            "previous_users": ["Donquixote Doflamingo"],
-            "price": 1500000000,
-            "available": True,
-            "keywords": ["fio", "cortar", "controle", "manipulação", "marionete"],
-            "locations": ["Impel Down (Doflamingo preso)"],
-            "lore": "Doflamingo despertou sua fruta, transformando o ambiente em fios.",
-            "curiosities": [
-                "Pode controlar pessoas como marionetes",
-                "Os fios são mais afiados que lâminas",
-                "Doflamingo criou uma gaiola de fios que cortava tudo"
-            ],
-            "first_appearance": "Capítulo 231, Episódio 151",
-            "destructive_power": 88,
-            "defense_rating": 75,
-            "speed_rating": 82,
-            "image_url": "https://images.unsplash.com/photo-1600788894044-fb8c7d5d9442?crop=entropy&cs=srgb&fm=jpg&q=85",
-            "fighting_styles": ["Luta de longe", "Melhor mobilidade"]
-        },
-        {
-            "id": "nikyu-nikyu",
-            "name": "Nikyu Nikyu no Mi",
-            "japanese_name": "ニキュニキュの実",
-            "type": "Paramecia",
-            "rarity": "Mítica",
-            "power": "Almofada",
-            "description": "Permite repelir qualquer coisa, incluindo ar, ataques e até dor.",
-            "current_user": "Bartholomew Kuma",
-            "previous_users": [],
-            "price": 2500000000,
-            "available": False,
-            "keywords": ["repelir", "teleporte", "dor", "almofada", "pata"],
-            "locations": ["Marinha (Pacifista)"],
-            "lore": "Kuma se tornou um Pacifista para proteger o navio dos Chapéus de Palha.",
-            "curiosities": [
-                "Pode teletransportar pessoas para qualquer lugar do mundo",
-                "Kuma pode extrair a dor de alguém",
-                "Usado para criar as bombas de ar mais poderosas"
-            ],
-            "first_appearance": "Capítulo 234, Episódio 151",
-            "destructive_power": 90,
-            "defense_rating": 88,
-            "speed_rating": 95,
-            "image_url": "https://images.unsplash.com/photo-1705246535209-8c53b6b4f818?crop=entropy&cs=srgb&fm=jpg&q=85",
-            "fighting_styles": ["Luta de longe", "Velocidade", "Alta defesa"]
-        },
-        {
-            "id": "hito-hito-daibutsu",
-            "name": "Hito Hito no Mi, Modelo: Daibutsu",
-            "japanese_name": "ヒトヒトの実 モデル：大仏",
-            "type": "Zoan",
-            "rarity": "Mítica",
-            "power": "Grande Buda",
-            "description": "Permite se transformar em um Grande Buda dourado com ondas de choque.",
-            "current_user": "Sengoku",
-            "previous_users": [],
-            "price": 2800000000,
-            "available": False,
-            "keywords": ["buda", "dourado", "onda de choque", "gigante", "sabedoria"],
-            "locations": ["Marinha (Aposentado)"],
-            "lore": "Sengoku foi o Almirante da Frota antes de Akainu.",
-            "curiosities": [
-                "Combina força física com ondas de choque",
-                "A forma de Buda é dourada e imponente",
-                "Sengoku parou Garp de atacar Akainu em Marineford"
-            ],
-            "first_appearance": "Capítulo 585, Episódio 497",
-            "destructive_power": 92,
-            "defense_rating": 90,
-            "speed_rating": 70,
-            "image_url": "https://images.unsplash.com/photo-1680954545884-40c0c8960b85?crop=entropy&cs=srgb&fm=jpg&q=85",
-            "fighting_styles": ["Combate bruto", "Alta defesa"]
-        },
-        {
-            "id": "doku-doku",
-            "name": "Doku Doku no Mi",
-            "japanese_name": "ドクドクの実",
-            "type": "Paramecia",
-            "rarity": "Muito Rara",
-            "power": "Veneno",
-            "description": "Permite criar e manipular todo tipo de veneno.",
-            "current_user": "Magellan",
-            "previous_users": [],
-            "price": 1200000000,
-            "available": False,
-            "keywords": ["veneno", "tóxico", "corrosão", "morte", "envenenar"],
-            "locations": ["Impel Down"],
-            "lore": "Magellan é praticamente invencível dentro de Impel Down.",
-            "curiosities": [
-                "O veneno pode derreter pedra",
-                "Magellan sofre de diarréia crônica",
-                "Criou o Kinjite, veneno que causa morte lenta e dolorosa"
-            ],
-            "first_appearance": "Capítulo 528, Episódio 425",
-            "destructive_power": 90,
-            "defense_rating": 70,
-            "speed_rating": 65,
-            "image_url": "https://images.unsplash.com/photo-1657625945947-2b10c313a2d1?crop=entropy&cs=srgb&fm=jpg&q=85",
-            "fighting_styles": ["Luta de longe", "Alta defesa"]
-        },
-        {
-            "id": "mera-magu",
-            "name": "Suna Suna no Mi",
-            "japanese_name": "スナスナの実",
-            "type": "Logia",
-            "rarity": "Muito Rara",
-            "power": "Areia",
-            "description": "Permite criar, controlar e se transformar em areia.",
-            "current_user": "Crocodile",
-            "previous_users": [],
-            "price": 1500000000,
-            "available": False,
-            "keywords": ["areia", "deserto", "secar"],
-            "locations": ["Cross Guild"],
-            "lore": "Uma das primeiras Logias introduzidas na série.",
-            "curiosities": [
-                "Pode absorver umidade",
-                "Vulnerável à água",
-                "Crocodile quase conquistou Alabasta"
-            ],
-            "first_appearance": "Capítulo 170",
-            "destructive_power": 82,
-            "defense_rating": 95,
-            "speed_rating": 78,
-            "image_url": "https://images.unsplash.com/photo-1621295538579-7fd8bb7a662a?crop=entropy&cs=srgb&fm=jpg&q=85",
-            "fighting_styles": ["Luta de longe", "Controle elemental"]
-        }
-    ]
+    def build():
+        selected = features.mask(fruit_filter(type, rarity, available), max_price, fighting_style)
+        return orjson.dumps([
+            {**({f: fruit[f] for f in fields if f in fruit} if fields else fruit), "score": round(score, 4)}
+            for fruit, score in features.ranked(weights, selected, limit, offset)
+        ])
     
-    await db.devil_fruits.insert_many(fruits_data)
-    return {"message": "Database initialized successfully", "count": len(fruits_data)}
+    key = ("rankings-custom", tuple(sorted(weights.items())), type, rarity, available, max_price,
+           fighting_style, limit, offset, tuple(fields or ()))
+    return catalog_response(request, key, build)
+
+@api_router.get("/black-market", response_model=List[DevilFruit])
+async def get_black_market(
+    request: Request,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None),
+    stream: bool = Query(False),
+    fields: Optional[str] = Query(None)
+):
+    fields = parse_fields(fields)
+    if limit or cursor or stream:
+        return await fruit_page({}, None, limit, cursor, stream, fields)
+    fruits = await catalog.get(fruit_json)
+    key = ("black-market", tuple(fields or ()))
+    return catalog_response(request, key, lambda: fruit_json.encode_list(fruits, fields))
+
+@api_router.get("/black-market/stats")
+async def get_black_market_stats(request: Request):
+    await catalog.get(market_stats, fruit_json)
+    return catalog_response(request, ("black-market-stats",), lambda: orjson.dumps(market_stats.summary()))
+
+@api_router.get("/admin/index-report")
+async def get_index_report():
+    return await repository.index_report()
+
+@api_router.get("/admin/pool")
+async def get_pool_stats():
+    return {"options": pool_options(), **pool_monitor.snapshot()}
+
+@lru_cache(maxsize=1)
+def seed_fruits(path: Path = SEED_FILE) -> List[dict]:
+    # Lido e validado uma única vez, no primeiro uso (também pelo admin.py reseed)
+    fruits = read_seed(path)
+    missing = [fruit.get('name', '?') for fruit in fruits if not fruit.get('id')]
+    if missing:
+        # Sem id o DevilFruit inventaria um uuid novo a cada execução
+        raise ValueError(f"Frutas sem id no seed: {', '.join(missing)}")
+    return [DevilFruit.model_validate(fruit).model_dump(exclude={"version"}) for fruit in fruits]
+
+@api_router.post("/init-database")
+async def init_database(overwrite: bool = Query(False)):
+    # Idempotente: insere as frutas que faltam e pula as iguais ao seed;
+    # overwrite=true também restaura as que foram alteradas depois do seed
+    seeds = seed_fruits()
+    report = await sync_seed(repository, seeds, overwrite=overwrite)
+    if report["inserted"] or report["updated"]:
+        catalog.invalidate()
+        message = "Database initialized successfully"
+    else:
+        message = "Database already initialized"
+    return {"message": message, "count": len(seeds), **report}
+
+registry.collector(pool_monitor.metric_lines)
+
+@app.get("/metrics", include_in_schema=False)
+async def get_metrics():
+    return PlainTextResponse(registry.render(), media_type=METRICS_CONTENT_TYPE)
 
 app.include_router(api_router)
 
@@ -791,14 +723,12 @@ app.add_middleware(
     allow_origins=os.environ.get('CORS_ORIGINS', '*').split(','),
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
+app.add_middleware(MetricsMiddleware)
 
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
 )
 logger = logging.getLogger(__name__)
-
-@app.on_event("shutdown")
-async def shutdown_db_client():
-    client.close()
\ No newline at end of file
@@ -0,0 +1,55 @@
+"""
+Single-flight: leituras idênticas e simultâneas compartilham uma única consulta ao banco
+A primeira chamada com uma chave executa a consulta; as que chegam enquanto ela está
+em andamento esperam o mesmo resultado em vez de repetir a consulta. Nada fica em
+cache: quando a consulta termina a chave é liberada e a próxima leitura vai ao banco.
+O resultado é compartilhado entre os requests e não deve ser modificado.
+"""
+import asyncio
+from typing import Awaitable, Callable, Dict, Hashable, TypeVar
+
+import orjson
+
+from metrics import Counter, registry
+
+T = TypeVar("T")
+
+singleflight_hits = registry.register(Counter(
+    "singleflight_hits_total", "Leituras que passaram pelo single-flight (executadas ou compartilhadas)", ("group",)))
+singleflight_joins = registry.register(Counter(
+    "singleflight_joins_total", "Leituras atendidas por uma consulta idêntica que já estava em andamento", ("group",)))
+
+
+def query_key(*parts) -> bytes:
+    """Chave normalizada de uma consulta (filtro, ordenação, projeção...): a ordem das chaves dos dicts não importa."""
+    return orjson.dumps(parts, option=orjson.OPT_SORT_KEYS)
+
+
+class SingleFlight:
+    def __init__(self, group: str):
+        self.group = group
+        self._calls: Dict[Hashable, asyncio.Task] = {}
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._calls)
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        singleflight_hits.inc(self.group)
+        task = self._calls.get(key)
+        if task is None:
+            # Task própria: se o request que começou a consulta for cancelado (cliente
+            # desconectou), os que se juntaram a ela continuam esperando o resultado
+            task = asyncio.ensure_future(fn())
+            self._calls[key] = task
+            task.add_done_callback(lambda done: self._finished(key, done))
+        else:
+            singleflight_joins.inc(self.group)
+        return await asyncio.shield(task)
+
+    def _finished(self, key: Hashable, task: asyncio.Task):
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        # Marca a exceção como lida mesmo que todos os requests tenham desistido
+        if not task.cancelled():
+            task.exception()
@@ -0,0 +1,380 @@
+"""
+Repositório das Akuma no Mi: a interface que o servidor usa para ler e gravar frutas
+STORAGE_BACKEND escolhe a implementação:
+    mongo  (padrão) - MongoDB via Motor, com o pool configurado em database.py
+    memory          - tudo num dicionário do próprio processo, sem servidor nenhum
+                      (testes, teste de carga e desenvolvimento; some ao reiniciar)
+
+As consultas usam o mesmo subconjunto de filtros do MongoDB nas duas implementações:
+igualdade (inclusive pertencer a uma lista), $in, $nin, $ne, $gt, $gte, $lt, $lte,
+$exists, $regex, $or, $and e $nor. As atualizações aceitam $set, $unset, $inc e
+$setOnInsert. Os documentos nunca trazem o _id do MongoDB; a chave é o campo id.
+"""
+import os
+import re
+from abc import ABC, abstractmethod
+from typing import AsyncIterator, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+from pymongo import ReturnDocument, UpdateOne
+from pymongo.errors import BulkWriteError, DuplicateKeyError
+
+from database import create_client, warm_up
+from indexes import ensure_indexes, index_report
+
+Sort = Sequence[Tuple[str, int]]
+
+
+class Update(NamedTuple):
+    filter: dict
+    update: dict
+    upsert: bool = False
+
+
+def _projection(fields: Optional[Sequence[str]]) -> dict:
+    projection = {"_id": 0}
+    if fields:
+        projection.update({field: 1 for field in fields})
+    return projection
+
+
+class FruitRepository(ABC):
+    """Operações de armazenamento usadas pelo servidor, pelo seed e pelos scripts."""
+
+    async def connect(self):
+        pass
+
+    async def close(self):
+        pass
+
+    async def ensure_indexes(self):
+        pass
+
+    async def index_report(self) -> List[dict]:
+        return []
+
+    @abstractmethod
+    def find(self, query: dict, fields: Optional[Sequence[str]] = None, sort: Optional[Sort] = None,
+             limit: int = 0, batch_size: Optional[int] = None) -> AsyncIterator[dict]:
+        """Itera os documentos aos poucos (streaming)."""
+
+    @abstractmethod
+    async def find_many(self, query: dict, fields: Optional[Sequence[str]] = None,
+                        sort: Optional[Sort] = None, limit: int = 0) -> List[dict]:
+        ...
+
+    @abstractmethod
+    async def find_one(self, query: dict, fields: Optional[Sequence[str]] = None) -> Optional[dict]:
+        ...
+
+    @abstractmethod
+    async def find_one_and_update(self, query: dict, update: dict) -> Optional[dict]:
+        """Aplica a atualização no primeiro documento do filtro e devolve o documento já atualizado."""
+
+    @abstractmethod
+    async def bulk_update(self, updates: List[Update]) -> Dict[str, int]:
+        """Atualizações independentes (não ordenadas); falhas viram BulkWriteError no final."""
+
+    @abstractmethod
+    async def insert_many(self, docs: List[dict]) -> int:
+        ...
+
+    @abstractmethod
+    async def count(self, query: dict, limit: int = 0) -> int:
+        ...
+
+
+class MotorFruitRepository(FruitRepository):
+    def __init__(self, client, collection):
+        self.client = client
+        self.collection = collection
+
+    async def connect(self):
+        await warm_up(self.client)
+
+    async def close(self):
+        self.client.close()
+
+    async def ensure_indexes(self):
+        await ensure_indexes(self.collection)
+
+    async def index_report(self) -> List[dict]:
+        return await index_report(self.collection)
+
+    def _cursor(self, query, fields, sort, limit):
+        cursor = self.collection.find(query, _projection(fields))
+        if sort:
+            cursor = cursor.sort(list(sort))
+        if limit:
+            cursor = cursor.limit(limit)
+        return cursor
+
+    async def find(self, query, fields=None, sort=None, limit=0, batch_size=None):
+        cursor = self._cursor(query, fields, sort, limit)
+        if batch_size:
+            cursor = cursor.batch_size(batch_size)
+        async for doc in cursor:
+            yield doc
+
+    async def find_many(self, query, fields=None, sort=None, limit=0):
+        return await self._cursor(query, fields, sort, limit).to_list(None)
+
+    async def find_one(self, query, fields=None):
+        return await self.collection.find_one(query, _projection(fields))
+
+    async def find_one_and_update(self, query, update):
+        return await self.collection.find_one_and_update(
+            query, update, projection={"_id": 0}, return_document=ReturnDocument.AFTER
+        )
+
+    async def bulk_update(self, updates):
+        if not updates:
+            return {"matched": 0, "modified": 0, "upserted": 0}
+        result = await self.collection.bulk_write(
+            [UpdateOne(u.filter, u.update, upsert=u.upsert) for u in updates], ordered=False
+        )
+        return {"matched": result.matched_count, "modified": result.modified_count, "upserted": result.upserted_count}
+
+    async def insert_many(self, docs):
+        result = await self.collection.insert_many(docs, ordered=False)
+        return len(result.inserted_ids)
+
+    async def count(self, query, limit=0):
+        return await self.collection.count_documents(query, **({"limit": limit} if limit else {}))
+
+
+# --- Implementação em memória -------------------------------------------------
+
+_MISSING = object()
+
+
+def _get(doc: dict, path: str):
+    value = doc
+    for part in path.split("."):
+        if not isinstance(value, dict) or part not in value:
+            return _MISSING
+        value = value[part]
+    return value
+
+
+def _equals(value, expected) -> bool:
+    if value is _MISSING:
+        return expected is None
+    if isinstance(value, list) and not isinstance(expected, list):
+        return any(_equals(v, expected) for v in value)
+    # Para o MongoDB true e 1 são valores diferentes
+    if isinstance(value, bool) != isinstance(expected, bool):
+        return False
+    return value == expected
+
+
+def _compare(value, expected, op) -> bool:
+    candidates = value if isinstance(value, list) else [value]
+    for candidate in candidates:
+        if candidate is _MISSING or candidate is None:
+            continue
+        try:
+            if op(candidate, expected):
+                return True
+        except TypeError:
+            pass
+    return False
+
+
+_COMPARISONS = {
+    "$gt": lambda a, b: a > b,
+    "$gte": lambda a, b: a >= b,
+    "$lt": lambda a, b: a < b,
+    "$lte": lambda a, b: a <= b,
+}
+
+
+def _match_operators(value, operators: dict) -> bool:
+    for op, expected in operators.items():
+        if op == "$eq":
+            ok = _equals(value, expected)
+        elif op == "$ne":
+            ok = not _equals(value, expected)
+        elif op == "$in":
+            ok = any(_equals(value, e) for e in expected)
+        elif op == "$nin":
+            ok = not any(_equals(value, e) for e in expected)
+        elif op in _COMPARISONS:
+            ok = _compare(value, expected, _COMPARISONS[op])
+        elif op == "$exists":
+            ok = (value is not _MISSING) == bool(expected)
+        elif op == "$regex":
+            pattern = re.compile(expected, re.IGNORECASE if "i" in operators.get("$options", "") else 0)
+            candidates = value if isinstance(value, list) else [value]
+            ok = any(isinstance(c, str) and pattern.search(c) for c in candidates)
+        elif op == "$options":
+            ok = True
+        else:
+            raise ValueError(f"Operador não suportado pelo armazenamento em memória: {op}")
+        if not ok:
+            return False
+    return True
+
+
+def matches(doc: dict, query: dict) -> bool:
+    for key, condition in query.items():
+        if key == "$or":
+            ok = any(matches(doc, q) for q in condition)
+        elif key == "$and":
+            ok = all(matches(doc, q) for q in condition)
+        elif key == "$nor":
+            ok = not any(matches(doc, q) for q in condition)
+        elif isinstance(condition, dict) and condition and all(k.startswith("$") for k in condition):
+            ok = _match_operators(_get(doc, key), condition)
+        else:
+            ok = _equals(_get(doc, key), condition)
+        if not ok:
+            return False
+    return True
+
+
+def _copy(doc: dict, fields: Optional[Sequence[str]] = None) -> dict:
+    # Os documentos só têm valores simples e listas; copiar as listas basta para isolar o chamador
+    keys = fields if fields else doc.keys()
+    return {k: list(doc[k]) if isinstance(doc[k], list) else doc[k] for k in keys if k in doc}
+
+
+def _sort_key(value):
+    # Mesma ordem do MongoDB para os tipos das frutas: ausente/null < números < textos < booleanos
+    if value is _MISSING or value is None:
+        return (0, 0)
+    if isinstance(value, bool):
+        return (3, value)
+    if isinstance(value, (int, float)):
+        return (1, value)
+    return (2, value)
+
+
+def _sorted(docs: List[dict], sort: Optional[Sort]) -> List[dict]:
+    # Ordenações estáveis da última chave para a primeira
+    for field, direction in reversed(list(sort or ())):
+        docs.sort(key=lambda d: _sort_key(_get(d, field)), reverse=direction < 0)
+    return docs
+
+
+def _apply_update(doc: dict, update: dict, inserting: bool = False):
+    for op, changes in update.items():
+        if op == "$set" or (op == "$setOnInsert" and inserting):
+            doc.update(changes)
+        elif op == "$setOnInsert":
+            continue
+        elif op == "$unset":
+            for field in changes:
+                doc.pop(field, None)
+        elif op == "$inc":
+            for field, amount in changes.items():
+                doc[field] = doc.get(field, 0) + amount
+        else:
+            raise ValueError(f"Operador de atualização não suportado: {op}")
+
+
+class MemoryFruitRepository(FruitRepository):
+    def __init__(self, docs: Iterable[dict] = ()):
+        # Chaveado por id, na ordem de inserção (como um índice único em id)
+        self._docs: Dict[str, dict] = {}
+        for doc in docs:
+            self._insert(doc)
+
+    def _insert(self, doc: dict):
+        doc = _copy({k: v for k, v in doc.items() if k != "_id"})
+        if doc.get("id") in self._docs:
+            raise DuplicateKeyError(f"id duplicado: {doc.get('id')}")
+        self._docs[doc["id"]] = doc
+
+    def _candidates(self, query: dict) -> Iterable[dict]:
+        # Atalho para as consultas por id, que são a maioria
+        ids = query.get("id")
+        if isinstance(ids, str):
+            doc = self._docs.get(ids)
+            return [doc] if doc is not None else []
+        if isinstance(ids, dict) and set(ids) == {"$in"}:
+            return [self._docs[i] for i in dict.fromkeys(ids["$in"]) if i in self._docs]
+        return self._docs.values()
+
+    def _select(self, query, sort=None, limit=0) -> List[dict]:
+        docs = [doc for doc in self._candidates(query) if matches(doc, query)]
+        if sort:
+            docs = _sorted(docs, sort)
+        return docs[:limit] if limit else docs
+
+    async def find(self, query, fields=None, sort=None, limit=0, batch_size=None):
+        for doc in self._select(query, sort, limit):
+            yield _copy(doc, fields)
+
+    async def find_many(self, query, fields=None, sort=None, limit=0):
+        return [_copy(doc, fields) for doc in self._select(query, sort, limit)]
+
+    async def find_one(self, query, fields=None):
+        docs = self._select(query, limit=1)
+        return _copy(docs[0], fields) if docs else None
+
+    def _update_one(self, query: dict, update: dict, upsert: bool = False) -> Tuple[Optional[dict], str]:
+        docs = self._select(query, limit=1)
+        if docs:
+            doc = docs[0]
+            new = _copy(doc)
+            _apply_update(new, update)
+            if new.get("id") != doc["id"] and new.get("id") in self._docs:
+                raise DuplicateKeyError(f"id duplicado: {new.get('id')}")
+            if new == doc:
+                return doc, "matched"
+            if new["id"] != doc["id"]:
+                del self._docs[doc["id"]]
+            self._docs[new["id"]] = new
+            return new, "modified"
+        if not upsert:
+            return None, "none"
+        new = {k: v for k, v in query.items() if not k.startswith("$") and not isinstance(v, dict)}
+        _apply_update(new, update, inserting=True)
+        self._insert(new)
+        return self._docs[new["id"]], "upserted"
+
+    async def find_one_and_update(self, query, update):
+        doc, _ = self._update_one(query, update)
+        return _copy(doc) if doc is not None else None
+
+    async def bulk_update(self, updates):
+        counts = {"matched": 0, "modified": 0, "upserted": 0}
+        errors = []
+        for index, u in enumerate(updates):
+            try:
+                _, outcome = self._update_one(u.filter, u.update, u.upsert)
+            except (DuplicateKeyError, ValueError) as e:
+                errors.append({"index": index, "errmsg": str(e)})
+                continue
+            if outcome in ("matched", "modified"):
+                counts["matched"] += 1
+            if outcome in ("modified", "upserted"):
+                counts[outcome] += 1
+        if errors:
+            raise BulkWriteError({"writeErrors": errors, "nMatched": counts["matched"],
+                                  "nModified": counts["modified"], "nUpserted": counts["upserted"]})
+        return counts
+
+    async def insert_many(self, docs):
+        for doc in docs:
+            self._insert(doc)
+        return len(docs)
+
+    async def count(self, query, limit=0):
+        total = 0
+        for doc in self._candidates(query):
+            if matches(doc, query):
+                total += 1
+                if limit and total >= limit:
+                    break
+        return total
+
+
+def create_repository(listeners: List = ()) -> FruitRepository:
+    backend = os.environ.get("STORAGE_BACKEND", "mongo")
+    if backend == "memory":
+        return MemoryFruitRepository()
+    if backend == "mongo":
+        client = create_client(listeners)
+        return MotorFruitRepository(client, client[os.environ['DB_NAME']].devil_fruits)
+    raise ValueError(f"STORAGE_BACKEND inválido: {backend} (use mongo ou memory)")
@@ -0,0 +1,127 @@
+"""
+Autocomplete de GET /api/suggest: trie de prefixos mantida junto com o snapshot do catálogo
+Indexa name, japanese_name, power e keywords sem acentos (mesmo fold da busca), a
+partir de cada início de palavra ("no mi" também encontra "Mera Mera no Mi"). Cada
+nó guarda em cache as melhores sugestões da sua subárvore, uma por fruta; uma escrita
+só invalida os nós do caminho dos textos da fruta alterada, e o cache é refeito na consulta.
+"""
+from typing import Dict, List, Optional, Tuple
+
+from search_index import fold
+
+# Ordem de preferência dos campos nas sugestões
+SUGGEST_FIELDS = {"name": 0, "power": 1, "keywords": 2, "japanese_name": 3}
+
+# Sugestões guardadas por nó (uma por fruta): também é o limite máximo do endpoint
+TOP_PER_NODE = 20
+
+# (campo, começa no meio do texto, tamanho, texto, id da fruta): a ordem da tupla é o ranking
+Entry = Tuple[int, int, int, str, str]
+
+
+class _Node:
+    __slots__ = ("children", "entries", "top")
+
+    def __init__(self):
+        self.children: Dict[str, "_Node"] = {}
+        self.entries: set = set()
+        self.top: Optional[List[Entry]] = None
+
+
+def _normalize(text: str) -> str:
+    return " ".join(fold(text).split())
+
+
+class SuggestIndex:
+    def __init__(self):
+        self._root = _Node()
+        self._names: Dict[str, str] = {}
+        self._fields = {rank: field for field, rank in SUGGEST_FIELDS.items()}
+
+    def _entries(self, fruit: dict) -> List[Tuple[str, Entry]]:
+        """(chave na trie, entrada) para cada início de palavra de cada texto da fruta."""
+        result = []
+        for field, rank in SUGGEST_FIELDS.items():
+            value = fruit.get(field) or []
+            for text in (value if isinstance(value, list) else [value]):
+                folded = _normalize(text)
+                if not folded:
+                    continue
+                words = folded.split(" ")
+                for i in range(len(words)):
+                    key = " ".join(words[i:])
+                    result.append((key, (rank, int(i > 0), len(text), text, fruit['id'])))
+        return result
+
+    def _add(self, key: str, entry: Entry):
+        node = self._root
+        node.top = None
+        for char in key:
+            node = node.children.setdefault(char, _Node())
+            node.top = None
+        node.entries.add(entry)
+
+    def _remove(self, key: str, entry: Entry):
+        path = [self._root]
+        for char in key:
+            child = path[-1].children.get(char)
+            if child is None:
+                return
+            path.append(child)
+        path[-1].entries.discard(entry)
+        for node in path:
+            node.top = None
+        # Poda os nós que ficaram vazios
+        for i in range(len(key) - 1, -1, -1):
+            node = path[i + 1]
+            if node.entries or node.children:
+                break
+            del path[i].children[key[i]]
+
+    def rebuild(self, fruits: List[dict]):
+        self._root = _Node()
+        self._names = {}
+        for fruit in fruits:
+            self._names[fruit['id']] = fruit['name']
+            for key, entry in self._entries(fruit):
+                self._add(key, entry)
+
+    def update(self, old: Optional[dict], new: dict):
+        if old is not None:
+            for key, entry in self._entries(old):
+                self._remove(key, entry)
+        self._names[new['id']] = new['name']
+        for key, entry in self._entries(new):
+            self._add(key, entry)
+
+    def _top(self, node: _Node) -> List[Entry]:
+        if node.top is None:
+            candidates = list(node.entries)
+            for child in node.children.values():
+                candidates.extend(self._top(child))
+            candidates.sort()
+            # Só a melhor entrada de cada fruta
+            top = []
+            seen = set()
+            for entry in candidates:
+                if entry[4] not in seen:
+                    seen.add(entry[4])
+                    top.append(entry)
+                    if len(top) == TOP_PER_NODE:
+                        break
+            node.top = top
+        return node.top
+
+    def suggest(self, prefix: str, limit: int = 8) -> List[dict]:
+        prefix = _normalize(prefix)
+        if not prefix:
+            return []
+        node = self._root
+        for char in prefix:
+            node = node.children.get(char)
+            if node is None:
+                return []
+        return [
+            {"id": fruit_id, "name": self._names.get(fruit_id, ""), "text": text, "field": self._fields[rank]}
+            for rank, _, _, text, fruit_id in self._top(node)[:limit]
+        ]
@@ -1,12 +1,37 @@
-import React, { useState } from 'react';
+import React, { useEffect, useState } from 'react';
+import { useNavigate } from 'react-router-dom';
 import { Search } from 'lucide-react';
 import { motion } from 'framer-motion';
+import axios from 'axios';
 
-const SearchBar = ({ onSearch, placeholder = 'Buscar por poder, descrição...' }) => {
+const BACKEND_URL = process.env.REACT_APP_BACKEND_URL;
+const API = `${BACKEND_URL}/api`;
+
+const SearchBar = ({ onSearch, placeholder = 'Buscar por poder, descrição...', suggest = false }) => {
+  const navigate = useNavigate();
   const [query, setQuery] = useState('');
+  const [suggestions, setSuggestions] = useState([]);
+
+  useEffect(() => {
+    if (!suggest || !query.trim()) {
+      setSuggestions([]);
+      return undefined;
+    }
+    // Espera o usuário parar de digitar antes de consultar o autocomplete
+    const timer = setTimeout(async () => {
+      try {
+        const response = await axios.get(`${API}/suggest`, { params: { q: query, limit: 6 } });
+        setSuggestions(response.data);
+      } catch (error) {
+        setSuggestions([]);
+      }
+    }, 150);
+    return () => clearTimeout(timer);
+  }, [query, suggest]);
 
   const handleSubmit = (e) => {
     e.preventDefault();
+    setSuggestions([]);
     onSearch(query);
   };
 
@@ -18,6 +43,7 @@ const SearchBar = ({ onSearch, placeholder = 'Buscar por poder, descrição...'
           type="text"
           value={query}
           onChange={(e) => setQuery(e.target.value)}
+          onBlur={() => setTimeout(() => setSuggestions([]), 150)}
           placeholder={placeholder}
           className="w-full bg-background-tertiary/50 border border-brand-parchment/30 text-text-primary placeholder:text-text-muted focus:border-brand-gold focus:ring-1 focus:ring-brand-gold rounded-lg h-14 pl-12 pr-4 font-manrope transition-all outline-none"
           data-testid="search-input"
@@ -31,9 +57,31 @@ const SearchBar = ({ onSearch, placeholder = 'Buscar por poder, descrição...'
         >
           Buscar
         </motion.button>
+
+        {suggestions.length > 0 && (
+          <ul
+            className="absolute z-20 left-0 right-0 mt-2 bg-background-secondary border border-brand-parchment/30 rounded-lg overflow-hidden"
+            data-testid="search-suggestions"
+          >
+            {suggestions.map((item) => (
+              <li key={item.id}>
+                <button
+                  type="button"
+                  onMouseDown={() => navigate(`/fruit/${item.id}`)}
+                  className="w-full text-left px-4 py-3 hover:bg-background-tertiary transition-colors"
+                >
+                  <span className="text-text-primary font-manrope">{item.name}</span>
+                  {item.text !== item.name && (
+                    <span className="text-text-muted text-sm font-manrope ml-2">· {item.text}</span>
+                  )}
+                </button>
+              </li>
+            ))}
+          </ul>
+        )}
       </div>
     </form>
   );
 };
 
-export default SearchBar;
\ No newline at end of file
+export default SearchBar;
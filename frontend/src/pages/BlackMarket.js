@@ -9,6 +9,7 @@ const API = `${BACKEND_URL}/api`;
 
 const BlackMarket = () => {
   const [fruits, setFruits] = useState([]);
+  const [stats, setStats] = useState(null);
   const [loading, setLoading] = useState(true);
   const [filter, setFilter] = useState('all');
 
@@ -19,8 +20,12 @@ const BlackMarket = () => {
   const fetchMarketData = async () => {
     setLoading(true);
     try {
-      const response = await axios.get(`${API}/black-market`);
-      setFruits(response.data);
+      const [fruitsResponse, statsResponse] = await Promise.all([
+        axios.get(`${API}/black-market`, { params: { fields: 'summary' } }),
+        axios.get(`${API}/black-market/stats`),
+      ]);
+      setFruits(fruitsResponse.data);
+      setStats(statsResponse.data);
     } catch (error) {
       console.error('Erro ao carregar mercado negro:', error);
     }
@@ -36,13 +41,22 @@ const BlackMarket = () => {
     return fruits;
   };
 
+  const getFilteredStats = () => {
+    if (!stats) return null;
+    if (filter === 'available') {
+      return stats.by_availability.true;
+    } else if (filter === 'unavailable') {
+      return stats.by_availability.false;
+    }
+    return stats.overall;
+  };
+
   const filteredFruits = getFilteredFruits();
-  const averagePrice =
-    filteredFruits.length > 0
-      ? filteredFruits.reduce((sum, f) => sum + f.price, 0) / filteredFruits.length
-      : 0;
-  const mostExpensive = [...filteredFruits].sort((a, b) => b.price - a.price)[0];
-  const cheapest = [...filteredFruits].sort((a, b) => a.price - b.price)[0];
+  // Estatísticas calculadas no servidor (/api/black-market/stats)
+  const filteredStats = getFilteredStats();
+  const averagePrice = filteredStats ? filteredStats.mean : 0;
+  const mostExpensive = filteredStats?.most_expensive;
+  const cheapest = filteredStats?.cheapest;
 
   const formatPrice = (price) => {
     return `฿${(price / 1000000).toFixed(0)}M`;
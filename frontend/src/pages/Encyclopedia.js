@@ -16,6 +16,7 @@ const Encyclopedia = () => {
   const [rarityFilter, setRarityFilter] = useState('');
   const [availableFilter, setAvailableFilter] = useState('');
   const [sortBy, setSortBy] = useState('');
+  const [facets, setFacets] = useState(null);
 
   useEffect(() => {
     fetchFruits();
@@ -25,6 +26,10 @@ const Encyclopedia = () => {
     applyFilters();
   }, [fruits, typeFilter, rarityFilter, availableFilter, sortBy]);
 
+  useEffect(() => {
+    fetchFacets();
+  }, [typeFilter, rarityFilter, availableFilter]);
+
   const fetchFruits = async () => {
     setLoading(true);
     try {
@@ -37,6 +42,25 @@ const Encyclopedia = () => {
     setLoading(false);
   };
 
+  const fetchFacets = async () => {
+    const params = {};
+    if (typeFilter) params.type = typeFilter;
+    if (rarityFilter) params.rarity = rarityFilter;
+    if (availableFilter) params.available = availableFilter === 'available';
+    try {
+      const response = await axios.get(`${API}/fruits/facets`, { params });
+      setFacets(response.data);
+    } catch (error) {
+      console.error('Erro ao carregar contagens:', error);
+    }
+  };
+
+  // " (12)" ao lado de cada opção, quando as contagens já chegaram
+  const facetCount = (facet, value) => {
+    if (!facets) return '';
+    return ` (${facets[facet]?.[value] ?? 0})`;
+  };
+
   const applyFilters = () => {
     let filtered = [...fruits];
 
@@ -107,7 +131,7 @@ const Encyclopedia = () => {
         >
           <div className="bg-background-secondary/80 backdrop-blur-md border border-brand-parchment/20 rounded-2xl p-6">
             <div className="mb-6">
-              <SearchBar onSearch={handleSearch} placeholder="Buscar na enciclopédia..." />
+              <SearchBar onSearch={handleSearch} placeholder="Buscar na enciclopédia..." suggest />
             </div>
 
             <div className="flex items-center space-x-2 mb-4">
@@ -125,9 +149,9 @@ const Encyclopedia = () => {
                   data-testid="type-filter"
                 >
                   <option value="">Todos</option>
-                  <option value="Logia">Logia</option>
-                  <option value="Paramecia">Paramecia</option>
-                  <option value="Zoan">Zoan</option>
+                  <option value="Logia">Logia{facetCount('type', 'Logia')}</option>
+                  <option value="Paramecia">Paramecia{facetCount('type', 'Paramecia')}</option>
+                  <option value="Zoan">Zoan{facetCount('type', 'Zoan')}</option>
                 </select>
               </div>
 
@@ -140,11 +164,11 @@ const Encyclopedia = () => {
                   data-testid="rarity-filter"
                 >
                   <option value="">Todas</option>
-                  <option value="Comum">Comum</option>
-                  <option value="Rara">Rara</option>
-                  <option value="Muito Rara">Muito Rara</option>
-                  <option value="Mítica">Mítica</option>
-                  <option value="Única">Única</option>
+                  <option value="Comum">Comum{facetCount('rarity', 'Comum')}</option>
+                  <option value="Rara">Rara{facetCount('rarity', 'Rara')}</option>
+                  <option value="Muito Rara">Muito Rara{facetCount('rarity', 'Muito Rara')}</option>
+                  <option value="Mítica">Mítica{facetCount('rarity', 'Mítica')}</option>
+                  <option value="Única">Única{facetCount('rarity', 'Única')}</option>
                 </select>
               </div>
 
@@ -157,8 +181,8 @@ const Encyclopedia = () => {
                   data-testid="availability-filter"
                 >
                   <option value="">Todas</option>
-                  <option value="available">Disponíveis</option>
-                  <option value="unavailable">Indisponíveis</option>
+                  <option value="available">Disponíveis{facetCount('available', 'true')}</option>
+                  <option value="unavailable">Indisponíveis{facetCount('available', 'false')}</option>
                 </select>
               </div>
 
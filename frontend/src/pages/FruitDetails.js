@@ -2,6 +2,7 @@ import React, { useEffect, useState } from 'react';
 import { useParams, useNavigate } from 'react-router-dom';
 import { motion } from 'framer-motion';
 import axios from 'axios';
+import FruitCard from '../components/FruitCard';
 import {
   ArrowLeft,
   User,
@@ -21,6 +22,7 @@ const FruitDetails = () => {
   const { id } = useParams();
   const navigate = useNavigate();
   const [fruit, setFruit] = useState(null);
+  const [similar, setSimilar] = useState([]);
   const [loading, setLoading] = useState(true);
 
   useEffect(() => {
@@ -30,8 +32,14 @@ const FruitDetails = () => {
   const fetchFruitDetails = async () => {
     setLoading(true);
     try {
-      const response = await axios.get(`${API}/fruits/${id}`);
-      setFruit(response.data);
+      const [fruitResponse, similarResponse] = await Promise.all([
+        axios.get(`${API}/fruits/${id}`),
+        axios
+          .get(`${API}/fruits/${id}/similar`, { params: { k: 4, fields: 'summary' } })
+          .catch(() => ({ data: [] })),
+      ]);
+      setFruit(fruitResponse.data);
+      setSimilar(similarResponse.data);
     } catch (error) {
       console.error('Erro ao carregar detalhes:', error);
     }
@@ -293,6 +301,20 @@ const FruitDetails = () => {
             )}
           </motion.div>
         </div>
+
+        {similar.length > 0 && (
+          <div className="mt-12" data-testid="similar-fruits">
+            <div className="flex items-center space-x-2 mb-6">
+              <Sparkles className="w-5 h-5 text-brand-gold" strokeWidth={1.5} />
+              <h2 className="heading-wanted text-2xl">Frutas Similares</h2>
+            </div>
+            <div className="grid grid-cols-1 sm:grid-cols-2 lg:grid-cols-4 gap-6">
+              {similar.map((item) => (
+                <FruitCard key={item.id} fruit={item} />
+              ))}
+            </div>
+          </div>
+        )}
       </div>
     </div>
   );
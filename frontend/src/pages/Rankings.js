@@ -30,7 +30,7 @@ const Rankings = () => {
     if (!ranking) return;
 
     try {
-      const response = await axios.get(`${API}${ranking.endpoint}`);
+      const response = await axios.get(`${API}${ranking.endpoint}`, { params: { fields: 'summary' } });
       setFruits(response.data);
     } catch (error) {
       console.error('Erro ao carregar ranking:', error);
@@ -0,0 +1,46 @@
+"""
+Configuração dos testes: o backend roda com STORAGE_BACKEND=memory, então a suíte
+não precisa de MongoDB nem de nenhum outro serviço. Os testes são funções comuns que
+executam seus cenários assíncronos com asyncio.run (ver fixture api).
+"""
+import asyncio
+import os
+import sys
+from pathlib import Path
+
+import httpx
+import pytest
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent / "backend"
+sys.path.insert(0, str(BACKEND_DIR))
+
+# Antes de importar o servidor: o load_dotenv não sobrescreve variáveis já definidas
+os.environ["STORAGE_BACKEND"] = "memory"
+os.environ.setdefault("MONGO_URL", "mongodb://localhost:27017")
+os.environ.setdefault("DB_NAME", "test_database")
+
+import server  # noqa: E402
+
+
+@pytest.fixture
+def api():
+    """api(cenario) roda cenario(client) com a aplicação iniciada e o seed carregado."""
+    ttl = server.catalog.ttl
+
+    def run(scenario):
+        async def main():
+            # O snapshot é global do módulo: cada teste começa de um banco novo
+            server.catalog.invalidate()
+            async with server.app.router.lifespan_context(server.app):
+                transport = httpx.ASGITransport(app=server.app)
+                async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                    response = await client.post("/api/init-database")
+                    assert response.status_code == 200
+                    return await scenario(client)
+
+        try:
+            return asyncio.run(main())
+        finally:
+            server.catalog.ttl = ttl
+
+    return run
@@ -0,0 +1,108 @@
+"""Gravação das mudanças do admin.py (set, bulk-apply, reseed e dedupe) contra o backend em memória."""
+import asyncio
+from argparse import Namespace
+
+import orjson
+
+from admin import apply_changes, cmd_dedupe, cmd_reseed
+from seed import read_seed
+from storage import MemoryFruitRepository, MotorFruitRepository
+
+ARGS = Namespace(batch_size=100, concurrency=2, dry_run=False)
+
+
+def test_apply_changes_writes_converted_values():
+    repository = MemoryFruitRepository(read_seed())
+
+    async def scenario():
+        first = await apply_changes(repository, [("mera-mera", {"price": "123", "available": "false", "bogus": 1})], ARGS)
+        again = await apply_changes(repository, [("mera-mera", {"price": "123"})], ARGS)
+        return first, again, await repository.find_one({"id": "mera-mera"})
+
+    first, again, stored = asyncio.run(scenario())
+    assert (first, again) == (0, 0)
+    assert stored["price"] == 123
+    assert stored["available"] is False
+    assert "bogus" not in stored
+    assert stored["version"] == 1
+
+
+def write_seed(path, fruits):
+    path.write_bytes(b"\n".join(orjson.dumps(fruit) for fruit in fruits))
+    return path
+
+
+def test_reseed_validates_like_init_database(tmp_path):
+    fruit = {k: v for k, v in read_seed()[0].items() if k not in ("lore", "keywords")}
+    path = write_seed(tmp_path / "seed.jsonl", [{**fruit, "price": "123", "bogus": 1}])
+    repository = MemoryFruitRepository()
+
+    status = asyncio.run(cmd_reseed(repository, Namespace(file=path, overwrite=False, dry_run=False)))
+    stored = asyncio.run(repository.find_one({"id": fruit["id"]}))
+    assert status == 0
+    assert stored["price"] == 123
+    assert (stored["lore"], stored["keywords"]) == ("", [])
+    assert "bogus" not in stored
+
+
+def test_reseed_rejects_invalid_seed(tmp_path):
+    fruit = read_seed()[0]
+    repository = MemoryFruitRepository()
+    invalid = write_seed(tmp_path / "invalid.jsonl", [{**fruit, "price": "muito"}])
+    no_id = write_seed(tmp_path / "no_id.jsonl", [{k: v for k, v in fruit.items() if k != "id"}])
+
+    for path in (invalid, no_id):
+        status = asyncio.run(cmd_reseed(repository, Namespace(file=path, overwrite=False, dry_run=False)))
+        assert status == 1
+    assert asyncio.run(repository.count({})) == 0
+
+
+class DuplicatesCollection:
+    """Coleção com só o necessário para o dedupe: registra deletes e índices criados."""
+
+    def __init__(self, groups):
+        self.groups = groups
+        self.streamed = 0
+        self.deletes = []
+        self.indexes = []
+
+    async def aggregate(self, pipeline, **kwargs):
+        for group in self.groups:
+            self.streamed += 1
+            yield group
+
+    async def delete_many(self, query):
+        ids = query['_id']['$in']
+        self.deletes.append((self.streamed, list(ids)))
+        return Namespace(deleted_count=len(ids))
+
+    async def create_indexes(self, indexes):
+        self.indexes.extend(indexes)
+
+
+def dedupe(groups, **options):
+    collection = DuplicatesCollection(groups)
+    args = Namespace(**{"batch_size": 2, "concurrency": 2, "dry_run": False, **options})
+    status = asyncio.run(cmd_dedupe(MotorFruitRepository(None, collection), args))
+    return status, collection
+
+
+def test_dedupe_deletes_while_streaming():
+    groups = [{"_id": f"fruta-{i}", "keep": f"{i}-0", "all": [f"{i}-0", f"{i}-1", f"{i}-2"], "count": 3}
+              for i in range(4)]
+    status, collection = dedupe(groups)
+    assert status == 0
+    assert sorted(i for _, ids in collection.deletes for i in ids) == sorted(
+        f"{i}-{n}" for i in range(4) for n in (1, 2))
+    assert all(len(ids) <= 2 for _, ids in collection.deletes)
+    # O primeiro lote sai antes de o $group terminar
+    assert collection.deletes[0][0] < len(groups)
+    assert collection.indexes
+
+
+def test_dedupe_dry_run_writes_nothing():
+    groups = [{"_id": "fruta", "keep": "a", "all": ["a", "b"], "count": 2}]
+    for found in (groups, []):
+        status, collection = dedupe(found, dry_run=True)
+        assert status == 0
+        assert (collection.deletes, collection.indexes) == ([], [])
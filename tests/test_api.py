@@ -0,0 +1,174 @@
+"""Paginação por keyset e caminhos de escrita (PATCH, PUT e PATCH em lote) contra o backend em memória."""
+import pytest
+
+import server
+from seed import read_seed
+
+SEEDS = read_seed()
+
+
+async def all_pages(client, path, **params):
+    fruits = []
+    cursor = None
+    while True:
+        response = await client.get(path, params={**params, **({"cursor": cursor} if cursor else {})})
+        assert response.status_code == 200
+        fruits.extend(response.json())
+        cursor = response.headers.get("x-next-cursor")
+        if not cursor:
+            return fruits
+
+
+@pytest.mark.parametrize("sort_by, key", [
+    (None, lambda f: f["id"]),
+    ("price_asc", lambda f: (f["price"], f["id"])),
+    ("price_desc", lambda f: (-f["price"], [-ord(c) for c in f["id"]])),
+    ("name", lambda f: (f["name"], f["id"])),
+])
+def test_keyset_pagination_covers_catalog_in_order(api, sort_by, key):
+    async def scenario(client):
+        params = {"limit": 4, **({"sort_by": sort_by} if sort_by else {})}
+        return await all_pages(client, "/api/fruits", **params)
+
+    fruits = api(scenario)
+    assert [f["id"] for f in fruits] == [f["id"] for f in sorted(SEEDS, key=key)]
+
+
+def test_keyset_pagination_with_filter(api):
+    async def scenario(client):
+        return await all_pages(client, "/api/fruits", type="Logia", sort_by="price_asc", limit=2)
+
+    fruits = api(scenario)
+    expected = sorted((f for f in SEEDS if f["type"] == "Logia"), key=lambda f: (f["price"], f["id"]))
+    assert [f["id"] for f in fruits] == [f["id"] for f in expected]
+
+
+def test_cursor_must_match_sort(api):
+    async def scenario(client):
+        response = await client.get("/api/fruits", params={"limit": 2, "sort_by": "name"})
+        cursor = response.headers["x-next-cursor"]
+        mismatched = await client.get("/api/fruits", params={"limit": 2, "sort_by": "price_asc", "cursor": cursor})
+        garbage = await client.get("/api/fruits", params={"limit": 2, "cursor": "%%%"})
+        return mismatched.status_code, garbage.status_code
+
+    assert api(scenario) == (400, 400)
+
+
+def test_patch_updates_snapshot_and_etag(api):
+    async def scenario(client):
+        before = await client.get("/api/fruits/mera-mera")
+        patched = await client.patch("/api/fruits/mera-mera", json={"price": 42})
+        after = await client.get("/api/fruits/mera-mera")
+        listing = await client.get("/api/fruits", params={"sort_by": "price_asc"})
+        ranking = await client.get("/api/rankings/expensive", params={"limit": 100})
+        return before, patched, after, listing, ranking
+
+    before, patched, after, listing, ranking = api(scenario)
+    assert patched.status_code == 200
+    assert after.json()["price"] == 42
+    assert after.json()["version"] == before.json()["version"] + 1
+    assert after.headers["etag"] != before.headers["etag"]
+    assert listing.json()[0]["id"] == "mera-mera"
+    assert ranking.json()[-1]["id"] == "mera-mera"
+
+
+def test_patch_drops_unknown_fields(api):
+    async def scenario(client):
+        patched = await client.patch("/api/fruits/mera-mera", json={
+            "price": "5", "bogus": {"nested": 1}, "_internal": "x", "price.x": 1, "$rename": {},
+        })
+        stored = await server.repository.find_one({"id": "mera-mera"})
+        return patched, stored
+
+    patched, stored = api(scenario)
+    assert patched.status_code == 200
+    assert stored["price"] == 5
+    assert not {"bogus", "_internal", "price.x", "$rename"} & set(stored)
+
+
+def test_empty_patch_keeps_version(api):
+    async def scenario(client):
+        before = await client.get("/api/fruits/mera-mera")
+        empty = await client.patch("/api/fruits/mera-mera", json={})
+        filtered = await client.patch("/api/fruits/mera-mera", json={"bogus": 1, "version": 9},
+                                      headers={"If-Match": before.headers["etag"]})
+        missing = await client.patch("/api/fruits/nao-existe", json={})
+        after = await client.get("/api/fruits/mera-mera")
+        return before, empty, filtered, missing, after
+
+    before, empty, filtered, missing, after = api(scenario)
+    assert (empty.status_code, filtered.status_code, missing.status_code) == (200, 200, 404)
+    assert empty.json()["version"] == before.json()["version"]
+    assert after.headers["etag"] == before.headers["etag"]
+
+
+def test_if_match_rejects_stale_version(api):
+    async def scenario(client):
+        etag = (await client.get("/api/fruits/mera-mera")).headers["etag"]
+        first = await client.patch("/api/fruits/mera-mera", json={"price": 1}, headers={"If-Match": etag})
+        second = await client.patch("/api/fruits/mera-mera", json={"price": 2}, headers={"If-Match": etag})
+        current = await client.get("/api/fruits/mera-mera")
+        return first.status_code, second.status_code, current.json()["price"]
+
+    assert api(scenario) == (200, 412, 1)
+
+
+def test_if_match_rejects_weak_etag(api):
+    async def scenario(client):
+        etag = (await client.get("/api/fruits/mera-mera")).headers["etag"]
+        weak = await client.patch("/api/fruits/mera-mera", json={"price": 1}, headers={"If-Match": f"W/{etag}"})
+        mixed = await client.patch("/api/fruits/mera-mera", json={"price": 2}, headers={"If-Match": f'W/"0.x", {etag}'})
+        current = await client.get("/api/fruits/mera-mera")
+        return weak.status_code, mixed.status_code, current.json()["price"]
+
+    assert api(scenario) == (412, 200, 2)
+
+
+def test_bulk_patch(api):
+    async def scenario(client):
+        response = await client.patch("/api/fruits", json=[
+            {"id": "mera-mera", "changes": {"price": 7}},
+            {"id": "gomu-gomu", "changes": {"price": "muito"}},
+            {"id": "nao-existe", "changes": {"price": 1}},
+            {"id": "hie-hie", "changes": {}},
+            {"id": "mera-mera", "changes": {"price": 8}},
+        ])
+        fruit = await client.get("/api/fruits/mera-mera")
+        return response.json(), fruit.json()
+
+    result, fruit = api(scenario)
+    assert result["updated"] == 1
+    assert [r["status"] for r in result["results"]] == ["updated", "invalid", "not_found", "unchanged", "duplicate"]
+    assert fruit["price"] == 7
+
+
+def test_bulk_patch_stores_converted_values(api):
+    async def scenario(client):
+        response = await client.patch("/api/fruits", json=[
+            {"id": "mera-mera", "changes": {"price": "123", "bogus": 1}},
+        ])
+        again = await client.patch("/api/fruits", json=[
+            {"id": "mera-mera", "changes": {"price": 123}},
+        ])
+        stored = await server.repository.find_one({"id": "mera-mera"})
+        fruit = await client.get("/api/fruits/mera-mera")
+        return response.json(), again.json(), stored, fruit.json()
+
+    result, again, stored, fruit = api(scenario)
+    assert result["results"][0]["status"] == "updated"
+    assert again["results"][0]["status"] == "unchanged"
+    assert stored["price"] == 123
+    assert "bogus" not in stored
+    assert fruit["price"] == 123
+
+
+@pytest.mark.parametrize("sort_by", ["price_asc", "price_desc", "name"])
+def test_keyset_pagination_when_fields_omit_sort_key(api, sort_by):
+    async def scenario(client):
+        return await all_pages(client, "/api/fruits", sort_by=sort_by, fields="type", limit=5)
+
+    fruits = api(scenario)
+    assert len(fruits) == len(SEEDS)
+    assert len({f["id"] for f in fruits}) == len(SEEDS)
+    # Os campos da ordenação só entram no cursor, não na resposta
+    assert all(set(f) == {"id", "type"} for f in fruits)
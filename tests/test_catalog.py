@@ -0,0 +1,219 @@
+"""Snapshot do catálogo: escritas e invalidações que acontecem durante uma recarga não se perdem."""
+import asyncio
+
+import server
+from catalog import CatalogSnapshot
+
+
+class SlowLoader:
+    """Loader que só devolve as frutas quando release() é chamado."""
+
+    def __init__(self, fruits):
+        self.fruits = fruits
+        self.calls = 0
+        self.started = asyncio.Event()
+        self._release = asyncio.Event()
+
+    async def __call__(self):
+        self.calls += 1
+        self.started.set()
+        await self._release.wait()
+        return [dict(fruit) for fruit in self.fruits]
+
+    def release(self):
+        self._release.set()
+
+
+def test_write_during_reload_is_kept():
+    async def scenario():
+        loader = SlowLoader([{"id": "a", "price": 1, "version": 0}, {"id": "b", "price": 2, "version": 0}])
+        catalog = CatalogSnapshot(loader)
+        reload = asyncio.ensure_future(catalog.get())
+        await loader.started.wait()
+        # A escrita chega depois de o loader ter lido a versão 0
+        catalog.upsert({"id": "a", "price": 42, "version": 1})
+        loader.release()
+        await reload
+        return catalog.lookup(["a", "b"])
+
+    fruits = asyncio.run(scenario())
+    assert fruits["a"]["price"] == 42
+    assert fruits["b"]["price"] == 2
+
+
+def test_newer_loaded_document_wins_over_older_write():
+    async def scenario():
+        loader = SlowLoader([{"id": "a", "price": 7, "version": 3}])
+        catalog = CatalogSnapshot(loader)
+        reload = asyncio.ensure_future(catalog.get())
+        await loader.started.wait()
+        catalog.upsert({"id": "a", "price": 42, "version": 2})
+        loader.release()
+        await reload
+        return catalog.lookup(["a"])["a"]
+
+    assert asyncio.run(scenario())["price"] == 7
+
+
+def test_invalidate_during_reload_reads_again():
+    async def scenario():
+        loader = SlowLoader([{"id": "a", "price": 1}])
+        catalog = CatalogSnapshot(loader)
+        reload = asyncio.ensure_future(catalog.get())
+        await loader.started.wait()
+        catalog.invalidate()
+        loader.release()
+        await reload
+        return loader.calls
+
+    assert asyncio.run(scenario()) == 2
+
+
+def test_patch_during_reload_is_served(api):
+    async def scenario(client):
+        loader = server.catalog._loader
+        slow = asyncio.Event()
+
+        async def slow_loader():
+            fruits = await loader()
+            slow.set()
+            await asyncio.sleep(0.05)
+            return fruits
+
+        server.catalog._loader = slow_loader
+        try:
+            server.catalog.invalidate()
+            reading = asyncio.ensure_future(client.get("/api/fruits/mera-mera"))
+            await asyncio.wait_for(slow.wait(), 1)
+            patched = await client.patch("/api/fruits/mera-mera", json={"price": 42})
+            await reading
+            after = await client.get("/api/fruits/mera-mera")
+        finally:
+            server.catalog._loader = loader
+        return patched, after
+
+    patched, after = api(scenario)
+    assert after.json()["price"] == 42
+    assert after.headers["etag"] == patched.headers["etag"]
+
+
+def test_read_joining_older_reload_sees_write_without_cache(api):
+    async def scenario(client):
+        server.catalog.ttl = 0
+        loader = server.catalog._loader
+        slow = asyncio.Event()
+
+        async def slow_loader():
+            fruits = await loader()
+            slow.set()
+            await asyncio.sleep(0.05)
+            return fruits
+
+        server.catalog._loader = slow_loader
+        try:
+            # Sem cache, /api/black-market recarrega o snapshot a cada request
+            first = asyncio.ensure_future(client.get("/api/black-market"))
+            await asyncio.wait_for(slow.wait(), 1)
+            await client.patch("/api/fruits/mera-mera", json={"price": 42})
+            # Chega depois da escrita, mas se junta à recarga que começou antes dela
+            joined = await client.get("/api/black-market")
+            await first
+        finally:
+            server.catalog._loader = loader
+        return joined
+
+    prices = {fruit["id"]: fruit["price"] for fruit in api(scenario).json()}
+    assert prices["mera-mera"] == 42
+
+
+class CountingIndex:
+    def __init__(self):
+        self.rebuilds = 0
+        self.updates = 0
+
+    def rebuild(self, fruits):
+        self.rebuilds += 1
+
+    def update(self, old, new):
+        self.updates += 1
+
+
+def test_without_cache_only_requested_indexes_are_rebuilt():
+    async def scenario():
+        loader = SlowLoader([{"id": "a", "price": 1}])
+        loader.release()
+        catalog = CatalogSnapshot(loader, ttl=0)
+        used, unused = catalog.register(CountingIndex()), catalog.register(CountingIndex())
+        await catalog.get(used)
+        await catalog.get(used)
+        catalog.upsert({"id": "a", "price": 2})
+        return loader.calls, used, unused
+
+    calls, used, unused = asyncio.run(scenario())
+    assert calls == 2
+    assert (used.rebuilds, used.updates) == (2, 1)
+    # Nunca pedido: nem reconstruído nem atualizado
+    assert (unused.rebuilds, unused.updates) == (0, 0)
+
+
+def test_with_cache_every_index_is_rebuilt_once():
+    async def scenario():
+        loader = SlowLoader([{"id": "a", "price": 1}])
+        loader.release()
+        catalog = CatalogSnapshot(loader, ttl=300)
+        indexes = [catalog.register(CountingIndex()), catalog.register(CountingIndex())]
+        await catalog.get()
+        await catalog.get()
+        return indexes
+
+    assert [index.rebuilds for index in asyncio.run(scenario())] == [1, 1]
+
+
+CATALOG_ENDPOINTS = [
+    "/api/rankings/expensive", "/api/rankings/rare?limit=3", "/api/rankings/custom?w_speed=1",
+    "/api/black-market", "/api/black-market/stats", "/api/fruits/facets",
+    "/api/suggest?q=me", "/api/fruits/mera-mera/similar",
+]
+
+
+def test_endpoints_without_cache_match_cached(api):
+    async def read_all(client):
+        responses = [(await client.get(url)).json() for url in CATALOG_ENDPOINTS]
+        return responses + [(await client.post("/api/search", json={"description": "fogo"})).json()]
+
+    async def scenario(client):
+        ttl = server.catalog.ttl
+        server.catalog.ttl = 0
+        # Depois de uma recarga sem cache os índices ficam pendentes: a escrita não os
+        # atualiza, e cada endpoint precisa reconstruir os que usa
+        await client.get("/api/black-market")
+        await client.patch("/api/fruits/mera-mera", json={"price": 1, "speed_rating": 100})
+        uncached = await read_all(client)
+        server.catalog.ttl = ttl
+        server.catalog.invalidate()
+        return await read_all(client), uncached
+
+    cached, uncached = api(scenario)
+    assert uncached == cached
+
+
+class LegacyRepository:
+    """Repositório com um documento antigo, gravado sem id."""
+
+    def __init__(self, docs):
+        self.docs = docs
+
+    async def find(self, query, *args, **kwargs):
+        for doc in self.docs:
+            yield dict(doc)
+
+
+def test_load_catalog_skips_docs_without_id(monkeypatch):
+    seed = server.read_seed()[0]
+    legacy = {k: v for k, v in seed.items() if k != "id"}
+    monkeypatch.setattr(server, "repository", LegacyRepository([{**legacy, "_id": "x"}, seed]))
+
+    first = asyncio.run(server.load_catalog())
+    second = asyncio.run(server.load_catalog())
+    # Nenhum uuid inventado: só a fruta com id entra, e sempre a mesma
+    assert [f["id"] for f in first] == [f["id"] for f in second] == [seed["id"]]
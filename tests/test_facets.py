@@ -0,0 +1,64 @@
+"""Contagens de GET /api/fruits/facets e os bitmaps mantidos pelas escritas."""
+from collections import Counter
+
+import server
+
+SEEDS = server.seed_fruits()
+
+
+def expected_counts(fruits, **filters):
+    def passes(fruit, skip=None):
+        checks = {
+            "type": lambda v: fruit["type"] == v,
+            "rarity": lambda v: fruit["rarity"] == v,
+            "available": lambda v: str(fruit["available"]).lower() == v,
+            "fighting_style": lambda v: v in fruit["fighting_styles"],
+        }
+        return all(checks[facet](value) for facet, value in filters.items() if facet != skip)
+
+    def count(facet, values):
+        counter = Counter(v for fruit in fruits if passes(fruit, skip=facet) for v in values(fruit))
+        return dict(sorted(counter.items()))
+
+    return {
+        "total": sum(1 for fruit in fruits if passes(fruit)),
+        "type": count("type", lambda f: [f["type"]]),
+        "rarity": count("rarity", lambda f: [f["rarity"]]),
+        "available": count("available", lambda f: [str(f["available"]).lower()]),
+        "fighting_style": count("fighting_style", lambda f: f["fighting_styles"]),
+    }
+
+
+def facet_counts(counts):
+    # Valores que zeraram com o filtro continuam na resposta com contagem 0
+    return {facet: {v: n for v, n in values.items() if n} if isinstance(values, dict) else values
+            for facet, values in counts.items()}
+
+
+def test_facet_counts(api):
+    filters = [{}, {"type": "Logia"}, {"type": "Paramecia", "available": "true"},
+               {"fighting_style": "Velocidade", "rarity": "Mítica"}]
+
+    async def scenario(client):
+        return [(await client.get("/api/fruits/facets", params=params)).json() for params in filters]
+
+    for params, counts in zip(filters, api(scenario)):
+        assert facet_counts(counts) == expected_counts(SEEDS, **params)
+
+
+def test_facets_follow_writes(api):
+    filters = [{}, {"type": "Zoan"}, {"available": "true"}]
+
+    async def scenario(client):
+        await client.patch("/api/fruits/zou-zou", json={"type": "Logia", "fighting_styles": ["Velocidade"]})
+        await client.patch("/api/fruits/hie-hie", json={"available": False, "rarity": "Comum"})
+        updated = [(await client.get("/api/fruits/facets", params=params)).json() for params in filters]
+        fruits = (await client.get("/api/black-market")).json()
+        server.catalog.invalidate()
+        rebuilt = [(await client.get("/api/fruits/facets", params=params)).json() for params in filters]
+        return updated, fruits, rebuilt
+
+    updated, fruits, rebuilt = api(scenario)
+    for params, counts in zip(filters, updated):
+        assert facet_counts(counts) == expected_counts(fruits, **params)
+    assert updated == rebuilt
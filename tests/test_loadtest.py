@@ -0,0 +1,12 @@
+"""Percentis do relatório do loadtest.py (nearest-rank)."""
+import pytest
+
+from loadtest import percentile
+
+
+@pytest.mark.parametrize("n, p, expected", [
+    (100, 99, 99), (100, 50, 50), (100, 100, 100), (100, 1, 1), (100, 7, 7),
+    (10, 95, 10), (10, 50, 5), (3, 50, 2), (1, 99, 1),
+])
+def test_percentile_is_nearest_rank(n, p, expected):
+    assert percentile(list(range(1, n + 1)), p) == expected
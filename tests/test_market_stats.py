@@ -0,0 +1,54 @@
+"""Estatísticas de GET /api/black-market/stats, mantidas pelas escritas."""
+import numpy as np
+
+import server
+from market_stats import PERCENTILES
+
+SEEDS = server.seed_fruits()
+
+
+def expected_stats(fruits):
+    prices = [f["price"] for f in fruits]
+    return {
+        "count": len(prices),
+        "sum": sum(prices),
+        "min": min(prices),
+        "max": max(prices),
+        "percentiles": {f"p{p}": float(np.percentile(prices, p)) for p in PERCENTILES},
+    }
+
+
+def summary(stats):
+    return {key: stats[key] for key in ("count", "sum", "min", "max", "percentiles")}
+
+
+def test_stats_match_the_catalog(api):
+    async def scenario(client):
+        return (await client.get("/api/black-market/stats")).json()
+
+    stats = api(scenario)
+    assert summary(stats["overall"]) == expected_stats(SEEDS)
+    logia = [f for f in SEEDS if f["type"] == "Logia"]
+    assert summary(stats["by_type"]["Logia"]) == expected_stats(logia)
+    assert set(stats["by_availability"]) == {"true", "false"}
+    assert stats["overall"]["cheapest"]["id"] == min(SEEDS, key=lambda f: (f["price"], f["id"]))["id"]
+
+
+def test_stats_follow_writes(api):
+    async def scenario(client):
+        # hie-hie e ito-ito são as únicas disponíveis: o grupo "true" some
+        await client.patch("/api/fruits/zou-zou", json={"price": 1, "type": "Logia"})
+        await client.patch("/api/fruits/hie-hie", json={"available": False})
+        await client.patch("/api/fruits/ito-ito", json={"available": False})
+        updated = (await client.get("/api/black-market/stats")).json()
+        fruits = (await client.get("/api/black-market")).json()
+        server.catalog.invalidate()
+        rebuilt = (await client.get("/api/black-market/stats")).json()
+        return updated, fruits, rebuilt
+
+    updated, fruits, rebuilt = api(scenario)
+    assert summary(updated["overall"]) == expected_stats(fruits)
+    assert updated["overall"]["cheapest"] == {"id": "zou-zou", "name": "Zou Zou no Mi", "price": 1}
+    assert updated["by_type"]["Zoan"]["count"] == 2
+    assert list(updated["by_availability"]) == ["false"]
+    assert updated == rebuilt
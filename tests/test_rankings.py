@@ -0,0 +1,90 @@
+"""Rankings de /api/rankings/*: ordem de cada dimensão e índices mantidos pelas escritas."""
+import pytest
+
+import server
+from rankings import RANKING_KEYS
+
+SEEDS = server.seed_fruits()
+
+
+def expected(name, fruits=SEEDS):
+    key = RANKING_KEYS[name]
+    return [f["id"] for f in sorted(fruits, key=lambda f: (tuple(-v for v in key(f)), f["id"]))]
+
+
+@pytest.mark.parametrize("name", list(RANKING_KEYS))
+def test_ranking_order_and_pages(api, name):
+    async def scenario(client):
+        full = await client.get(f"/api/rankings/{name}", params={"limit": 100})
+        page = await client.get(f"/api/rankings/{name}", params={"limit": 3, "offset": 2, "fields": "price"})
+        return full.json(), page.json()
+
+    full, page = api(scenario)
+    assert [f["id"] for f in full] == expected(name)
+    assert [f["id"] for f in page] == expected(name)[2:5]
+    assert all(set(f) == {"id", "price"} for f in page)
+
+
+def test_rankings_follow_writes(api):
+    async def scenario(client):
+        await client.patch("/api/fruits/zou-zou", json={"price": 9_000_000_000, "speed_rating": 101})
+        await client.patch("/api/fruits/gomu-gomu", json={"rarity": "Comum", "destructive_power": 1})
+        await client.put("/api/fruits/hana-hana", json={**next(f for f in SEEDS if f["id"] == "hana-hana"),
+                                                        "defense_rating": 101})
+        updated = {name: (await client.get(f"/api/rankings/{name}", params={"limit": 100})).json()
+                   for name in RANKING_KEYS}
+        server.catalog.invalidate()
+        rebuilt = {name: (await client.get(f"/api/rankings/{name}", params={"limit": 100})).json()
+                   for name in RANKING_KEYS}
+        return updated, rebuilt
+
+    updated, rebuilt = api(scenario)
+    assert updated["expensive"][0]["id"] == "zou-zou"
+    assert updated["speed"][0]["id"] == "zou-zou"
+    assert updated["destructive"][-1]["id"] == "gomu-gomu"
+    assert updated["defense"][0]["id"] == "hana-hana"
+    assert [f["id"] for f in updated["rare"]] == expected("rare", updated["rare"])
+    assert updated == rebuilt
+
+
+def custom(client, **params):
+    return client.get("/api/rankings/custom", params=params)
+
+
+def test_custom_ranking(api):
+    async def scenario(client):
+        fast = (await custom(client, w_speed=1, limit=100)).json()
+        slow = (await custom(client, w_speed=-1, limit=3)).json()
+        page = (await custom(client, w_speed=1, limit=3, offset=2)).json()
+        filtered = (await custom(client, w_destructive=1, type="Logia", max_price=3_000_000_000,
+                                 fighting_style="Alta defesa", limit=100)).json()
+        unknown = (await custom(client, w_speed=1, fighting_style="Nenhum")).json()
+        no_weights = await custom(client)
+        return fast, slow, page, filtered, unknown, no_weights.status_code
+
+    fast, slow, page, filtered, unknown, no_weights = api(scenario)
+    by_id = {f["id"]: f for f in SEEDS}
+    assert [by_id[f["id"]]["speed_rating"] for f in fast] == sorted((f["speed_rating"] for f in SEEDS), reverse=True)
+    assert fast[0]["id"] == "pika-pika" and fast[0]["score"] == 1.0
+    assert slow[0]["id"] == "zou-zou"
+    assert page == fast[2:5]
+    expected = {f["id"] for f in SEEDS if f["type"] == "Logia" and f["price"] <= 3_000_000_000
+                and "Alta defesa" in f["fighting_styles"]}
+    assert {f["id"] for f in filtered} == expected
+    assert unknown == []
+    assert no_weights == 400
+
+
+def test_custom_ranking_follows_writes(api):
+    async def scenario(client):
+        await client.patch("/api/fruits/zou-zou", json={"speed_rating": 200, "type": "Logia"})
+        params = {"w_speed": 1, "w_price": 0.5, "limit": 100}
+        updated = [(await custom(client, **params)).json(), (await custom(client, **params, type="Zoan")).json()]
+        server.catalog.invalidate()
+        rebuilt = [(await custom(client, **params)).json(), (await custom(client, **params, type="Zoan")).json()]
+        return updated, rebuilt
+
+    updated, rebuilt = api(scenario)
+    assert updated[0][0]["id"] == "zou-zou"
+    assert "zou-zou" not in {f["id"] for f in updated[1]}
+    assert updated == rebuilt
@@ -0,0 +1,65 @@
+"""Busca textual de POST /api/search: acentos, prefixos, BM25 e o índice mantido pelas escritas."""
+import server
+
+
+def search(client, description, **filters):
+    return client.post("/api/search", json={"description": description, **filters})
+
+
+async def patch_texts(client):
+    # Termos inventados: só as frutas alteradas aqui casam com eles
+    await client.patch("/api/fruits/hie-hie", json={"keywords": ["vórtiquex"], "description": "Gera gelo."})
+    await client.patch("/api/fruits/ito-ito", json={"description": "Fios e um vórtiquex discreto."})
+
+
+def test_search_folds_accents(api):
+    async def scenario(client):
+        await patch_texts(client)
+        return [(await search(client, q)).json() for q in ("vortiquex", "VÓRTIQUEX", "vôrtiquex")]
+
+    results = api(scenario)
+    assert [f["id"] for f in results[0]] == ["hie-hie", "ito-ito"]
+    assert results[1] == results[2] == results[0]
+
+
+def test_search_expands_prefixes(api):
+    async def scenario(client):
+        await patch_texts(client)
+        return [[f["id"] for f in (await search(client, q)).json()] for q in ("vortiq", "vort*", "vo", "vo*")]
+
+    prefix, explicit, short, short_explicit = api(scenario)
+    assert prefix[:2] == explicit[:2] == ["hie-hie", "ito-ito"]
+    # Abaixo de MIN_PREFIX letras só o * expande o termo
+    assert "hie-hie" not in short
+    assert "hie-hie" in short_explicit
+
+
+def test_search_orders_by_bm25(api):
+    async def scenario(client):
+        await patch_texts(client)
+        # keywords pesam mais que description: hie-hie vem antes mesmo com os dois disponíveis
+        both = [f["id"] for f in (await search(client, "vortiquex")).json()]
+        await client.patch("/api/fruits/hie-hie", json={"available": False})
+        # Disponíveis primeiro, a relevância desempata dentro de cada grupo
+        available_first = [f["id"] for f in (await search(client, "vortiquex")).json()]
+        return both, available_first
+
+    both, available_first = api(scenario)
+    assert both == ["hie-hie", "ito-ito"]
+    assert available_first == ["ito-ito", "hie-hie"]
+
+
+def test_search_index_follows_writes(api):
+    async def scenario(client):
+        await patch_texts(client)
+        await client.patch("/api/fruits/hie-hie", json={"keywords": ["gelo"]})
+        queries = ["vortiquex", "gelo", "fogo*", "luz borracha"]
+        updated = [(await search(client, q)).json() for q in queries]
+        # Mesmo resultado de um índice reconstruído do zero
+        server.catalog.invalidate()
+        rebuilt = [(await search(client, q)).json() for q in queries]
+        return updated, rebuilt
+
+    updated, rebuilt = api(scenario)
+    assert [f["id"] for f in updated[0]] == ["ito-ito"]
+    assert updated == rebuilt
@@ -0,0 +1,64 @@
+"""Seed idempotente: frutas iguais ao seed são puladas pelo checksum, as alteradas depois dele divergem."""
+import asyncio
+
+import server
+from seed import sync_seed
+from storage import MemoryFruitRepository
+
+SEEDS = server.seed_fruits()
+
+
+class CountingRepository(MemoryFruitRepository):
+    """Backend em memória que conta as escritas em lote."""
+
+    def __init__(self, docs=()):
+        super().__init__(docs)
+        self.writes = 0
+
+    async def bulk_update(self, updates):
+        self.writes += 1
+        return await super().bulk_update(updates)
+
+
+def test_second_run_writes_nothing():
+    repository = CountingRepository()
+
+    async def scenario():
+        first = await sync_seed(repository, SEEDS)
+        second = await sync_seed(repository, SEEDS)
+        return first, second
+
+    first, second = asyncio.run(scenario())
+    assert first == {"inserted": len(SEEDS), "updated": 0, "unchanged": 0, "diverged": 0}
+    assert second == {"inserted": 0, "updated": 0, "unchanged": len(SEEDS), "diverged": 0}
+    assert repository.writes == 1
+
+
+def test_dry_run_only_reports():
+    repository = CountingRepository()
+    report = asyncio.run(sync_seed(repository, SEEDS, dry_run=True))
+    assert report["inserted"] == len(SEEDS)
+    assert repository.writes == 0
+    assert asyncio.run(repository.count({})) == 0
+
+
+def test_init_database_keeps_and_overwrites_diverged_fruits(api):
+    async def scenario(client):
+        again = await client.post("/api/init-database")
+        await client.patch("/api/fruits/mera-mera", json={"price": 1})
+        diverged = await client.post("/api/init-database")
+        kept = await client.get("/api/fruits/mera-mera")
+        overwritten = await client.post("/api/init-database", params={"overwrite": "true"})
+        restored = await client.get("/api/fruits/mera-mera")
+        return again.json(), diverged.json(), kept.json(), overwritten.json(), restored.json()
+
+    again, diverged, kept, overwritten, restored = api(scenario)
+    seed = next(fruit for fruit in SEEDS if fruit["id"] == "mera-mera")
+    assert (again["unchanged"], again["inserted"], again["updated"]) == (len(SEEDS), 0, 0)
+    assert again["message"] == "Database already initialized"
+    assert (diverged["diverged"], diverged["unchanged"]) == (1, len(SEEDS) - 1)
+    assert kept["price"] == 1
+    assert (overwritten["updated"], overwritten["unchanged"]) == (1, len(SEEDS) - 1)
+    assert restored["price"] == seed["price"]
+    # A escrita do PATCH e a restauração: duas versões depois do insert
+    assert restored["version"] == kept["version"] + 1 == 2
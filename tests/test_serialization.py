@@ -0,0 +1,25 @@
+"""Cache de listas pré-codificadas do FruitJSONCache."""
+from serialization import FruitJSONCache
+
+
+def test_list_cache_evicts_least_recently_used():
+    cache = FruitJSONCache(max_lists=3)
+    builds = []
+
+    def get(key):
+        return cache.cached_list(key, lambda: builds.append(key) or key.encode())
+
+    get("fruits")
+    for i in range(10):
+        # A listagem quente continua sendo lida entre as buscas de chave única
+        assert get("fruits") == b"fruits"
+        get(f"search-{i}")
+    assert builds.count("fruits") == 1
+
+
+def test_list_cache_is_cleared_by_writes():
+    cache = FruitJSONCache()
+    cache.rebuild([{"id": "a", "price": 1}])
+    assert cache.cached_list("k", lambda: b"1") == b"1"
+    cache.update({"id": "a", "price": 1}, {"id": "a", "price": 2})
+    assert cache.cached_list("k", lambda: b"2") == b"2"
@@ -0,0 +1,43 @@
+"""Frutas similares de GET /api/fruits/{id}/similar, com a matriz de atributos mantida pelas escritas."""
+import server
+
+SEEDS = {fruit["id"]: fruit for fruit in server.seed_fruits()}
+
+CLONE_FIELDS = ("destructive_power", "defense_rating", "speed_rating", "price", "keywords", "fighting_styles")
+
+
+def similar(client, fruit_id, **params):
+    return client.get(f"/api/fruits/{fruit_id}/similar", params=params)
+
+
+def test_similar_fruits(api):
+    async def scenario(client):
+        top = await similar(client, "mera-mera", k=5)
+        page = await similar(client, "mera-mera", k=3, fields="name")
+        missing = await similar(client, "nao-existe")
+        return top.json(), page.json(), missing.status_code
+
+    top, page, missing = api(scenario)
+    scores = [f["similarity"] for f in top]
+    assert len(top) == 5
+    assert "mera-mera" not in [f["id"] for f in top]
+    assert scores == sorted(scores, reverse=True)
+    assert [f["id"] for f in page] == [f["id"] for f in top[:3]]
+    assert all(set(f) == {"id", "name", "similarity"} for f in page)
+    assert missing == 404
+
+
+def test_similar_follows_writes(api):
+    async def scenario(client):
+        # zou-zou vira uma cópia dos atributos e tags de mera-mera
+        mera = SEEDS["mera-mera"]
+        await client.patch("/api/fruits/zou-zou", json={field: mera[field] for field in CLONE_FIELDS})
+        updated = (await similar(client, "mera-mera", k=21)).json()
+        server.catalog.invalidate()
+        rebuilt = (await similar(client, "mera-mera", k=21)).json()
+        return updated, rebuilt
+
+    updated, rebuilt = api(scenario)
+    assert updated[0]["id"] == "zou-zou"
+    assert updated[0]["similarity"] == 1.0
+    assert updated == rebuilt
@@ -0,0 +1,96 @@
+"""Single-flight: leituras idênticas e simultâneas compartilham uma única execução."""
+import asyncio
+
+from singleflight import SingleFlight, query_key, singleflight_hits, singleflight_joins
+
+
+class SlowRead:
+    """Consulta que só termina quando release() é chamado; conta quantas vezes rodou."""
+
+    def __init__(self, result="frutas"):
+        self.result = result
+        self.calls = 0
+        self._release = asyncio.Event()
+
+    async def __call__(self):
+        self.calls += 1
+        await self._release.wait()
+        return self.result
+
+    def release(self):
+        self._release.set()
+
+
+def test_concurrent_reads_share_one_call():
+    n = 10
+
+    async def scenario():
+        flight = SingleFlight("test-share")
+        read = SlowRead()
+        calls = [asyncio.ensure_future(flight.do("key", read)) for _ in range(n)]
+        await asyncio.sleep(0)
+        in_flight = flight.in_flight
+        read.release()
+        results = await asyncio.gather(*calls)
+        return read.calls, results, in_flight, flight.in_flight
+
+    calls, results, in_flight, after = asyncio.run(scenario())
+    assert calls == 1
+    assert results == ["frutas"] * n
+    assert singleflight_hits.value("test-share") == n
+    assert singleflight_joins.value("test-share") == n - 1
+    # A chave é liberada: nada fica em cache depois da consulta
+    assert (in_flight, after) == (1, 0)
+
+
+def test_next_read_after_release_runs_again():
+    async def scenario():
+        flight = SingleFlight("test-again")
+        read = SlowRead()
+        read.release()
+        await flight.do("key", read)
+        await flight.do("key", read)
+        return read.calls
+
+    assert asyncio.run(scenario()) == 2
+
+
+def test_cancelling_the_leader_does_not_fail_joiners():
+    async def scenario():
+        flight = SingleFlight("test-cancel")
+        read = SlowRead()
+        leader = asyncio.ensure_future(flight.do("key", read))
+        await asyncio.sleep(0)
+        joiner = asyncio.ensure_future(flight.do("key", read))
+        await asyncio.sleep(0)
+        leader.cancel()
+        await asyncio.sleep(0)
+        read.release()
+        return leader, await joiner, read.calls
+
+    leader, result, calls = asyncio.run(scenario())
+    assert leader.cancelled()
+    assert (result, calls) == ("frutas", 1)
+
+
+def test_errors_reach_every_caller_and_release_the_key():
+    async def scenario():
+        flight = SingleFlight("test-error")
+
+        async def failing():
+            await asyncio.sleep(0)
+            raise RuntimeError("banco fora do ar")
+
+        calls = [flight.do("key", failing) for _ in range(3)]
+        results = await asyncio.gather(*calls, return_exceptions=True)
+        return results, flight.in_flight
+
+    results, in_flight = asyncio.run(scenario())
+    assert all(isinstance(r, RuntimeError) for r in results)
+    assert in_flight == 0
+
+
+def test_query_key_ignores_dict_order():
+    a, b = {"type": "Logia", "rarity": "Rara"}, {"rarity": "Rara", "type": "Logia"}
+    assert query_key(a, None, 10) == query_key(b, None, 10)
+    assert query_key(a, None, 10) != query_key(a, None, 20)
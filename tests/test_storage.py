@@ -0,0 +1,137 @@
+"""Semântica de filtros e atualizações do MemoryFruitRepository (o mesmo subconjunto do MongoDB)."""
+import asyncio
+
+import pytest
+from pymongo.errors import BulkWriteError, DuplicateKeyError
+
+from storage import FruitRepository, MemoryFruitRepository, Update, matches
+
+DOCS = [
+    {"id": "a", "name": "Alfa", "type": "Logia", "price": 300, "available": True, "tags": ["fogo", "luz"]},
+    {"id": "b", "name": "Beta", "type": "Zoan", "price": 100, "available": False, "tags": ["animal"]},
+    {"id": "c", "name": "Gama", "type": "Logia", "price": 200, "available": 1, "tags": []},
+    {"id": "d", "name": "Delta", "type": "Paramecia", "price": 200, "tags": ["fogo"], "current_user": None},
+]
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def ids(docs):
+    return [doc["id"] for doc in docs]
+
+
+def select(query):
+    return [doc["id"] for doc in DOCS if matches(doc, query)]
+
+
+def test_repository_base_class_is_abstract():
+    with pytest.raises(TypeError):
+        FruitRepository()
+
+
+@pytest.mark.parametrize("query, expected", [
+    ({}, ["a", "b", "c", "d"]),
+    ({"type": "Logia"}, ["a", "c"]),
+    # Igualdade com um campo lista: basta um elemento igual
+    ({"tags": "fogo"}, ["a", "d"]),
+    ({"tags": ["animal"]}, ["b"]),
+    # true e 1 são valores diferentes
+    ({"available": True}, ["a"]),
+    ({"available": 1}, ["c"]),
+    ({"price": {"$in": [100, 300]}}, ["a", "b"]),
+    ({"type": {"$nin": ["Logia", "Zoan"]}}, ["d"]),
+    ({"type": {"$ne": "Logia"}}, ["b", "d"]),
+    ({"price": {"$gt": 100, "$lte": 200}}, ["c", "d"]),
+    ({"price": {"$lt": 200}}, ["b"]),
+    ({"available": {"$exists": False}}, ["d"]),
+    # Campo ausente e null casam com None
+    ({"current_user": None}, ["a", "b", "c", "d"]),
+    ({"name": {"$regex": "^[ab]", "$options": "i"}}, ["a", "b"]),
+    ({"name": {"$regex": "^[ab]"}}, []),
+    ({"$or": [{"type": "Zoan"}, {"price": 300}]}, ["a", "b"]),
+    ({"$and": [{"type": "Logia"}, {"price": {"$gte": 250}}]}, ["a"]),
+    ({"$nor": [{"type": "Logia"}, {"tags": "animal"}]}, ["d"]),
+])
+def test_filters(query, expected):
+    assert select(query) == expected
+
+
+def test_unsupported_operator_is_an_error():
+    with pytest.raises(ValueError):
+        matches(DOCS[0], {"price": {"$mod": [2, 0]}})
+
+
+def test_find_sort_projection_limit_and_count():
+    repository = MemoryFruitRepository(DOCS)
+
+    docs = run(repository.find_many({}, sort=[("price", -1), ("id", 1)]))
+    assert ids(docs) == ["a", "c", "d", "b"]
+
+    docs = run(repository.find_many({"type": "Logia"}, fields=["id", "price"], sort=[("price", 1)], limit=1))
+    assert docs == [{"id": "c", "price": 200}]
+
+    async def stream():
+        return [doc async for doc in repository.find({}, sort=[("name", 1)], batch_size=2)]
+    assert ids(run(stream())) == ["a", "b", "d", "c"]
+
+    assert run(repository.count({"price": {"$gte": 200}})) == 3
+    assert run(repository.count({"price": {"$gte": 200}}, limit=2)) == 2
+    assert run(repository.find_one({"id": "zzz"})) is None
+
+
+def test_returned_documents_are_copies():
+    repository = MemoryFruitRepository(DOCS)
+    doc = run(repository.find_one({"id": "a"}))
+    doc["tags"].append("alterado")
+    doc["price"] = 0
+    assert run(repository.find_one({"id": "a"})) == DOCS[0]
+
+
+def test_find_one_and_update_operators():
+    repository = MemoryFruitRepository(DOCS)
+    updated = run(repository.find_one_and_update(
+        {"id": "a"}, {"$set": {"price": 350}, "$inc": {"version": 1}, "$unset": {"tags": ""}}))
+    assert updated["price"] == 350
+    assert updated["version"] == 1
+    assert "tags" not in updated
+    # A ordem de inserção não muda com a atualização
+    assert ids(run(repository.find_many({}))) == ["a", "b", "c", "d"]
+    assert run(repository.find_one_and_update({"id": "zzz"}, {"$set": {"price": 1}})) is None
+
+
+def test_changing_id_to_an_existing_one_is_rejected():
+    repository = MemoryFruitRepository(DOCS)
+    with pytest.raises(DuplicateKeyError):
+        run(repository.find_one_and_update({"id": "a"}, {"$set": {"id": "b"}}))
+    with pytest.raises(DuplicateKeyError):
+        run(repository.insert_many([{"id": "c"}]))
+
+
+def test_bulk_update_counts():
+    repository = MemoryFruitRepository(DOCS)
+    result = run(repository.bulk_update([
+        Update({"id": "a"}, {"$set": {"price": 300}}),            # igual: só matched
+        Update({"id": "b"}, {"$set": {"price": 150}}),            # modified
+        Update({"id": "zzz"}, {"$set": {"price": 1}}),            # nenhum documento
+        Update({"id": "e"}, {"$setOnInsert": {"name": "Épsilon"}}, upsert=True),
+        Update({"id": "a"}, {"$setOnInsert": {"name": "Ignorado"}}, upsert=True),
+    ]))
+    assert result == {"matched": 3, "modified": 1, "upserted": 1}
+    assert run(repository.find_one({"id": "e"})) == {"id": "e", "name": "Épsilon"}
+    assert run(repository.find_one({"id": "a"}))["name"] == "Alfa"
+
+
+def test_bulk_update_is_unordered():
+    repository = MemoryFruitRepository(DOCS)
+    with pytest.raises(BulkWriteError) as error:
+        run(repository.bulk_update([
+            Update({"id": "a"}, {"$set": {"id": "b"}}),
+            Update({"id": "c"}, {"$set": {"price": 1}}),
+        ]))
+    details = error.value.details
+    assert [e["index"] for e in details["writeErrors"]] == [0]
+    assert details["nModified"] == 1
+    # A falha da primeira operação não impede a segunda
+    assert run(repository.find_one({"id": "c"}))["price"] == 1
@@ -0,0 +1,42 @@
+"""Autocomplete de GET /api/suggest: prefixos sem acento, início de palavra e a trie mantida pelas escritas."""
+import server
+
+
+async def suggest(client, q, **params):
+    return (await client.get("/api/suggest", params={"q": q, **params})).json()
+
+
+def test_suggest_prefixes(api):
+    async def scenario(client):
+        return (await suggest(client, "mera"), await suggest(client, "  MÉRA "), await suggest(client, "fogo"),
+                await suggest(client, "no mi", limit=20), await suggest(client, "no mi", limit=3),
+                await suggest(client, "xyz"))
+
+    mera, folded, fogo, word_start, limited, none = api(scenario)
+    assert [(s["id"], s["field"]) for s in mera] == [("mera-mera", "name")]
+    assert folded == mera
+    # power vem antes de keywords, e cada fruta aparece uma vez só
+    assert [(s["id"], s["field"]) for s in fogo] == [("mera-mera", "power")]
+    # Também casa a partir do meio do texto ("Mera Mera no Mi"), até TOP_PER_NODE sugestões
+    assert len(word_start) == 20
+    assert len({s["id"] for s in word_start}) == 20
+    assert all(" no Mi" in s["text"] for s in word_start)
+    assert limited == word_start[:3]
+    assert none == []
+
+
+def test_suggest_follows_writes(api):
+    async def scenario(client):
+        await client.patch("/api/fruits/zou-zou", json={"name": "Zéfiro Zefiro no Mi", "keywords": ["zéfiro"]})
+        await client.patch("/api/fruits/hie-hie", json={"name": "Hie Hie no Mi", "power": "Zefirar"})
+        queries = ["zefir", "zou", "hie", "no mi"]
+        updated = [await suggest(client, q, limit=20) for q in queries]
+        server.catalog.invalidate()
+        rebuilt = [await suggest(client, q, limit=20) for q in queries]
+        return updated, rebuilt
+
+    updated, rebuilt = api(scenario)
+    zefir, zou, _, _ = updated
+    assert [(s["id"], s["field"]) for s in zefir] == [("zou-zou", "name"), ("hie-hie", "power")]
+    assert all(s["id"] != "zou-zou" or s["field"] != "name" for s in zou)
+    assert updated == rebuilt